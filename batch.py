@@ -0,0 +1,193 @@
+"""Generación de prompts por lotes sin interfaz gráfica.
+
+Uso típico:
+
+    python batch.py --spec trabajo.json --output prompts.jsonl
+    python batch.py --fixed calidad_tecnica=masterpiece --sweep cabello_color --sweep ojos --count 100 --seed 7
+
+El archivo de trabajo es un JSON con la forma:
+
+    {
+        "fixed": {"calidad_tecnica": "masterpiece", "estilo_artistico": "anime style"},
+        "sweep": ["cabello_color", "ojos", "fondo"],
+        "count": 10000,
+        "seed": 42
+    }
+
+`sweep` también acepta un diccionario {categoria: [valores]} para limitar los
+valores a recorrer; si se da una lista, se usan las opciones predefinidas del
+generador. Con `"exhaustive": true` (o `--exhaustive`) se recorren en orden las
+combinaciones válidas en lugar de elegir valores al azar; `count` pasa a ser un
+límite opcional. Cada prompt se construye con el mismo `PromptGenerator` que usa la
+ventana principal, así que el resultado es idéntico al de la interfaz.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+from logic.combinator import CombinationEnumerator
+from logic.prompt_generator import PromptGenerator
+
+TAMANO_BLOQUE = 500
+
+# Generador y enumerador reutilizados dentro de cada proceso del pool
+_generador = None
+_enumerador = None
+
+
+def cargar_trabajo(args):
+    """Construye la especificación del trabajo a partir del archivo y la línea de comandos"""
+    trabajo = {'fixed': {}, 'sweep': {}, 'count': None, 'seed': 0, 'exhaustive': False}
+
+    if args.spec:
+        with open(args.spec, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        trabajo['fixed'].update(datos.get('fixed', {}))
+        trabajo['sweep'].update(_normalizar_barrido(datos.get('sweep', {})))
+        trabajo['count'] = datos.get('count', trabajo['count'])
+        trabajo['seed'] = datos.get('seed', trabajo['seed'])
+        trabajo['exhaustive'] = datos.get('exhaustive', trabajo['exhaustive'])
+
+    for asignacion in args.fixed:
+        if '=' not in asignacion:
+            raise SystemExit(f"Valor fijo inválido (se esperaba categoria=valor): {asignacion}")
+        categoria, valor = asignacion.split('=', 1)
+        trabajo['fixed'][categoria.strip()] = valor.strip()
+
+    trabajo['sweep'].update(_normalizar_barrido(args.sweep))
+    if args.count is not None:
+        trabajo['count'] = args.count
+    if args.seed is not None:
+        trabajo['seed'] = args.seed
+    if args.exhaustive:
+        trabajo['exhaustive'] = True
+
+    # Completar las categorías sin valores explícitos con las opciones predefinidas
+    generador = PromptGenerator()
+    for categoria, valores in trabajo['sweep'].items():
+        if not valores:
+            valores = generador.get_category_options(categoria)
+            if not valores:
+                raise SystemExit(f"La categoría '{categoria}' no tiene opciones para recorrer")
+            trabajo['sweep'][categoria] = list(valores)
+
+    if trabajo['exhaustive']:
+        total = CombinationEnumerator(trabajo['sweep'], trabajo['fixed'], generador).count()
+        trabajo['count'] = total if trabajo['count'] is None else min(trabajo['count'], total)
+    elif trabajo['count'] is None:
+        trabajo['count'] = 1
+
+    return trabajo
+
+
+def _normalizar_barrido(barrido):
+    """Acepta una lista de categorías o un diccionario {categoria: [valores]}"""
+    if isinstance(barrido, dict):
+        return {categoria: list(valores or []) for categoria, valores in barrido.items()}
+    return {categoria: [] for categoria in barrido}
+
+
+def _iniciar_proceso():
+    global _generador, _enumerador
+    _generador = PromptGenerator()
+    _enumerador = None
+
+
+def generar_prompt(generador, trabajo, indice, asignacion=None):
+    """Genera el prompt número `indice` del trabajo de forma determinista"""
+    if asignacion is None:
+        rng = random.Random(f"{trabajo['seed']}-{indice}")
+        asignacion = dict(trabajo['fixed'])
+        for categoria, valores in trabajo['sweep'].items():
+            asignacion[categoria] = rng.choice(valores)
+
+    generador.clear_all()
+    for categoria, valor in asignacion.items():
+        generador.set_category_value(categoria, valor)
+
+    # generate_prompt aplica resolver_conflictos igual que en la interfaz
+    prompt = generador.generate_prompt()
+    return {
+        'index': indice,
+        'prompt': prompt,
+        'values': dict(generador.category_values)
+    }
+
+
+def generar_bloque(tarea):
+    """Genera un rango de prompts dentro de un proceso del pool"""
+    global _enumerador
+    trabajo, inicio, fin = tarea
+    if _generador is None:
+        _iniciar_proceso()
+
+    if not trabajo['exhaustive']:
+        return [generar_prompt(_generador, trabajo, indice) for indice in range(inicio, fin)]
+
+    if _enumerador is None:
+        _enumerador = CombinationEnumerator(trabajo['sweep'], trabajo['fixed'], _generador)
+    return [
+        generar_prompt(_generador, trabajo, indice, asignacion)
+        for indice, asignacion in enumerate(_enumerador.iter_range(inicio, fin), start=inicio)
+    ]
+
+
+def generar(trabajo, procesos=None):
+    """Genera los prompts del trabajo en orden, repartiendo bloques entre procesos"""
+    total = trabajo['count']
+    tareas = [
+        (trabajo, inicio, min(inicio + TAMANO_BLOQUE, total))
+        for inicio in range(0, total, TAMANO_BLOQUE)
+    ]
+
+    if procesos == 1 or len(tareas) <= 1:
+        for tarea in tareas:
+            yield from generar_bloque(tarea)
+        return
+
+    with Pool(processes=procesos, initializer=_iniciar_proceso) as pool:
+        for bloque in pool.imap(generar_bloque, tareas):
+            yield from bloque
+
+
+def escribir(resultados, salida, formato):
+    for resultado in resultados:
+        if formato == 'jsonl':
+            salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+        else:
+            salida.write(resultado['prompt'] + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera prompts por lotes sin abrir la interfaz")
+    parser.add_argument('--spec', help="Archivo JSON con la especificación del trabajo")
+    parser.add_argument('--fixed', action='append', default=[], metavar='CATEGORIA=VALOR',
+                        help="Valor fijo para una categoría (se puede repetir)")
+    parser.add_argument('--sweep', action='append', default=[], metavar='CATEGORIA',
+                        help="Categoría a recorrer con sus opciones predefinidas (se puede repetir)")
+    parser.add_argument('--count', type=int, help="Cantidad de prompts a generar")
+    parser.add_argument('--seed', type=int, help="Semilla para la selección aleatoria")
+    parser.add_argument('--exhaustive', action='store_true',
+                        help="Recorrer todas las combinaciones válidas en lugar de muestrear")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Cantidad de procesos (por defecto, uno por CPU)")
+    parser.add_argument('--output', '-o', help="Archivo JSONL de salida (por defecto, stdout)")
+    parser.add_argument('--format', choices=['text', 'jsonl'],
+                        help="Formato de salida (text en stdout, jsonl en archivo por defecto)")
+    args = parser.parse_args(argv)
+
+    trabajo = cargar_trabajo(args)
+    formato = args.format or ('jsonl' if args.output else 'text')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as salida:
+            escribir(generar(trabajo, args.workers), salida, formato)
+    else:
+        escribir(generar(trabajo, args.workers), sys.stdout, formato)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Prueba de carga del servicio de prompts (`server.py`).
+
+Uso típico:
+
+    python server.py --port 8765 &
+    python loadtest.py --port 8765 --clients 64 --requests 200
+
+Cada cliente abre una conexión keep-alive y una sesión, y repite un ciclo de
+llamadas parecido al uso de la interfaz: asignar valores, pedir sugerencias
+y combinaciones, y generar el prompt. Con `--batch N` envía las llamadas en
+lotes JSON-RPC de N. Al final muestra peticiones por segundo y la latencia
+(p50, p90, p99 y máxima) de cada petición HTTP.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+VALORES = {
+    'cabello_color': ['blonde hair', 'brown hair', 'black hair', 'red hair', 'blue hair'],
+    'ojos': ['blue eyes', 'green eyes', 'red eyes', 'purple eyes'],
+    'vestuario_general': ['school uniform', 'casual wear', 'formal wear', 'gothic style'],
+    'vestuario_superior': ['white blouse', 'hoodie', 'leather jacket', 'crop top'],
+    'fondo': ['classroom', 'beach', 'city', 'garden'],
+    'calidad_tecnica': ['masterpiece', 'best quality'],
+}
+
+
+class ClienteRpc:
+    """Conexión HTTP keep-alive que envía llamadas JSON-RPC a `/rpc`"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._ids = itertools.count(1)
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def llamada(self, metodo, **params):
+        return {'jsonrpc': '2.0', 'id': next(self._ids), 'method': metodo, 'params': params}
+
+    async def enviar(self, mensaje):
+        """Envía una llamada o un lote y retorna la respuesta decodificada"""
+        cuerpo = json.dumps(mensaje).encode('utf-8')
+        self.writer.write(
+            f"POST /rpc HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode('latin-1')
+            + cuerpo
+        )
+        await self.writer.drain()
+
+        cabecera = await self.reader.readuntil(b'\r\n\r\n')
+        lineas = cabecera.decode('latin-1').split('\r\n')
+        estado = int(lineas[0].split()[1])
+        longitud = 0
+        for linea in lineas[1:]:
+            if linea.lower().startswith('content-length:'):
+                longitud = int(linea.split(':', 1)[1])
+        respuesta = await self.reader.readexactly(longitud)
+        if estado >= 400:
+            raise RuntimeError(f"HTTP {estado}: {respuesta.decode('utf-8', 'replace')}")
+        return json.loads(respuesta) if respuesta else None
+
+    async def call(self, metodo, **params):
+        respuesta = await self.enviar(self.llamada(metodo, **params))
+        if 'error' in respuesta:
+            raise RuntimeError(f"{metodo}: {respuesta['error']['message']}")
+        return respuesta['result']
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def ciclo(cliente, sesion, rng):
+    """Llamadas de un ciclo de uso: asignar valores, sugerencias, combinaciones y prompt"""
+    llamadas = []
+    for categoria in rng.sample(list(VALORES), 3):
+        valor = rng.choice(VALORES[categoria])
+        llamadas.append(cliente.llamada('set_value', session=sesion, category=categoria, value=valor))
+        llamadas.append(cliente.llamada('suggest', category=categoria, value=valor))
+    prenda = rng.choice(VALORES['vestuario_superior']).replace(' ', '_')
+    llamadas.append(cliente.llamada('combinations', category='vestuario_superior', value=prenda))
+    llamadas.append(cliente.llamada('generate', session=sesion))
+    return llamadas
+
+
+async def ejecutar_cliente(numero, args, latencias, errores):
+    rng = random.Random(f"{args.seed}-{numero}")
+    cliente = ClienteRpc(args.host, args.port)
+    await cliente.connect()
+    try:
+        sesion = (await cliente.call('open_session'))['session']
+        pendientes = []
+        enviadas = 0
+        while enviadas < args.requests:
+            if not pendientes:
+                pendientes = ciclo(cliente, sesion, rng)
+            if args.batch > 1:
+                mensaje, pendientes = pendientes[:args.batch], pendientes[args.batch:]
+            else:
+                mensaje, pendientes = pendientes[0], pendientes[1:]
+
+            inicio = time.perf_counter()
+            respuesta = await cliente.enviar(mensaje)
+            latencias.append(time.perf_counter() - inicio)
+            enviadas += 1
+            for item in respuesta if isinstance(respuesta, list) else [respuesta]:
+                if 'error' in item:
+                    errores.append(item['error']['message'])
+        await cliente.call('close_session', session=sesion)
+    finally:
+        cliente.close()
+
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+async def ejecutar(args):
+    latencias = []
+    errores = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        ejecutar_cliente(numero, args, latencias, errores) for numero in range(args.clients)
+    ))
+    duracion = time.perf_counter() - inicio
+
+    ordenadas = sorted(latencias)
+    llamadas = len(latencias) * max(args.batch, 1)
+    print(f"Clientes: {args.clients}  peticiones: {len(latencias)}  llamadas: {llamadas}  "
+          f"errores: {len(errores)}")
+    print(f"Duración: {duracion:.2f} s  peticiones/s: {len(latencias) / duracion:.0f}  "
+          f"llamadas/s: {llamadas / duracion:.0f}")
+    print("Latencia (ms): " + "  ".join(
+        f"{nombre} {valor * 1000:.2f}" for nombre, valor in (
+            ('p50', percentil(ordenadas, 50)), ('p90', percentil(ordenadas, 90)),
+            ('p99', percentil(ordenadas, 99)), ('max', ordenadas[-1] if ordenadas else 0.0)
+        )
+    ))
+    for mensaje in sorted(set(errores))[:5]:
+        print(f"  error: {mensaje}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de prompts")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=32, help="Conexiones (y sesiones) simultáneas")
+    parser.add_argument('--requests', type=int, default=200, help="Peticiones HTTP por cliente")
+    parser.add_argument('--batch', type=int, default=1, help="Llamadas JSON-RPC por petición")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(ejecutar(args))
+
+
+if __name__ == "__main__":
+    main()
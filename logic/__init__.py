@@ -0,0 +1,92 @@
+"""Núcleo del generador de prompts, sin interfaz gráfica.
+
+Este paquete no importa Qt ni nada de `ui`: lo usan la ventana principal,
+`batch.py` y cualquier servicio o proceso de trabajo que necesite generar
+prompts. `import logic` no carga ningún módulo; cada nombre de abajo se
+importa la primera vez que se usa, así que arrancar un proceso que solo
+genera prompts cuesta lo que cuestan los módulos que realmente usa.
+
+API estable (se importa desde `logic`):
+
+Reglas
+    `get_rule_store()` / `RuleStore`: archivos de `data/` cargados una vez por
+    proceso, con caché binaria y recarga atómica (`reload`, `add_listener`).
+    `RuleWatcher`: recarga en segundo plano los archivos modificados.
+    `compile_cache()`: genera la caché binaria por adelantado.
+
+Estado de una sesión y prompt
+    `PromptGenerator`: valores por categoría (`set_category_value`,
+    `get_category_value`, `clear_all`), inferencias y conflictos entre
+    categorías, y `generate_prompt()` para obtener el texto final.
+    `InferenceEngine`: propagación de las reglas de inferencia hasta un punto
+    fijo, con detección de ciclos y resultados memorizados por versión.
+    `Session`: la misma interfaz con estado compacto, para servir miles de
+    sesiones; `get_category_catalog()` / `CategoryCatalog` es el catálogo de
+    categorías que comparten.
+    `render_prompt(estado)`: función pura sobre un `PromptState` inmutable
+    (`generador.snapshot()`); retorna un `RenderResult` con el prompt, los
+    valores que quedan y las decisiones de conflicto, sin modificar nada.
+    Se puede llamar en paralelo desde hilos o procesos.
+
+Sugerencias
+    `SuggestionEngine`: sugerencias relacionadas con un valor
+    (`get_suggestions` retorna por categoría `RankedSuggestions`, secuencias
+    perezosas de solo lectura que se usan como las listas de antes),
+    combinaciones de vestuario y traducciones.
+    `ColorPalette`: colores para una prenda, los compatibles primero.
+
+Enumeración y búsqueda
+    `CombinationEnumerator`: combinaciones válidas de varias categorías, sin
+    construir el producto cartesiano.
+    `OptionIndex` / `CompletionIndex`: filtrado y autocompletado de opciones.
+
+Ejemplo:
+
+    from logic import PromptGenerator
+
+    generador = PromptGenerator()
+    generador.set_category_value('cabello_color', 'blue hair')
+    generador.set_category_value('ojos', 'green eyes')
+    print(generador.generate_prompt())
+"""
+
+# Nombre público -> módulo que lo define
+_API = {
+    'RuleStore': 'logic.rule_store',
+    'get_rule_store': 'logic.rule_store',
+    'compile_cache': 'logic.rule_store',
+    'DATA_FILES': 'logic.rule_store',
+    'RuleWatcher': 'logic.rule_watcher',
+    'PromptGenerator': 'logic.prompt_generator',
+    'InferenceEngine': 'logic.inference',
+    'Session': 'logic.session',
+    'CategoryCatalog': 'logic.session',
+    'get_category_catalog': 'logic.session',
+    'PromptState': 'logic.render',
+    'RenderResult': 'logic.render',
+    'ConflictDecision': 'logic.render',
+    'render_prompt': 'logic.render',
+    'SuggestionEngine': 'logic.suggestion_engine',
+    'RankedSuggestions': 'logic.suggestion_engine',
+    'ColorPalette': 'logic.color_palette',
+    'CombinationEnumerator': 'logic.combinator',
+    'OptionIndex': 'logic.text_index',
+    'CompletionIndex': 'logic.text_index',
+}
+
+__all__ = list(_API)
+
+
+def __getattr__(name):
+    # Importación diferida: `import logic` no carga nada hasta usar un nombre
+    module_name = _API.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'logic' has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,62 @@
+import re
+
+from logic.cache import LRUCache
+from logic.rule_store import get_rule_store
+
+COLOR_RULES_FILE = 'color_rules.json'
+
+# Paleta usada si falta data/color_rules.json
+PALETA_POR_DEFECTO = {
+    'paleta': ["black", "white", "blue", "red", "green", "gray", "brown", "orange",
+               "yellow", "pink", "gold", "silver", "purple", "jade", "violet"],
+    'compatibles': {}
+}
+
+
+class ColorPalette:
+    """Colores ofrecidos para cada prenda, leídos de `data/color_rules.json`.
+
+    `compatibles` asocia palabras de la prenda ("uniform", "jeans"...) con los
+    colores que mejor le quedan; esos van primero y luego el resto de la
+    paleta en su orden. El orden de cada prenda se calcula una vez por versión
+    de las reglas.
+    """
+
+    # Compartida por todas las instancias; la clave incluye el almacén y la versión de las reglas
+    cache = LRUCache(maxsize=512)
+
+    def __init__(self, store=None):
+        self.store = store or get_rule_store()
+
+    def _indice(self, snapshot):
+        return self.store.derived(
+            COLOR_RULES_FILE, 'indice_colores', self._build_indice,
+            default=PALETA_POR_DEFECTO, snapshot=snapshot
+        )
+
+    @staticmethod
+    def _build_indice(data):
+        """Paleta sin duplicados y, por palabra, sus colores compatibles presentes en ella"""
+        paleta = tuple(dict.fromkeys(data.get('paleta', PALETA_POR_DEFECTO['paleta'])))
+        en_paleta = set(paleta)
+        compatibles = {
+            palabra.lower(): tuple(c for c in dict.fromkeys(colores) if c in en_paleta)
+            for palabra, colores in data.get('compatibles', {}).items()
+        }
+        return {'paleta': paleta, 'compatibles': compatibles}
+
+    def colores_para(self, prenda):
+        """Colores para una prenda: primero los compatibles, luego el resto de la paleta"""
+        snapshot = self.store.snapshot(COLOR_RULES_FILE, default=PALETA_POR_DEFECTO)
+        return self.cache.get_or_compute(
+            (self.store, snapshot.version, prenda.lower()),
+            lambda: self._ordenar(self._indice(snapshot), prenda)
+        )
+
+    @staticmethod
+    def _ordenar(indice, prenda):
+        compatibles = indice['compatibles']
+        primeros = []
+        for palabra in re.findall(r'[a-z]+', prenda.lower()):
+            primeros.extend(compatibles.get(palabra, ()))
+        return tuple(dict.fromkeys(primeros + list(indice['paleta'])))
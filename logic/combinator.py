@@ -0,0 +1,197 @@
+from itertools import islice
+
+from logic.inference import InferenceEngine
+from logic.prompt_generator import PromptGenerator
+
+
+class CombinationEnumerator:
+    """Enumera de forma perezosa las combinaciones válidas de varias categorías.
+
+    Una combinación es válida si `generate_prompt` no descartaría ninguno de sus
+    valores: ningún par de `conflictos` con prioridades distintas puede estar
+    presente a la vez, y ningún valor elegido puede bloquear (`_bloquear`, con
+    la misma propagación que `aplicar_inferencias`) otra categoría presente.
+    Si las categorías fijas ya son incompatibles entre sí, no hay ninguna
+    combinación válida. Las ramas inválidas se podan al elegir cada valor, sin
+    construir el producto cartesiano completo.
+
+    `count()` da el total exacto, sin límite de tamaño; `len()` lo usa pero,
+    como cualquier `__len__`, falla con OverflowError si supera sys.maxsize.
+    """
+
+    def __init__(self, sweep, fixed=None, generator=None):
+        self.generator = generator or PromptGenerator()
+        self.fixed = dict(fixed or {})
+
+        if isinstance(sweep, dict):
+            dominios = {categoria: list(valores) for categoria, valores in sweep.items()}
+        else:
+            dominios = {categoria: list(self.generator.get_category_options(categoria)) for categoria in sweep}
+
+        repetidas = set(dominios) & set(self.fixed)
+        if repetidas:
+            raise ValueError(f"Categorías fijas y a recorrer a la vez: {sorted(repetidas)}")
+
+        self.categories = list(dominios.keys())
+        self._conflictivas = self._calcular_conflictivas()
+        self._fijas_compatibles = self._calcular_fijas_compatibles()
+
+        # Filtrar los valores incompatibles con las categorías fijas
+        self._dominios = [
+            [valor for valor in dominios[categoria] if self._compatible_con_fijas(categoria, valor)]
+            for categoria in self.categories
+        ]
+        self._incompatibles, self._alcance = self._calcular_incompatibles()
+        self._conteos = {}
+
+    def _calcular_conflictivas(self):
+        """Pares de categorías en conflicto que resolver_conflictos no dejaría convivir"""
+        prioridades = self.generator.prioridades
+        conflictivas = {}
+        for cat1, cat2 in self.generator.conflictos:
+            if prioridades.get(cat1, 0) != prioridades.get(cat2, 0):
+                conflictivas.setdefault(cat1, set()).add(cat2)
+                conflictivas.setdefault(cat2, set()).add(cat1)
+        return conflictivas
+
+    def _excluidas(self, categoria, valor):
+        """Categorías que no pueden estar presentes junto a categoria=valor"""
+        motor = InferenceEngine.for_rules(self.generator.reglas_compiladas)
+        bloqueadas = motor.propagar(categoria, valor).bloqueadas
+        return self._conflictivas.get(categoria, set()).union(bloqueadas)
+
+    def _calcular_fijas_compatibles(self):
+        """True si ningún valor fijo excluye a otra categoría fija"""
+        return not any(
+            otra in self._excluidas(cat_fija, valor_fijo)
+            for cat_fija, valor_fijo in self.fixed.items()
+            for otra in self.fixed
+            if otra != cat_fija
+        )
+
+    def _compatible_con_fijas(self, categoria, valor):
+        excluidas = self._excluidas(categoria, valor)
+        for cat_fija, valor_fijo in self.fixed.items():
+            if cat_fija in excluidas or categoria in self._excluidas(cat_fija, valor_fijo):
+                return False
+        return True
+
+    def _calcular_incompatibles(self):
+        """Precalcula, para cada (categoría, valor), qué valores posteriores quedan prohibidos"""
+        n = len(self.categories)
+        incompatibles = [[{} for _ in dominio] for dominio in self._dominios]
+        alcance = [[-1] * len(dominio) for dominio in self._dominios]
+
+        excluidas = [
+            [self._excluidas(categoria, valor) for valor in self._dominios[i]]
+            for i, categoria in enumerate(self.categories)
+        ]
+
+        for i in range(n):
+            for v in range(len(self._dominios[i])):
+                for j in range(i + 1, n):
+                    if self.categories[j] in excluidas[i][v]:
+                        # Todos los valores de j chocan con esta elección
+                        prohibidos = frozenset(range(len(self._dominios[j])))
+                    else:
+                        prohibidos = frozenset(
+                            w for w in range(len(self._dominios[j]))
+                            if self.categories[i] in excluidas[j][w]
+                        )
+                    if prohibidos:
+                        incompatibles[i][v][j] = prohibidos
+                        alcance[i][v] = j
+        return incompatibles, alcance
+
+    def _permitidos(self, k, elegidos):
+        prohibidos = set()
+        for i, v in elegidos:
+            prohibidos.update(self._incompatibles[i][v].get(k, ()))
+        return [v for v in range(len(self._dominios[k])) if v not in prohibidos]
+
+    def _siguientes(self, k, elegidos, v):
+        """Elecciones que siguen restringiendo categorías posteriores a k"""
+        return tuple(
+            (i, w) for i, w in elegidos + ((k, v),)
+            if self._alcance[i][w] > k
+        )
+
+    def _contar(self, k, elegidos):
+        if k == len(self.categories):
+            return 1
+        clave = (k, elegidos)
+        if clave not in self._conteos:
+            self._conteos[clave] = sum(
+                self._contar(k + 1, self._siguientes(k, elegidos, v))
+                for v in self._permitidos(k, elegidos)
+            )
+        return self._conteos[clave]
+
+    def _recorrer(self, k, elegidos, camino, saltar):
+        if k == len(self.categories):
+            yield self._asignacion(camino)
+            return
+        for v in self._permitidos(k, elegidos):
+            siguientes = self._siguientes(k, elegidos, v)
+            total = self._contar(k + 1, siguientes)
+            if saltar >= total:
+                # Saltar la rama completa (incluye las ramas sin combinaciones válidas)
+                saltar -= total
+                continue
+            camino.append(v)
+            yield from self._recorrer(k + 1, siguientes, camino, saltar)
+            camino.pop()
+            saltar = 0
+
+    def _asignacion(self, camino):
+        asignacion = dict(self.fixed)
+        for i, v in enumerate(camino):
+            asignacion[self.categories[i]] = self._dominios[i][v]
+        return asignacion
+
+    def count(self):
+        """Cantidad exacta de combinaciones válidas"""
+        if not self._fijas_compatibles:
+            return 0
+        return self._contar(0, ())
+
+    def estimate(self):
+        """Cota superior barata: producto de los valores compatibles con las categorías fijas"""
+        if not self._fijas_compatibles:
+            return 0
+        total = 1
+        for dominio in self._dominios:
+            total *= len(dominio)
+        return total
+
+    def __len__(self):
+        """Igual que count(), pero solo hasta sys.maxsize (usar count() para espacios mayores)"""
+        return self.count()
+
+    def __iter__(self):
+        if not self._fijas_compatibles:
+            return iter(())
+        return self._recorrer(0, (), [], 0)
+
+    def __getitem__(self, index):
+        total = self.count()
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("Índice de combinación fuera de rango")
+        return next(self._recorrer(0, (), [], index))
+
+    def iter_range(self, start, stop=None):
+        """Recorre las combinaciones [start, stop) sin generar las anteriores"""
+        total = self.count()
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return iter(())
+        return islice(self._recorrer(0, (), [], start), stop - start)
+
+    def shard(self, index, total_shards):
+        """Recorre la porción `index` de `total_shards` partes contiguas del espacio"""
+        total = self.count()
+        inicio = total * index // total_shards
+        fin = total * (index + 1) // total_shards
+        return self.iter_range(inicio, fin)
@@ -0,0 +1,167 @@
+import threading
+from types import MappingProxyType
+from weakref import WeakKeyDictionary
+
+
+class InferenceResult:
+    """Cierre de las reglas de inferencia a partir de un valor elegido.
+
+    - `bloqueadas`: categorías a bloquear, en el orden en que se descubrieron.
+    - `sugerencias`: categoría -> valores sugeridos (sin repetir, primero los
+      de las reglas más cercanas al valor elegido), sin las categorías bloqueadas.
+    - `ciclos`: caminos de (categoría, valor) que vuelven sobre sí mismos; se
+      recorren una sola vez y se informan por si la regla es un error.
+    - `conflictos`: categorías cuyo bloqueo no se puede decidir (reglas que se
+      bloquean entre sí) y la del valor elegido si alguna regla la bloquearía;
+      ninguna de ellas se bloquea.
+    """
+
+    __slots__ = ('bloqueadas', 'sugerencias', 'ciclos', 'conflictos')
+
+    def __init__(self, bloqueadas, sugerencias, ciclos, conflictos=()):
+        self.bloqueadas = bloqueadas
+        self.sugerencias = sugerencias
+        self.ciclos = ciclos
+        self.conflictos = conflictos
+
+
+SIN_INFERENCIAS = InferenceResult((), MappingProxyType({}), ())
+
+
+class InferenceEngine:
+    """Propaga las reglas de inferencia hasta un punto fijo.
+
+    Cada (categoría, valor) con reglas es un nodo; sus sugerencias son aristas
+    hacia otros nodos, que disparan sus propias reglas como si se hubieran
+    elegido, y sus `_bloquear` se acumulan. Una categoría bloqueada no
+    propaga: ni sus sugerencias ni sus bloqueos cuentan, aunque el bloqueo
+    se descubra después. Los bloqueos se calculan hasta un punto fijo que
+    no depende del orden de las reglas (ver `_cerrar`); el valor elegido
+    nunca se bloquea a sí mismo. Cada recorrido es en profundidad con una
+    pila explícita y visita cada nodo alcanzable una sola vez (termina
+    aunque haya ciclos, que detecta), sin tocar el resto de las reglas.
+
+    Hay un motor por versión de las reglas compiladas (`for_rules`), y cada
+    uno memoriza el resultado de cada valor elegido.
+    """
+
+    _motores = WeakKeyDictionary()
+    _motores_lock = threading.Lock()
+
+    def __init__(self, reglas):
+        self.reglas = reglas
+        self._memo = {}
+
+    @classmethod
+    def for_rules(cls, reglas):
+        """Motor compartido para unas reglas compiladas (CompiledRules)"""
+        motor = cls._motores.get(reglas)
+        if motor is None:
+            with cls._motores_lock:
+                motor = cls._motores.get(reglas)
+                if motor is None:
+                    motor = cls._motores[reglas] = cls(reglas)
+        return motor
+
+    def propagar(self, categoria, valor):
+        """InferenceResult de elegir categoria=valor"""
+        clave = (categoria, valor)
+        if clave not in self.reglas.tabla_inferencias:
+            return SIN_INFERENCIAS
+        resultado = self._memo.get(clave)
+        if resultado is None:
+            resultado = self._memo[clave] = self._cerrar(clave)
+        return resultado
+
+    def _cerrar(self, raiz):
+        tabla = self.reglas.tabla_inferencias
+        ciclos = []
+
+        # Una regla bloquea solo si su nodo es alcanzable sin pasar por categorías
+        # bloqueadas, lo que depende de los propios bloqueos. Se alternan una cota
+        # inferior (bloqueos seguros) y una superior (posibles) hasta que la
+        # inferior deja de crecer; el resultado no depende del orden de las reglas.
+        seguras = {}
+        posibles = self._bloqueos(raiz, seguras, ciclos)
+        while True:
+            nuevas = self._bloqueos(raiz, posibles)
+            if nuevas.keys() == seguras.keys():
+                break
+            seguras = nuevas
+            posibles = self._bloqueos(raiz, seguras)
+
+        # Sugerencias y bloqueos del valor elegido: solo de los nodos que
+        # disparan seguro (alcanzables sin pasar por ninguna categoría que
+        # podría quedar bloqueada)
+        sugerencias = {}
+        bloquea_raiz = False
+        for nodo in self._recorrer(raiz, posibles):
+            bloqueos, sugeridas = tabla[nodo]
+            bloquea_raiz = bloquea_raiz or raiz[0] in bloqueos
+            for cat_relacionada, valores in sugeridas.items():
+                if cat_relacionada not in seguras:
+                    destino = sugerencias.setdefault(cat_relacionada, {})
+                    for valor in valores:
+                        destino[valor] = None
+
+        conflictos = [categoria for categoria in posibles if categoria not in seguras]
+        if bloquea_raiz:
+            conflictos.append(raiz[0])
+        return InferenceResult(
+            tuple(seguras),
+            MappingProxyType({categoria: tuple(valores) for categoria, valores in sugerencias.items()}),
+            tuple(ciclos),
+            tuple(conflictos)
+        )
+
+    def _bloqueos(self, raiz, excluidas, ciclos=None):
+        """Categorías que bloquean los nodos alcanzables sin pasar por `excluidas`
+        (nunca la del valor elegido)"""
+        tabla = self.reglas.tabla_inferencias
+        bloqueos = {}  # dict como conjunto ordenado
+        for nodo in self._recorrer(raiz, excluidas, ciclos):
+            for cat_bloquear in tabla[nodo][0]:
+                if cat_bloquear != raiz[0]:
+                    bloqueos[cat_bloquear] = None
+        return bloqueos
+
+    def _recorrer(self, raiz, bloqueadas, ciclos=None):
+        """Nodos alcanzables desde `raiz` en profundidad (preorden), una vez cada uno.
+
+        No expande los nodos cuya categoría está en `bloqueadas` al llegar a
+        ellos; si se pasa `ciclos`, agrega cada camino que vuelve a un nodo de
+        la rama actual.
+        """
+        tabla = self.reglas.tabla_inferencias
+        visitados = {raiz}
+        camino = []  # Nodos de la rama actual
+        en_camino = set()
+        pendientes = [(raiz, None)]  # (nodo, hijos por recorrer); None = aún no se expandió
+
+        while pendientes:
+            nodo, hijos = pendientes[-1]
+            if hijos is None:
+                if nodo[0] in bloqueadas:
+                    pendientes.pop()
+                    continue
+                yield nodo
+                hijos = iter([
+                    (cat_relacionada, valor)
+                    for cat_relacionada, valores in tabla[nodo][1].items()
+                    for valor in valores
+                    if (cat_relacionada, valor) in tabla
+                ])
+                pendientes[-1] = (nodo, hijos)
+                camino.append(nodo)
+                en_camino.add(nodo)
+
+            hijo = next(hijos, None)
+            if hijo is None:
+                pendientes.pop()
+                en_camino.discard(camino.pop())
+            elif hijo in en_camino:
+                if ciclos is not None:
+                    ciclos.append(tuple(camino[camino.index(hijo):]) + (hijo,))
+            elif hijo not in visitados:
+                visitados.add(hijo)
+                pendientes.append((hijo, None))
@@ -1,7 +1,20 @@
-import json
+from bisect import bisect_left, insort
+from logic.rule_compiler import compile_rules
+from logic.rule_store import get_rule_store
+
+# logic.inference, logic.render y logic.text_index se importan al usarlos:
+# importar este módulo (la entrada de la interfaz y del servidor) debe ser barato
+
+CATEGORY_RULES_FILE = 'category_rules.json'
+# Si no existe el archivo, usar una estructura vacía pero válida
+REGLAS_VACIAS = {
+    'reglas_inferencia': {},
+    'conflictos': [],
+    'prioridades': {}
+}
 
 class PromptGenerator:
-    def __init__(self):
+    def __init__(self, store=None):
         # CATEGORÍAS EXPANDIDAS - SISTEMA COMPLETO
         self.categories = {
             # Personaje
@@ -76,16 +89,26 @@ class PromptGenerator:
             'sombras': []
         }
         
+        # category_values solo debe modificarse con _asignar_valor/_eliminar_valor
+        # para mantener sincronizado el orden por prioridad y el prompt en caché
         self.category_values = {}
+        self._orden = []  # Claves (-prioridad, secuencia, categoría) ordenadas
+        self._clave_orden = {}
+        self._secuencia = 0
+        self._prompt_cache = None
+        self._categorias_nuevas = set()  # Pendientes de revisar conflictos
         self.blocked_categories = set()
         self.category_options = self._init_category_options()
+        self._indices_opciones = {}  # Índices de filtrado, creados al pedirlos
+        self._indices_completado = {}
         self.categorias_bloqueadas = set()  # Categorías bloqueadas permanentemente
         self.categorias_temporalmente_bloqueadas = set()  # Para conflictos dinámicos
         
         # CORRECCIÓN: Cargar reglas e inicializar atributos
-        self.reglas = self._cargar_reglas()
-        self.prioridades = self.reglas.get('prioridades', {})
-        self.conflictos = self.reglas.get('conflictos', [])
+        # (compartidas con el resto del proceso a través del almacén de reglas)
+        self.store = store or get_rule_store()
+        self._version_reglas = None
+        self._sincronizar_reglas()
     
     def _init_category_options(self):
         """Inicializa las opciones predefinidas para cada categoría"""
@@ -192,102 +215,172 @@ class PromptGenerator:
         """Retorna las opciones predefinidas para una categoría"""
         return self.category_options.get(category, [])
         
+    def get_option_index(self, category):
+        """Índice de filtrado de las opciones de una categoría (compartido entre diálogos)"""
+        opciones = self.get_category_options(category)
+        indice = self._indices_opciones.get(category)
+        if indice is None or indice.opciones != tuple(opciones):
+            from logic.text_index import OptionIndex
+            indice = OptionIndex(opciones)
+            self._indices_opciones[category] = indice
+        return indice
+        
+    def get_completion_index(self, category):
+        """Índice de autocompletado con ranking de una categoría (comparte el de subcadenas)"""
+        indice_opciones = self.get_option_index(category)
+        indice = self._indices_completado.get(category)
+        if indice is None or indice.opciones != indice_opciones.opciones:
+            from logic.text_index import CompletionIndex
+            indice = CompletionIndex(indice_opciones.opciones, subcadenas=indice_opciones)
+            self._indices_completado[category] = indice
+        return indice
+        
     def set_category_blocked(self, category, blocked):
         """Bloquea o desbloquea una categoría"""
         if blocked:
             self.blocked_categories.add(category)
             # Remover valor si está bloqueada
-            if category in self.category_values:
-                del self.category_values[category]
+            self._eliminar_valor(category)
         else:
             self.blocked_categories.discard(category)
             
     def set_category_value(self, category, value):
         """Establece el valor de una categoría"""
         if category not in self.blocked_categories:
-            self.category_values[category] = value
+            self._asignar_valor(category, value)
             
+    def _asignar_valor(self, categoria, valor):
+        """Asigna un valor manteniendo el orden por prioridad de forma incremental"""
+        if categoria not in self.category_values:
+            self.category_values[categoria] = valor
+            # El número de secuencia reproduce el desempate por orden de inserción
+            clave = (self.reglas_compiladas.rango(categoria), self._secuencia, categoria)
+            self._secuencia += 1
+            insort(self._orden, clave)
+            self._clave_orden[categoria] = clave
+            # Una categoría nueva puede entrar en conflicto con las existentes
+            self._categorias_nuevas.add(categoria)
+            self._prompt_cache = None
+        elif self.category_values[categoria] != valor:
+            self.category_values[categoria] = valor
+            self._prompt_cache = None
+
+    def _eliminar_valor(self, categoria):
+        """Elimina el valor de una categoría y su posición en el orden"""
+        if categoria in self.category_values:
+            del self.category_values[categoria]
+            clave = self._clave_orden.pop(categoria)
+            del self._orden[bisect_left(self._orden, clave)]
+            self._prompt_cache = None
+
     def get_category_value(self, category):
         """Obtiene el valor de una categoría"""
         return self.category_values.get(category, "")
         
-    def _cargar_reglas(self):
-        try:
-            with open('data/category_rules.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            # Si no existe el archivo, devolver estructura vacía pero válida
-            return {
-                'reglas_inferencia': {}, 
-                'conflictos': [], 
-                'prioridades': {}
+    def _sincronizar_reglas(self):
+        """Adopta la versión actual de las reglas si el archivo se recargó.
+        
+        Las reglas y su forma compilada se toman de la misma versión; el orden
+        por prioridad se recalcula conservando el orden de inserción, y todas
+        las categorías presentes vuelven a revisar conflictos.
+        """
+        snapshot = self.store.snapshot(CATEGORY_RULES_FILE, default=REGLAS_VACIAS)
+        if snapshot.version == self._version_reglas:
+            return
+        self._version_reglas = snapshot.version
+        self.reglas = snapshot.data
+        self.reglas_compiladas = self.store.derived(
+            CATEGORY_RULES_FILE, 'compiladas', compile_rules, snapshot=snapshot
+        )
+        self.prioridades = self.reglas_compiladas.prioridades
+        self.conflictos = self.reglas_compiladas.conflictos
+        
+        if self.category_values:
+            self._clave_orden = {
+                categoria: (self.reglas_compiladas.rango(categoria), secuencia, categoria)
+                for _, secuencia, categoria in self._orden
             }
+            self._orden = sorted(self._clave_orden.values())
+            self._categorias_nuevas.update(self.category_values)
+            self._prompt_cache = None
     
     def aplicar_inferencias(self, categoria, valor):
-        """Aplica reglas cuando se selecciona un valor"""
-        reglas_categoria = self.reglas['reglas_inferencia'].get(categoria, {})
-        reglas_valor = reglas_categoria.get(valor, {})
+        """Aplica reglas cuando se selecciona un valor.
         
-        sugerencias = {}
-        categorias_a_bloquear = reglas_valor.get('_bloquear', [])
+        Las reglas se propagan hasta un punto fijo: las sugerencias disparan sus
+        propias reglas y los bloqueos se acumulan (ver InferenceEngine).
+        """
+        from logic.inference import InferenceEngine
+        self._sincronizar_reglas()
+        resultado = InferenceEngine.for_rules(self.reglas_compiladas).propagar(categoria, valor)
         
         # Bloquear categorías conflictivas
-        for cat_bloquear in categorias_a_bloquear:
+        for cat_bloquear in resultado.bloqueadas:
             self.categorias_temporalmente_bloqueadas.add(cat_bloquear)
-            if cat_bloquear in self.category_values:
-                del self.category_values[cat_bloquear]
+            self._eliminar_valor(cat_bloquear)
         
-        # Generar sugerencias para otras categorías
-        for cat_relacionada, valores_sugeridos in reglas_valor.items():
-            if not cat_relacionada.startswith('_'):  # Ignorar claves especiales
-                sugerencias[cat_relacionada] = valores_sugeridos
-        
-        return sugerencias
+        # Sugerencias para otras categorías (copia para no exponer el resultado memorizado)
+        return dict(resultado.sugerencias)
     
-    def resolver_conflictos(self):
-        """Resuelve conflictos basado en prioridades"""
-        for conflicto in self.conflictos:
-            cat1, cat2 = conflicto
+    def resolver_conflictos(self, categorias=None):
+        """Resuelve conflictos basado en prioridades.
+        
+        Si se indican categorías, solo se revisan los pares de conflicto en los
+        que participan; el resto ya quedó resuelto en la pasada anterior.
+        """
+        if categorias is None:
+            categorias = list(self.category_values)
+        for indice in self.reglas_compiladas.conflictos_de(categorias):
+            cat1, cat2 = self.conflictos[indice]
             if cat1 in self.category_values and cat2 in self.category_values:
                 prioridad1 = self.prioridades.get(cat1, 0)
                 prioridad2 = self.prioridades.get(cat2, 0)
                 
                 if prioridad1 > prioridad2:
-                    del self.category_values[cat2]
+                    self._eliminar_valor(cat2)
                     self.categorias_temporalmente_bloqueadas.add(cat2)
                 elif prioridad2 > prioridad1:
-                    del self.category_values[cat1]
+                    self._eliminar_valor(cat1)
                     self.categorias_temporalmente_bloqueadas.add(cat1)
     
     def generate_prompt(self):
         """Genera prompt ordenado por prioridades"""
-        # Solo resolver conflictos si hay reglas cargadas
-        if self.conflictos:
-            self.resolver_conflictos()
+        self._sincronizar_reglas()
+        # Los conflictos solo cambian cuando aparece una categoría nueva,
+        # y solo hace falta revisar sus vecinos en el grafo de conflictos
+        if self.conflictos and self._categorias_nuevas:
+            self.resolver_conflictos(self._categorias_nuevas)
+        self._categorias_nuevas.clear()
         
-        # Ordenar por prioridad (mayor a menor)
-        categorias_ordenadas = sorted(
-            self.category_values.keys(),
-            key=lambda x: self.prioridades.get(x, 0),
-            reverse=True
-        )
+        # Reconstruir el texto solo si algún valor cambió desde la última vez
+        if self._prompt_cache is None:
+            valores_activos = []
+            for _, _, categoria in self._orden:
+                if self.category_values[categoria]:
+                    valores_activos.append(self.category_values[categoria])
+            self._prompt_cache = ", ".join(valores_activos)
         
-        valores_activos = []
-        for categoria in categorias_ordenadas:
-            if categoria in self.category_values and self.category_values[categoria]:
-                valores_activos.append(self.category_values[categoria])
+        return self._prompt_cache
         
-        return ", ".join(valores_activos)
+    def snapshot(self):
+        """Estado inmutable actual, para generar variantes con render_prompt sin tocar este generador"""
+        from logic.render import PromptState
+        self._sincronizar_reglas()
+        # category_values conserva el orden de asignación, que desempata las prioridades
+        return PromptState(self.category_values, self.reglas_compiladas, self.blocked_categories, self._version_reglas)
         
     def clear_all(self):
         """Limpia todos los valores"""
         self.category_values.clear()
+        self._orden.clear()
+        self._clave_orden.clear()
+        self._prompt_cache = None
+        self._categorias_nuevas.clear()
     
     def bloquear_categoria_permanente(self, categoria):
         """Bloqueo manual del usuario (clic derecho)"""
         self.categorias_bloqueadas.add(categoria)
-        if categoria in self.category_values:
-            del self.category_values[categoria]
+        self._eliminar_valor(categoria)
     
     def es_categoria_disponible(self, categoria):
         return categoria not in self.categorias_bloqueadas and categoria not in self.categorias_temporalmente_bloqueadas
@@ -301,5 +394,5 @@ class PromptGenerator:
         """Actualiza una categoría específica con valor contextual"""
         if value:
             self.set_category_value(category, value)
-        elif category in self.category_values:
-            del self.category_values[category]
\ No newline at end of file
+        else:
+            self._eliminar_valor(category)
\ No newline at end of file
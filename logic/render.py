@@ -0,0 +1,101 @@
+class PromptState:
+    """Estado inmutable de un prompt: valores en orden de asignación, categorías
+    bloqueadas y las reglas compiladas con las que se resuelve.
+
+    No referencia al generador del que salió, así que puede compartirse entre
+    hilos o enviarse a otros procesos (se serializa con pickle) y derivar
+    variantes sin copiar nada más que los valores.
+    """
+
+    __slots__ = ('values', 'blocked', 'reglas', 'version_reglas')
+
+    def __init__(self, values, reglas, blocked=(), version_reglas=None):
+        # Pares (categoría, valor); el orden de asignación desempata las prioridades
+        self.values = tuple(values.items()) if isinstance(values, dict) else tuple(values)
+        self.blocked = frozenset(blocked)
+        self.reglas = reglas
+        self.version_reglas = version_reglas
+
+    def with_values(self, changes):
+        """Nuevo estado con `changes` {categoría: valor} aplicados como set_category_value.
+
+        Las categorías existentes conservan su posición, las nuevas van al final,
+        las bloqueadas se ignoran y un valor None elimina la categoría.
+        """
+        values = dict(self.values)
+        for categoria, valor in changes.items():
+            if valor is None:
+                values.pop(categoria, None)
+            elif categoria not in self.blocked:
+                values[categoria] = valor
+        return PromptState(values, self.reglas, self.blocked, self.version_reglas)
+
+
+class ConflictDecision:
+    """Categoría descartada al resolver un conflicto, y la que tenía más prioridad"""
+
+    __slots__ = ('descartada', 'ganadora')
+
+    def __init__(self, descartada, ganadora):
+        self.descartada = descartada
+        self.ganadora = ganadora
+
+    def __eq__(self, other):
+        return isinstance(other, ConflictDecision) and \
+            (self.descartada, self.ganadora) == (other.descartada, other.ganadora)
+
+    def __hash__(self):
+        return hash((self.descartada, self.ganadora))
+
+    def __repr__(self):
+        return f"ConflictDecision({self.descartada!r}, {self.ganadora!r})"
+
+
+class RenderResult:
+    """Resultado de render_prompt: el texto, los valores que quedaron y las decisiones"""
+
+    __slots__ = ('prompt', 'values', 'decisions')
+
+    def __init__(self, prompt, values, decisions):
+        self.prompt = prompt
+        self.values = values
+        self.decisions = decisions
+
+    @property
+    def descartadas(self):
+        """Categorías que generate_prompt habría bloqueado temporalmente"""
+        return frozenset(decision.descartada for decision in self.decisions)
+
+
+def render_prompt(state):
+    """Genera el prompt de un PromptState sin modificarlo ni tocar ningún generador.
+
+    Aplica la misma resolución de conflictos y el mismo orden por prioridad
+    que PromptGenerator.generate_prompt, pero sobre una copia local: el
+    resultado incluye el prompt, los valores que sobreviven (en orden de
+    asignación) y una ConflictDecision por cada categoría descartada. Es
+    seguro llamarla a la vez desde varios hilos con el mismo estado.
+    """
+    reglas = state.reglas
+    values = dict(state.values)
+    decisions = []
+
+    for indice in reglas.conflictos_de(values):
+        cat1, cat2 = reglas.conflictos[indice]
+        if cat1 in values and cat2 in values:
+            prioridad1 = reglas.prioridades.get(cat1, 0)
+            prioridad2 = reglas.prioridades.get(cat2, 0)
+            if prioridad1 > prioridad2:
+                del values[cat2]
+                decisions.append(ConflictDecision(cat2, cat1))
+            elif prioridad2 > prioridad1:
+                del values[cat1]
+                decisions.append(ConflictDecision(cat1, cat2))
+
+    # Prioridad y, a igualdad, orden de asignación (como la clave de _orden)
+    orden = sorted(
+        enumerate(values.items()),
+        key=lambda item: (reglas.rango(item[1][0]), item[0])
+    )
+    prompt = ", ".join(valor for _, (_, valor) in orden if valor)
+    return RenderResult(prompt, tuple(values.items()), tuple(decisions))
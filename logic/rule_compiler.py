@@ -0,0 +1,60 @@
+class CompiledRules:
+    """Forma indexada de category_rules.json, construida una sola vez al cargar.
+
+    - `vecinos_conflicto`: categoría -> índices (ordenados) de los pares de
+      `conflictos` en los que participa.
+    - `tabla_inferencias`: (categoría, valor) -> (categorías a bloquear, sugerencias).
+    - `rangos`: categoría -> clave de orden precalculada (-prioridad).
+    """
+
+    SIN_INFERENCIAS = ((), {})
+
+    def __init__(self, reglas):
+        # Solo tipos básicos, para que la forma compilada pueda guardarse en caché
+        self.prioridades = dict(reglas.get('prioridades', {}))
+        self.conflictos = [tuple(par) for par in reglas.get('conflictos', [])]
+        self.vecinos_conflicto = self._indexar_conflictos()
+        self.tabla_inferencias = self._aplanar_inferencias(reglas)
+        self.rangos = {categoria: -prioridad for categoria, prioridad in self.prioridades.items()}
+
+    def _indexar_conflictos(self):
+        vecinos = {}
+        for indice, (cat1, cat2) in enumerate(self.conflictos):
+            vecinos.setdefault(cat1, []).append(indice)
+            if cat2 != cat1:
+                vecinos.setdefault(cat2, []).append(indice)
+        return {categoria: tuple(indices) for categoria, indices in vecinos.items()}
+
+    def _aplanar_inferencias(self, reglas):
+        tabla = {}
+        for categoria, reglas_categoria in reglas.get('reglas_inferencia', {}).items():
+            for valor, reglas_valor in reglas_categoria.items():
+                bloqueos = tuple(reglas_valor.get('_bloquear', []))
+                # Ignorar claves especiales
+                sugerencias = {
+                    cat_relacionada: valores
+                    for cat_relacionada, valores in reglas_valor.items()
+                    if not cat_relacionada.startswith('_')
+                }
+                tabla[(categoria, valor)] = (bloqueos, sugerencias)
+        return tabla
+
+    def rango(self, categoria):
+        """Clave de orden por prioridad (menor primero)"""
+        return self.rangos.get(categoria, 0)
+
+    def inferencias(self, categoria, valor):
+        """Retorna (bloqueos, sugerencias) para un valor seleccionado"""
+        return self.tabla_inferencias.get((categoria, valor), self.SIN_INFERENCIAS)
+
+    def conflictos_de(self, categorias):
+        """Índices de los pares de conflicto que tocan alguna de las categorías, en orden"""
+        indices = set()
+        for categoria in categorias:
+            indices.update(self.vecinos_conflicto.get(categoria, ()))
+        return sorted(indices)
+
+
+def compile_rules(reglas):
+    """Compila el diccionario de reglas cargado desde category_rules.json"""
+    return CompiledRules(reglas)
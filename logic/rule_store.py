@@ -0,0 +1,340 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from logic.cache import freeze
+
+# hashlib, json, pickle y tempfile se importan al leer o escribir archivos, no
+# al importar el módulo: casi todo `logic` depende de este
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DATA_FILES = ('suggestion_rules.json', 'translations.json', 'category_rules.json', 'ui_config.json', 'color_rules.json')
+
+# Caché binaria con los datos ya parseados e indexados. Se reconstruye sola
+# cuando cambia algún archivo fuente o el código de `logic/` (los objetos
+# derivados son instancias de sus clases); CACHE_FORMAT cubre los cambios de
+# estructura de la propia caché.
+CACHE_FILE = '.rules_cache.bin'
+CACHE_FORMAT = 2
+LOGIC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_huella = None
+
+# mkstemp crea el temporal con permisos 0600; la caché debe quedar como
+# cualquier otro archivo de data/ (0666 menos la umask del proceso)
+_umask = os.umask(0)
+os.umask(_umask)
+PERMISOS_CACHE = 0o666 & ~_umask
+
+
+def _huella_codigo():
+    """Hash de los módulos de `logic/`: cambia si cambia alguna clase guardada en la caché"""
+    global _huella
+    if _huella is None:
+        import hashlib
+        digest = hashlib.sha256()
+        for nombre in sorted(os.listdir(LOGIC_DIR)):
+            if nombre.endswith('.py'):
+                with open(os.path.join(LOGIC_DIR, nombre), 'rb') as f:
+                    digest.update(nombre.encode('utf-8') + b'\0' + f.read())
+        _huella = digest.hexdigest()
+    return _huella
+
+
+def _formato_cache():
+    return (CACHE_FORMAT, _huella_codigo())
+
+
+class RuleSnapshot:
+    """Versión cargada de un archivo: vista de solo lectura, número de versión e
+    índices derivados. Se reemplaza entera al recargar, nunca se modifica a medias."""
+
+    def __init__(self, data, version, entry=None):
+        self.data = data
+        self.version = version
+        self.entry = entry
+        self.derived = dict(entry['derived']) if entry else {}
+
+
+class RuleStore:
+    """Almacén de reglas y catálogos compartido por todo el proceso.
+
+    Cada archivo de `data/` se lee una sola vez, de forma perezosa y por ruta
+    absoluta, y se entrega como vista de solo lectura (MappingProxyType y
+    tuplas). Los índices derivados (reglas compiladas, matchers) también se
+    construyen una vez por versión del archivo.
+
+    Los datos parseados y los índices se guardan en `data/.rules_cache.bin`,
+    asociados al mtime y al hash SHA-256 de cada archivo fuente; en el próximo
+    arranque se usan sin volver a parsear mientras el archivo no cambie.
+    Dentro de `escritura_agrupada()` los cambios se acumulan y la caché se
+    escribe una sola vez al salir.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, use_cache=True):
+        self.data_dir = data_dir
+        self.cache_path = os.path.join(data_dir, CACHE_FILE) if use_cache else None
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._snapshots = {}
+        self._builders = {}
+        self._listeners = []
+        self._cache_entries = None
+        self._cache_sucia = False
+        self._agrupando = 0
+
+    def path(self, name):
+        """Ruta absoluta de un archivo de datos"""
+        return os.path.join(self.data_dir, name)
+
+    def snapshot(self, name, default=None):
+        """Versión actual de un archivo, cargándolo si hace falta"""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshots.get(name)
+                if snapshot is None:
+                    entry = self._load_entry(name, default)
+                    snapshot = RuleSnapshot(freeze(entry['data']), 1, entry if entry.get('sha256') else None)
+                    self._snapshots[name] = snapshot
+        return snapshot
+
+    def load(self, name, default=None):
+        """Retorna la vista de solo lectura de un archivo JSON, cargándolo si hace falta"""
+        return self.snapshot(name, default).data
+
+    def _load_entry(self, name, default, strict=False):
+        """Datos de un archivo desde la caché binaria si sigue vigente, o desde el JSON.
+        
+        Con `strict`, un archivo ausente o inválido retorna None en lugar del valor por defecto.
+        """
+        with self._lock:
+            return self._load_entry_locked(name, default, strict)
+
+    def _load_entry_locked(self, name, default, strict):
+        import hashlib
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+
+        entries = self._read_cache()
+        entry = entries.get(name)
+        if entry is not None and stat is not None:
+            if (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+                return entry
+            # El mtime cambió (p. ej. tras un checkout): comparar el contenido
+            content = self._read_bytes(path)
+            if content is not None and hashlib.sha256(content).hexdigest() == entry['sha256']:
+                entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                self._write_cache()
+                return entry
+
+        content = self._read_bytes(path) if stat is not None else None
+        data = self._parse(path, content)
+        if data is None:
+            if strict:
+                return None
+            # Archivo ausente o inválido: usar el valor por defecto sin guardarlo en caché
+            entries.pop(name, None)
+            return {'data': {} if default is None else default, 'derived': {}}
+
+        entry = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'data': data,
+            'derived': {}
+        }
+        entries[name] = entry
+        self._write_cache()
+        return entry
+
+    def _read_bytes(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _parse(self, path, content):
+        import json
+        if content is None:
+            print(f"Archivo de datos no encontrado: {path}")
+            return None
+        try:
+            return json.loads(content.decode('utf-8'))
+        except json.JSONDecodeError as e:
+            print(f"Error al decodificar {path}: {e}")
+        except Exception as e:
+            print(f"Error al cargar {path}: {e}")
+        return None
+
+    def _read_cache(self):
+        if self._cache_entries is None:
+            import pickle
+            self._cache_entries = {}
+            if self.cache_path and os.path.exists(self.cache_path):
+                try:
+                    with open(self.cache_path, 'rb') as f:
+                        content = pickle.load(f)
+                    if content.get('format') == _formato_cache():
+                        self._cache_entries = content['entries']
+                except Exception as e:
+                    # Caché corrupta o de otra versión: se reconstruye
+                    print(f"Ignorando caché de reglas inválida: {e}")
+        return self._cache_entries
+
+    @contextmanager
+    def escritura_agrupada(self):
+        """Acumula las escrituras de la caché del bloque y la guarda una vez al final"""
+        with self._lock:
+            self._agrupando += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._agrupando -= 1
+                if not self._agrupando:
+                    self.flush_cache()
+
+    def _write_cache(self):
+        """Marca la caché como modificada y la guarda, salvo dentro de `escritura_agrupada`"""
+        if not self.cache_path:
+            return
+        with self._lock:
+            self._cache_sucia = True
+            if not self._agrupando:
+                self.flush_cache()
+
+    def flush_cache(self):
+        """Guarda la caché si tiene cambios sin escribir"""
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._cache_sucia:
+                return
+            self._cache_sucia = False
+            import pickle
+            import tempfile
+            # Archivo temporal propio: varios procesos (pool de batch.py, servidores)
+            # pueden escribir la caché a la vez; os.replace deja la última completa
+            temp_path = None
+            try:
+                fd, temp_path = tempfile.mkstemp(prefix=CACHE_FILE + '.', suffix='.tmp', dir=self.data_dir)
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(
+                        {'format': _formato_cache(), 'entries': self._cache_entries},
+                        f, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+                os.chmod(temp_path, PERMISOS_CACHE)
+                os.replace(temp_path, self.cache_path)
+            except Exception as e:
+                print(f"No se pudo guardar la caché de reglas: {e}")
+                if temp_path is not None and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def derived(self, name, key, builder, default=None, snapshot=None):
+        """Objeto derivado de un archivo (por ejemplo un índice), construido una vez por versión"""
+        # Recordar cómo construirlo para reconstruirlo al recargar el archivo
+        self._builders[(name, key)] = builder
+        snapshot = snapshot or self._snapshots.get(name)
+        result = snapshot.derived.get(key) if snapshot is not None else None
+        if result is None:
+            # Cargar el archivo y construir el índice escriben la caché una sola vez
+            with self.escritura_agrupada():
+                result = self._build_derived(name, key, builder, snapshot or self.snapshot(name, default))
+        return result
+
+    def _build_derived(self, name, key, builder, snapshot):
+        with self._lock:
+            result = snapshot.derived.get(key)
+            if result is None:
+                result = builder(snapshot.data)
+                snapshot.derived[key] = result
+                # Guardar el índice junto a los datos para el próximo arranque
+                entry = snapshot.entry
+                if entry is not None and self._read_cache().get(name) is entry:
+                    entry['derived'][key] = result
+                    self._write_cache()
+        return result
+
+    def version(self, name):
+        """Número de versión del archivo cargado (cambia con cada recarga)"""
+        snapshot = self._snapshots.get(name)
+        return snapshot.version if snapshot else 0
+
+    def reload(self, name, default=None):
+        """Vuelve a leer un archivo y reemplaza su versión de forma atómica.
+
+        Solo se reconstruyen los índices derivados de ese archivo, antes del
+        intercambio, así que los lectores ven la versión anterior completa o
+        la nueva completa. Si el archivo no se puede leer (por ejemplo, porque
+        el editor lo está escribiendo) se conserva la versión anterior y se
+        retorna False.
+        """
+        with self._reload_lock, self.escritura_agrupada():
+            previous = self._snapshots.get(name)
+            entry = self._load_entry(name, default, strict=previous is not None)
+            if entry is None:
+                return False
+
+            snapshot = RuleSnapshot(
+                freeze(entry['data']),
+                (previous.version if previous else 0) + 1,
+                entry if entry.get('sha256') else None
+            )
+            for key in (previous.derived if previous else ()):
+                builder = self._builders.get((name, key))
+                if builder is not None:
+                    self.derived(name, key, builder, snapshot=snapshot)
+
+            # Intercambio atómico: una sola asignación
+            self._snapshots[name] = snapshot
+
+        for listener in list(self._listeners):
+            listener(name)
+        return True
+
+    def add_listener(self, callback):
+        """Registra `callback(nombre)`, llamado tras cada recarga (desde el hilo que recargó)"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_rule_store():
+    """Retorna el almacén de reglas único del proceso"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RuleStore()
+    return _store
+
+
+def compile_cache(store=None):
+    """Parsea todos los archivos de datos y construye sus índices en la caché binaria"""
+    from logic.prompt_generator import PromptGenerator
+    from logic.suggestion_engine import SuggestionEngine
+    from logic.color_palette import ColorPalette
+
+    store = store or get_rule_store()
+    with store.escritura_agrupada():
+        for name in DATA_FILES:
+            store.load(name)
+        PromptGenerator(store)
+        SuggestionEngine(store).rule_indexes
+        ColorPalette(store).colores_para('')
+    return store.cache_path
+
+
+if __name__ == "__main__":
+    print(f"Caché de reglas generada en {compile_cache()}")
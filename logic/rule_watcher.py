@@ -0,0 +1,67 @@
+import os
+import threading
+
+from logic.rule_store import DATA_FILES, get_rule_store
+
+
+class RuleWatcher:
+    """Vigila los archivos de `data/` en un hilo en segundo plano y recarga en
+    el almacén solo el archivo que cambió.
+
+    Compara (mtime, tamaño) en cada sondeo y espera a que el archivo deje de
+    cambiar durante un intervalo antes de recargarlo, para no leer un JSON a
+    medio escribir. Si aun así no se puede parsear, el almacén conserva la
+    versión anterior y se reintenta en el siguiente cambio.
+
+    Se usa sondeo en lugar de notificaciones del sistema (inotify): son cinco
+    archivos, un `os.stat` por segundo no cuesta nada y funciona igual en
+    todas las plataformas sin dependencias extra.
+    """
+
+    def __init__(self, store=None, names=DATA_FILES, interval=1.0):
+        self.store = store or get_rule_store()
+        self.names = tuple(names)
+        self.interval = interval
+        self._firmas = {name: self._firma(name) for name in self.names}
+        self._pendientes = {}
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def _firma(self, name):
+        try:
+            stat = os.stat(self.store.path(name))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self):
+        """Inicia el hilo de vigilancia (daemon, no impide cerrar la aplicación)"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._run, name='RuleWatcher', daemon=True)
+            self._hilo.start()
+        return self
+
+    def stop(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def _run(self):
+        while not self._detener.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Revisa los archivos una vez; retorna los nombres recargados"""
+        recargados = []
+        for name in self.names:
+            firma = self._firma(name)
+            if firma != self._firmas[name]:
+                # Cambió: esperar a que se estabilice antes de recargar
+                self._firmas[name] = firma
+                self._pendientes[name] = firma
+            elif name in self._pendientes and firma is not None:
+                del self._pendientes[name]
+                if self.store.reload(name):
+                    recargados.append(name)
+        return recargados
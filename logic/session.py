@@ -0,0 +1,318 @@
+import threading
+from array import array
+
+from logic.prompt_generator import CATEGORY_RULES_FILE, REGLAS_VACIAS, PromptGenerator
+from logic.rule_compiler import compile_rules
+from logic.rule_store import get_rule_store
+
+
+# Los ids se guardan en array('H') y como bits de un entero: el catálogo no
+# puede crecer sin límite aunque se usen nombres arbitrarios
+MAX_CATEGORIAS = 4096
+
+
+def _categorias_de_reglas(reglas):
+    """Categorías que aparecen en category_rules.json (prioridades, conflictos e inferencias)"""
+    categorias = set(reglas.get('prioridades', {}))
+    for par in reglas.get('conflictos', []):
+        categorias.update(par)
+    for categoria, reglas_categoria in reglas.get('reglas_inferencia', {}).items():
+        categorias.add(categoria)
+        for reglas_valor in reglas_categoria.values():
+            categorias.update(reglas_valor.get('_bloquear', []))
+            categorias.update(clave for clave in reglas_valor if not clave.startswith('_'))
+    return frozenset(categorias)
+
+
+class CategoryCatalog:
+    """Catálogo de categorías compartido por todas las sesiones de un proceso.
+
+    Asigna a cada nombre un id pequeño y estable (su posición en `nombres`) y
+    guarda una sola copia de las opciones predefinidas. Las categorías que no
+    están en el catálogo se agregan la primera vez que se usan, hasta
+    MAX_CATEGORIAS; `conoce` permite rechazar antes los nombres que no son
+    de las opciones ni de las reglas.
+    """
+
+    def __init__(self, store, nombres=(), opciones=None):
+        self.store = store
+        self.nombres = []
+        self.ids = {}
+        self.opciones = {categoria: tuple(valores) for categoria, valores in (opciones or {}).items()}
+        self._lock = threading.Lock()
+        for nombre in nombres:
+            self.intern(nombre)
+        for nombre in sorted(self._categorias_de_reglas()):
+            self.intern(nombre)
+
+    @classmethod
+    def from_generator(cls, generador):
+        """Catálogo con las categorías y opciones de un PromptGenerator"""
+        return cls(generador.store, generador.get_all_categories(), generador.category_options)
+
+    def _categorias_de_reglas(self):
+        return self.store.derived(
+            CATEGORY_RULES_FILE, 'categorias', _categorias_de_reglas, default=REGLAS_VACIAS
+        )
+
+    def conoce(self, nombre):
+        """True si la categoría ya está en el catálogo o aparece en las reglas actuales"""
+        return nombre in self.ids or nombre in self._categorias_de_reglas()
+
+    def intern(self, nombre):
+        """Id de una categoría, agregándola al catálogo si no existía"""
+        categoria_id = self.ids.get(nombre)
+        if categoria_id is None:
+            with self._lock:
+                categoria_id = self.ids.get(nombre)
+                if categoria_id is None:
+                    if len(self.nombres) >= MAX_CATEGORIAS:
+                        raise ValueError(f"Catálogo de categorías lleno ({MAX_CATEGORIAS}): {nombre!r}")
+                    categoria_id = len(self.nombres)
+                    self.nombres.append(nombre)
+                    self.ids[nombre] = categoria_id
+        return categoria_id
+
+    def __len__(self):
+        return len(self.nombres)
+
+
+_catalogos = {}
+_catalogos_lock = threading.Lock()
+
+
+def get_category_catalog(store=None):
+    """Retorna el catálogo único de un almacén de reglas (por defecto, el del proceso)"""
+    store = store or get_rule_store()
+    catalogo = _catalogos.get(id(store))
+    if catalogo is None:
+        with _catalogos_lock:
+            catalogo = _catalogos.get(id(store))
+            if catalogo is None:
+                catalogo = CategoryCatalog.from_generator(PromptGenerator(store))
+                _catalogos[id(store)] = catalogo
+    return catalogo
+
+
+def _bits(bitset):
+    """Ids presentes en un bitset, de menor a mayor"""
+    while bitset:
+        bajo = bitset & -bitset
+        yield bajo.bit_length() - 1
+        bitset ^= bajo
+
+
+class Session:
+    """Estado compacto de una sesión, con la misma interfaz que PromptGenerator.
+
+    Pensado para servir miles de sesiones: las categorías se identifican por
+    su id en el catálogo compartido, los ids con valor van en un array en
+    orden de asignación y los valores en una lista paralela (del tamaño de
+    los valores asignados, no del catálogo), y los bloqueos en enteros
+    usados como bitsets. Las reglas compiladas y las opciones se comparten:
+    sin contar el texto de los valores, una sesión vacía ocupa unos 400
+    bytes y una con 10 valores, unos 550 (un PromptGenerator, unos 12 KB).
+
+    El prompt resultante es el mismo que el de PromptGenerator para la misma
+    secuencia de llamadas.
+    """
+
+    __slots__ = (
+        'catalogo', '_reglas', '_version_reglas', '_valores', '_insercion',
+        '_bloqueadas', '_permanentes', '_temporales', '_nuevas', '_prompt'
+    )
+
+    def __init__(self, catalogo=None):
+        self.catalogo = catalogo or get_category_catalog()
+        self._reglas = None
+        self._version_reglas = None
+        self._insercion = array('H')  # Ids con valor, en orden de asignación
+        self._valores = []  # Valor de cada id de _insercion, en la misma posición
+        self._bloqueadas = 0  # set_category_blocked
+        self._permanentes = 0  # bloquear_categoria_permanente
+        self._temporales = 0  # Descartadas por conflictos o inferencias
+        self._nuevas = 0  # Pendientes de revisar conflictos
+        self._prompt = None
+        self._sincronizar_reglas()
+
+    # --- Reglas ---
+
+    @property
+    def reglas_compiladas(self):
+        self._sincronizar_reglas()
+        return self._reglas
+
+    def _sincronizar_reglas(self):
+        """Adopta la versión actual de las reglas; si cambió, todo vuelve a revisar conflictos"""
+        store = self.catalogo.store
+        snapshot = store.snapshot(CATEGORY_RULES_FILE, default=REGLAS_VACIAS)
+        if snapshot.version == self._version_reglas:
+            return
+        self._version_reglas = snapshot.version
+        self._reglas = store.derived(CATEGORY_RULES_FILE, 'compiladas', compile_rules, snapshot=snapshot)
+        for categoria_id in self._insercion:
+            self._nuevas |= 1 << categoria_id
+        self._prompt = None
+
+    # --- Valores ---
+
+    def _posicion(self, categoria_id):
+        """Posición de un id en _insercion, o -1 si no tiene valor (pocas decenas: búsqueda lineal en C)"""
+        try:
+            return self._insercion.index(categoria_id)
+        except ValueError:
+            return -1
+
+    def _asignar_valor(self, categoria_id, valor):
+        posicion = self._posicion(categoria_id)
+        if posicion < 0:
+            self._insercion.append(categoria_id)
+            self._valores.append(valor)
+            self._nuevas |= 1 << categoria_id
+        elif self._valores[posicion] == valor:
+            return
+        else:
+            self._valores[posicion] = valor
+        self._prompt = None
+
+    def _eliminar_valor(self, categoria_id):
+        posicion = self._posicion(categoria_id)
+        if posicion >= 0:
+            del self._insercion[posicion]
+            del self._valores[posicion]
+            self._nuevas &= ~(1 << categoria_id)
+            self._prompt = None
+
+    def _valor(self, categoria_id):
+        posicion = self._posicion(categoria_id)
+        return None if posicion < 0 else self._valores[posicion]
+
+    def set_category_value(self, category, value):
+        """Establece el valor de una categoría (salvo que esté bloqueada)"""
+        categoria_id = self.catalogo.intern(category)
+        if not self._bloqueadas >> categoria_id & 1:
+            self._asignar_valor(categoria_id, value)
+
+    def get_category_value(self, category):
+        categoria_id = self.catalogo.ids.get(category)
+        valor = None if categoria_id is None else self._valor(categoria_id)
+        return "" if valor is None else valor
+
+    @property
+    def category_values(self):
+        """Valores actuales {categoría: valor}, en orden de asignación (copia)"""
+        nombres = self.catalogo.nombres
+        return {nombres[categoria_id]: valor for categoria_id, valor in zip(self._insercion, self._valores)}
+
+    def clear_all(self):
+        """Limpia todos los valores (los bloqueos se conservan, como en PromptGenerator)"""
+        self._insercion = array('H')
+        self._valores = []
+        self._nuevas = 0
+        self._prompt = None
+
+    # --- Bloqueos ---
+
+    def set_category_blocked(self, category, blocked):
+        categoria_id = self.catalogo.intern(category)
+        if blocked:
+            self._bloqueadas |= 1 << categoria_id
+            self._eliminar_valor(categoria_id)
+        else:
+            self._bloqueadas &= ~(1 << categoria_id)
+
+    def bloquear_categoria_permanente(self, categoria):
+        """Bloqueo manual del usuario (clic derecho)"""
+        categoria_id = self.catalogo.intern(categoria)
+        self._permanentes |= 1 << categoria_id
+        self._eliminar_valor(categoria_id)
+
+    def es_categoria_disponible(self, categoria):
+        categoria_id = self.catalogo.ids.get(categoria)
+        if categoria_id is None:
+            return True
+        return not (self._permanentes | self._temporales) >> categoria_id & 1
+
+    @property
+    def blocked_categories(self):
+        return self._nombres(self._bloqueadas)
+
+    @property
+    def categorias_bloqueadas(self):
+        return self._nombres(self._permanentes)
+
+    @property
+    def categorias_temporalmente_bloqueadas(self):
+        return self._nombres(self._temporales)
+
+    def _nombres(self, bitset):
+        nombres = self.catalogo.nombres
+        return {nombres[categoria_id] for categoria_id in _bits(bitset)}
+
+    # --- Reglas sobre los valores ---
+
+    def aplicar_inferencias(self, categoria, valor):
+        """Aplica reglas cuando se selecciona un valor, hasta un punto fijo (ver InferenceEngine)"""
+        from logic.inference import InferenceEngine
+        resultado = InferenceEngine.for_rules(self.reglas_compiladas).propagar(categoria, valor)
+        for cat_bloquear in resultado.bloqueadas:
+            categoria_id = self.catalogo.intern(cat_bloquear)
+            self._temporales |= 1 << categoria_id
+            self._eliminar_valor(categoria_id)
+        return dict(resultado.sugerencias)
+
+    def resolver_conflictos(self, categorias=None):
+        """Resuelve conflictos basado en prioridades (ver PromptGenerator.resolver_conflictos)"""
+        reglas = self.reglas_compiladas
+        nombres = self.catalogo.nombres
+        if categorias is None:
+            categorias = [nombres[categoria_id] for categoria_id in self._insercion]
+        ids = self.catalogo.ids
+        for indice in reglas.conflictos_de(categorias):
+            cat1, cat2 = reglas.conflictos[indice]
+            id1, id2 = ids.get(cat1), ids.get(cat2)
+            if id1 is None or id2 is None or self._valor(id1) is None or self._valor(id2) is None:
+                continue
+            prioridad1 = reglas.prioridades.get(cat1, 0)
+            prioridad2 = reglas.prioridades.get(cat2, 0)
+            if prioridad1 > prioridad2:
+                self._eliminar_valor(id2)
+                self._temporales |= 1 << id2
+            elif prioridad2 > prioridad1:
+                self._eliminar_valor(id1)
+                self._temporales |= 1 << id1
+
+    def generate_prompt(self):
+        """Genera prompt ordenado por prioridades"""
+        self._sincronizar_reglas()
+        reglas = self._reglas
+        if reglas.conflictos and self._nuevas:
+            nombres = self.catalogo.nombres
+            self.resolver_conflictos([nombres[categoria_id] for categoria_id in _bits(self._nuevas)])
+        self._nuevas = 0
+
+        if self._prompt is None:
+            nombres = self.catalogo.nombres
+            # Mismo orden que PromptGenerator: prioridad y, a igualdad, orden de asignación
+            orden = sorted(
+                range(len(self._insercion)),
+                key=lambda posicion: (reglas.rango(nombres[self._insercion[posicion]]), posicion)
+            )
+            self._prompt = ", ".join(
+                valor for valor in (self._valores[posicion] for posicion in orden) if valor
+            )
+        return self._prompt
+
+    def snapshot(self):
+        """Estado inmutable actual, para render_prompt (ver PromptGenerator.snapshot)"""
+        from logic.render import PromptState
+        reglas = self.reglas_compiladas
+        return PromptState(self.category_values, reglas, self.blocked_categories, self._version_reglas)
+
+    # --- Catálogo ---
+
+    def get_all_categories(self):
+        return list(self.catalogo.nombres)
+
+    def get_category_options(self, category):
+        return self.catalogo.opciones.get(category, ())
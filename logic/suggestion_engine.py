@@ -1,23 +1,135 @@
-import json
-import os
+import heapq
+from collections.abc import Mapping, Sequence
+from itertools import islice
+from logic.cache import LRUCache, freeze
+from logic.rule_store import get_rule_store
+from logic.text_index import RuleMatcher
+
+SUGGESTION_RULES_FILE = 'suggestion_rules.json'
+TRANSLATIONS_FILE = 'translations.json'
+
+class RankedSuggestions(Sequence):
+    """Sugerencias de una categoría en orden de relevancia, generadas bajo demanda.
+
+    Solo guarda referencias a las listas de las reglas que coincidieron (las
+    fuentes, en orden de prioridad). Al iterar, un heap con un cursor por
+    fuente entrega primero lo que aparece antes en cada lista y, a igual
+    posición, lo de la fuente más prioritaria; los duplicados se descartan
+    a medida que salen. Mostrar las primeras 8 no recorre el resto.
+
+    Antes `get_suggestions` retornaba listas, y esta clase sigue siendo una
+    secuencia de solo lectura: `len()`, índices, cortes y la comparación con
+    listas funcionan igual, pero calculan (una vez) la lista completa.
+    """
+
+    __slots__ = ('fuentes', '_lista')
+
+    def __init__(self, fuentes):
+        self.fuentes = tuple(fuente for fuente in fuentes if fuente)
+        self._lista = None
+
+    def __bool__(self):
+        return bool(self.fuentes)
+
+    def _completa(self):
+        # Si dos hilos la calculan a la vez, las dos listas son iguales y queda una
+        if self._lista is None:
+            self._lista = list(iter(self))
+        return self._lista
+
+    def __len__(self):
+        return len(self._completa())
+
+    def __getitem__(self, index):
+        return self._completa()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (RankedSuggestions, list, tuple)):
+            return self._completa() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RankedSuggestions({self._completa()!r})"
+
+    def __iter__(self):
+        if self._lista is not None:
+            yield from self._lista
+            return
+        # (posición, fuente): la puntuación de cada candidato
+        heap = [(0, orden) for orden in range(len(self.fuentes))]
+        vistos = set()
+        while heap:
+            posicion, orden = heap[0]
+            fuente = self.fuentes[orden]
+            if posicion + 1 < len(fuente):
+                heapq.heapreplace(heap, (posicion + 1, orden))
+            else:
+                heapq.heappop(heap)
+            valor = fuente[posicion]
+            if valor not in vistos:
+                vistos.add(valor)
+                yield valor
+
+    def take(self, n):
+        """Las n sugerencias más relevantes"""
+        return list(islice(self, n))
+
 
 class SuggestionEngine:
-    def __init__(self):
-        self.suggestion_rules = self._load_suggestion_rules()
-        self.translations = self._load_translations()  # NUEVO
+    # Caché compartida por todas las instancias; las claves incluyen el almacén y
+    # la versión de las reglas cargadas, así que una recarga nunca devuelve datos viejos
+    cache = LRUCache(maxsize=2048)
+    
+    def __init__(self, store=None):
+        # Todas las instancias comparten el mismo almacén de reglas del proceso
+        self.store = store or get_rule_store()
+    
+    @property
+    def suggestion_rules(self):
+        return self._load_suggestion_rules()
+    
+    @property
+    def translations(self):
+        return self._load_translations()
+    
+    @property
+    def rule_indexes(self):
+        return self._rule_indexes_for(self.store.snapshot(SUGGESTION_RULES_FILE))
+    
+    def _rule_indexes_for(self, snapshot):
+        return self.store.derived(
+            SUGGESTION_RULES_FILE, 'rule_indexes', self._build_rule_indexes, snapshot=snapshot
+        )
+    
+    @property
+    def rules_version(self):
+        return self.store.version(SUGGESTION_RULES_FILE)
+    
+    def reload_rules(self):
+        """Vuelve a cargar reglas y traducciones e invalida la caché"""
+        self.store.reload(SUGGESTION_RULES_FILE)
+        self.store.reload(TRANSLATIONS_FILE)
+        self.cache.clear()
+    
+    def _cached(self, name, key, compute):
+        """Resultado inmutable de una búsqueda, memorizado en la caché compartida.
+        
+        `compute` recibe una única versión de las reglas, tomada al inicio, para
+        que una recarga en segundo plano nunca mezcle reglas viejas y nuevas.
+        La clave incluye el almacén: la caché es de la clase y cada almacén
+        numera sus versiones desde 1.
+        """
+        snapshot = self.store.snapshot(SUGGESTION_RULES_FILE)
+        return self.cache.get_or_compute(
+            (name, self.store, snapshot.version) + key,
+            lambda: freeze(compute(snapshot))
+        )
     
     def _load_translations(self):
-        """Carga las traducciones desde el archivo JSON"""
-        try:
-            translations_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'translations.json')
-            with open(translations_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print("Archivo de traducciones no encontrado")
-            return {}
-        except json.JSONDecodeError:
-            print("Error al decodificar el archivo de traducciones")
-            return {}
+        """Carga las traducciones (vista de solo lectura del almacén compartido)"""
+        return self.store.load(TRANSLATIONS_FILE)
     
     def get_translation(self, category, item_key, language='es'):
         """Obtiene la traducción de un elemento específico"""
@@ -34,68 +146,73 @@ class SuggestionEngine:
             return {}
     
     def _load_suggestion_rules(self):
-        """Carga las reglas de sugerencias desde el archivo JSON"""
-        try:
-            # Obtener la ruta del archivo JSON
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            json_path = os.path.join(current_dir, 'data', 'suggestion_rules.json')
-            
-            # Cargar el archivo JSON
-            with open(json_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except FileNotFoundError:
-            print(f"Archivo de reglas de sugerencias no encontrado: {json_path}")
-            return {}
-        except json.JSONDecodeError as e:
-            print(f"Error al decodificar JSON: {e}")
-            return {}
-        except Exception as e:
-            print(f"Error al cargar reglas de sugerencias: {e}")
-            return {}
+        """Carga las reglas de sugerencias (vista de solo lectura del almacén compartido)"""
+        return self.store.load(SUGGESTION_RULES_FILE)
+    
+    def _build_rule_indexes(self, suggestion_rules):
+        """Construye un índice de coincidencias por categoría sobre las claves de reglas"""
+        indexes = {}
+        for category, category_rules in suggestion_rules.items():
+            if isinstance(category_rules, Mapping):
+                # Solo se guardan las claves: el índice no referencia la vista de reglas
+                indexes[category] = (RuleMatcher(category_rules.keys()), tuple(category_rules.keys()))
+        return indexes
         
     def get_suggestions(self, trigger_category, trigger_value):
-        """Obtiene sugerencias basadas en una categoría y valor específicos"""
-        suggestions = {}
+        """Obtiene sugerencias basadas en una categoría y valor específicos.
+        
+        Retorna {categoría relacionada: RankedSuggestions}; cada valor se itera
+        en orden de relevancia y solo se calcula lo que se consume. Se usa como
+        la lista de antes (índices, len, ==); `list()` da una copia modificable.
+        """
+        # Toda la búsqueda ignora mayúsculas, así que se normaliza la clave
+        trigger_value = trigger_value.lower()
+        return self._cached(
+            'suggestions', (trigger_category, trigger_value),
+            lambda snapshot: self._compute_suggestions(snapshot, trigger_category, trigger_value)
+        )
+    
+    def _compute_suggestions(self, snapshot, trigger_category, trigger_value):
+        rules = snapshot.data
+        rule_indexes = self._rule_indexes_for(snapshot)
+        # Listas de las reglas que aplican, por categoría, sin copiarlas ni fusionarlas
+        sources = {}
         
         # Buscar en las reglas de sugerencias
-        if trigger_category in self.suggestion_rules:
-            category_rules = self.suggestion_rules[trigger_category]
+        if trigger_category in rule_indexes:
+            matcher, rule_keys = rule_indexes[trigger_category]
+            category_rules = rules[trigger_category]
             
-            # Buscar coincidencias exactas o parciales
-            for rule_value, related_suggestions in category_rules.items():
-                if rule_value.lower() in trigger_value.lower() or trigger_value.lower() in rule_value.lower():
-                    for related_category, values in related_suggestions.items():
-                        if related_category not in suggestions:
-                            suggestions[related_category] = []
-                        suggestions[related_category].extend(values)
+            # Buscar coincidencias exactas o parciales (la regla contiene el valor o viceversa)
+            for rule_index in matcher.buscar(trigger_value):
+                related_suggestions = category_rules[rule_keys[rule_index]]
+                for related_category, values in related_suggestions.items():
+                    sources.setdefault(related_category, []).append(values)
         
         # NUEVA LÓGICA: Relaciones especiales para subcategorías de vestuario
         if trigger_category.startswith('vestuario_'):
             # Si seleccionamos algo de vestuario_general, sugerir para todas las subcategorías
             if trigger_category == 'vestuario_general':
-                self._add_vestuario_suggestions(suggestions, 'vestuario_superior', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'vestuario_inferior', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'vestuario_accesorios', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'ropa_interior_superior', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'ropa_interior_inferior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_superior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_inferior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_accesorios', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'ropa_interior_superior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'ropa_interior_inferior', trigger_value)
             
             # Si seleccionamos algo de vestuario_superior, sugerir para vestuario_inferior
             elif trigger_category == 'vestuario_superior':
-                self._add_vestuario_suggestions(suggestions, 'vestuario_inferior', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'vestuario_accesorios', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_inferior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_accesorios', trigger_value)
             
             # Si seleccionamos algo de vestuario_inferior, sugerir para vestuario_superior
             elif trigger_category == 'vestuario_inferior':
-                self._add_vestuario_suggestions(suggestions, 'vestuario_superior', trigger_value)
-                self._add_vestuario_suggestions(suggestions, 'vestuario_accesorios', trigger_value)
-                        
-        # Remover duplicados
-        for category in suggestions:
-            suggestions[category] = list(set(suggestions[category]))
-            
-        return suggestions
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_superior', trigger_value)
+                self._add_vestuario_suggestions(rules, sources, 'vestuario_accesorios', trigger_value)
+        
+        # Los duplicados se descartan al iterar
+        return {category: RankedSuggestions(lists) for category, lists in sources.items()}
     
-    def _add_vestuario_suggestions(self, suggestions, target_category, trigger_value):
+    def _add_vestuario_suggestions(self, rules, sources, target_category, trigger_value):
         """Añade sugerencias específicas de vestuario basadas en estilo y coherencia"""
         # Mapeo de estilos
         style_mapping = {
@@ -112,47 +229,41 @@ class SuggestionEngine:
                 detected_style = style
                 break
         
-        # Añadir sugerencias basadas en el estilo detectado
-        if detected_style and detected_style in self.suggestion_rules.get('estilo_coordinado', {}):
-            style_suggestions = self.suggestion_rules['estilo_coordinado'][detected_style + '_style']
+        # Añadir sugerencias basadas en el estilo detectado (después de las de las reglas)
+        if detected_style and detected_style in rules.get('estilo_coordinado', {}):
+            style_suggestions = rules['estilo_coordinado'][detected_style + '_style']
             if target_category in style_suggestions:
-                if target_category not in suggestions:
-                    suggestions[target_category] = []
-                suggestions[target_category].extend(style_suggestions[target_category])
-        
-        # Remover duplicados
-        for category in suggestions:
-            suggestions[category] = list(set(suggestions[category]))
+                sources.setdefault(target_category, []).append(style_suggestions[target_category])
             
-        return suggestions
+        return sources
 
     def get_combinations(self, category, value):
         """Obtiene combinaciones específicas para una prenda"""
+        search_key = value.lower().replace(' ', '_').replace('-', '_')
+        return self._cached(
+            'combinations', (search_key,),
+            lambda snapshot: self._compute_combinations(snapshot.data, category, value)
+        )
+    
+    def _compute_combinations(self, rules, category, value):
         combinations = {}
         
-        print(f"Buscando combinaciones para: {category} - {value}")  # Debug
-        
         # Buscar en las reglas de combinaciones
-        if 'combinaciones_vestuario' in self.suggestion_rules:
+        if 'combinaciones_vestuario' in rules:
             # Normalizar el valor para buscar
             # Línea 193 - Cambiar de:
             search_key = value.lower().replace(' ', '_')
             
             # A:
             search_key = value.lower().replace(' ', '_').replace('-', '_')
-            combo_rules = self.suggestion_rules['combinaciones_vestuario']
-            
-            print(f"Buscando clave: {search_key}")  # Debug
-            print(f"Claves disponibles: {list(combo_rules.keys())}")  # Debug
+            combo_rules = rules['combinaciones_vestuario']
             
             if search_key in combo_rules:
                 combo_data = combo_rules[search_key]
                 
-                print(f"Datos de combinación encontrados: {combo_data}")  # Debug
-                
                 # Obtener combinaciones compatibles
                 for combo_type, items in combo_data.items():
-                    if combo_type.startswith('compatible_') and isinstance(items, list):
+                    if combo_type.startswith('compatible_') and isinstance(items, (list, tuple)):
                         # Mapear los tipos de combinación a categorías
                         if combo_type == 'compatible_superior':
                             combinations['vestuario_superior'] = items
@@ -163,23 +274,29 @@ class SuggestionEngine:
                         elif combo_type == 'compatible_accesorios':
                             combinations['vestuario_accesorios'] = items
                         
-        print(f"Combinaciones finales: {combinations}")  # Debug
         return combinations
     
     def get_combinations_only(self, category, value):
         """Obtiene SOLO combinaciones (vestuario) sin accesorios"""
+        search_key = value.lower().replace(' ', '_')
+        return self._cached(
+            'combinations_only', (search_key,),
+            lambda snapshot: self._compute_combinations_only(snapshot.data, category, value)
+        )
+    
+    def _compute_combinations_only(self, rules, category, value):
         combinations = {}
         
-        if 'combinaciones_vestuario' in self.suggestion_rules:
+        if 'combinaciones_vestuario' in rules:
             search_key = value.lower().replace(' ', '_')
-            combo_rules = self.suggestion_rules['combinaciones_vestuario']
+            combo_rules = rules['combinaciones_vestuario']
             
             if search_key in combo_rules:
                 combo_data = combo_rules[search_key]
                 
                 # Solo obtener combinaciones de vestuario, NO accesorios
                 for combo_type, items in combo_data.items():
-                    if combo_type.startswith('compatible_') and isinstance(items, list):
+                    if combo_type.startswith('compatible_') and isinstance(items, (list, tuple)):
                         if combo_type == 'compatible_superior':
                             combinations['vestuario_superior'] = items
                         elif combo_type == 'compatible_inferior':
@@ -190,35 +307,49 @@ class SuggestionEngine:
     
     def get_accessories_only(self, category, value):
         """Obtiene SOLO accesorios para una prenda específica"""
+        search_key = value.lower().replace(' ', '_')
+        return self._cached(
+            'accessories_only', (search_key,),
+            lambda snapshot: self._compute_accessories_only(snapshot.data, category, value)
+        )
+    
+    def _compute_accessories_only(self, rules, category, value):
         accessories = {}
         
-        if 'combinaciones_vestuario' in self.suggestion_rules:
+        if 'combinaciones_vestuario' in rules:
             search_key = value.lower().replace(' ', '_')
-            combo_rules = self.suggestion_rules['combinaciones_vestuario']
+            combo_rules = rules['combinaciones_vestuario']
             
             if search_key in combo_rules:
                 combo_data = combo_rules[search_key]
                 
                 # Solo obtener accesorios
                 for combo_type, items in combo_data.items():
-                    if combo_type in ['compatible_accessories', 'compatible_accesorios'] and isinstance(items, list):
+                    if combo_type in ['compatible_accessories', 'compatible_accesorios'] and isinstance(items, (list, tuple)):
                         accessories['vestuario_accesorios'] = items
                         
         return accessories
     
     def get_translations(self, category, value):
         """Obtiene las traducciones para una prenda específica"""
+        search_key = value.lower().replace(' ', '_')
+        return self._cached(
+            'translations', (search_key,),
+            lambda snapshot: self._compute_translations(snapshot.data, category, value)
+        )
+    
+    def _compute_translations(self, rules, category, value):
         translations = {}
         
-        if 'combinaciones_vestuario' in self.suggestion_rules:
+        if 'combinaciones_vestuario' in rules:
             search_key = value.lower().replace(' ', '_')
-            combo_rules = self.suggestion_rules['combinaciones_vestuario']
+            combo_rules = rules['combinaciones_vestuario']
             
             if search_key in combo_rules:
                 combo_data = combo_rules[search_key]
                 
                 # Obtener traducciones si existen
-                if 'translations' in combo_data and isinstance(combo_data['translations'], dict):
+                if 'translations' in combo_data and isinstance(combo_data['translations'], Mapping):
                     translations = combo_data['translations']
                         
         return translations
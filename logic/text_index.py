@@ -0,0 +1,320 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+
+class AhoCorasick:
+    """Autómata de Aho-Corasick: encuentra en una sola pasada qué patrones
+    aparecen dentro de un texto, en tiempo proporcional a la longitud del texto."""
+
+    def __init__(self, patrones):
+        self._transiciones = [{}]
+        self._fallo = [0]
+        self._salidas = [()]
+        self._vacios = tuple(i for i, patron in enumerate(patrones) if not patron)
+
+        for indice, patron in enumerate(patrones):
+            if patron:
+                self._agregar(patron, indice)
+        self._construir_fallos()
+
+    def _agregar(self, patron, indice):
+        estado = 0
+        for caracter in patron:
+            siguiente = self._transiciones[estado].get(caracter)
+            if siguiente is None:
+                siguiente = len(self._transiciones)
+                self._transiciones[estado][caracter] = siguiente
+                self._transiciones.append({})
+                self._fallo.append(0)
+                self._salidas.append(())
+            estado = siguiente
+        self._salidas[estado] = self._salidas[estado] + (indice,)
+
+    def _construir_fallos(self):
+        cola = deque(self._transiciones[0].values())
+        while cola:
+            estado = cola.popleft()
+            for caracter, siguiente in self._transiciones[estado].items():
+                cola.append(siguiente)
+                fallo = self._fallo[estado]
+                while fallo and caracter not in self._transiciones[fallo]:
+                    fallo = self._fallo[fallo]
+                destino = self._transiciones[fallo].get(caracter, 0)
+                self._fallo[siguiente] = destino if destino != siguiente else 0
+                # Heredar las salidas del estado de fallo
+                self._salidas[siguiente] = self._salidas[siguiente] + self._salidas[self._fallo[siguiente]]
+
+    def buscar(self, texto):
+        """Retorna el conjunto de índices de patrones contenidos en el texto"""
+        encontrados = set(self._vacios)
+        estado = 0
+        for caracter in texto:
+            while estado and caracter not in self._transiciones[estado]:
+                estado = self._fallo[estado]
+            estado = self._transiciones[estado].get(caracter, 0)
+            encontrados.update(self._salidas[estado])
+        return encontrados
+
+
+class NgramIndex:
+    """Índice invertido de n-gramas (1 a `n` caracteres) para encontrar qué
+    claves contienen un texto dado sin recorrerlas todas."""
+
+    def __init__(self, claves, n=3):
+        self.n = n
+        self.claves = list(claves)
+        self._postings = {}
+        for indice, clave in enumerate(self.claves):
+            for gramo in self._gramos_de(clave):
+                self._postings.setdefault(gramo, set()).add(indice)
+
+    def _gramos_de(self, texto):
+        gramos = set()
+        for tamano in range(1, self.n + 1):
+            for inicio in range(len(texto) - tamano + 1):
+                gramos.add(texto[inicio:inicio + tamano])
+        return gramos
+
+    def buscar(self, texto):
+        """Retorna el conjunto de índices de claves que contienen el texto"""
+        if not texto:
+            return set(range(len(self.claves)))
+        if len(texto) <= self.n:
+            return set(self._postings.get(texto, ()))
+
+        gramos = {texto[i:i + self.n] for i in range(len(texto) - self.n + 1)}
+        postings = sorted((self._postings.get(gramo, set()) for gramo in gramos), key=len)
+        candidatos = set(postings[0])
+        for posting in postings[1:]:
+            if not candidatos:
+                break
+            candidatos &= posting
+        # Los n-gramas comunes no garantizan la subcadena completa: verificar
+        return {indice for indice in candidatos if texto in self.claves[indice]}
+
+
+class RuleMatcher:
+    """Coincidencias en ambos sentidos entre un texto y las claves de reglas:
+    claves contenidas en el texto o que contienen el texto (sin distinguir mayúsculas)."""
+
+    def __init__(self, claves):
+        claves = [clave.lower() for clave in claves]
+        self._contenidas = AhoCorasick(claves)
+        self._contenedoras = NgramIndex(claves)
+
+    def buscar(self, texto):
+        """Retorna los índices de las claves coincidentes, en el orden original"""
+        texto = texto.lower()
+        return sorted(self._contenidas.buscar(texto) | self._contenedoras.buscar(texto))
+
+
+class OptionIndex:
+    """Filtro instantáneo sobre listas grandes de opciones (sin distinguir mayúsculas).
+
+    - Subcadenas: las opciones se concatenan en un solo texto en minúsculas y
+      una búsqueda poco frecuente es un `str.find` que salta de coincidencia
+      en coincidencia; si la consulta amplía la anterior (el usuario sigue
+      escribiendo) se filtra el resultado previo.
+    - Prefijos: las opciones ordenadas alfabéticamente dan, con bisect, el
+      rango de las que empiezan por la consulta, que se muestran primero.
+
+    El índice se construye con la primera búsqueda, no al abrir la lista.
+    """
+
+    SEPARADOR = '\n'
+    # Por encima de esta fracción de coincidencias conviene recorrer la lista entera
+    DENSIDAD_RECORRIDO = 0.05
+    # Con pocos resultados, comprobar el prefijo uno a uno es más barato
+    MAX_PREFIJO_DIRECTO = 2000
+
+    def __init__(self, opciones):
+        self.opciones = tuple(opciones)
+        self._minusculas = None
+        self._texto = None
+        self._inicios = None
+        self._ordenadas = None
+        self._claves_ordenadas = None
+        self._ultima = None  # (consulta, índices ascendentes)
+
+    def preparar(self):
+        """Construye el índice por adelantado (por ejemplo, justo después de mostrar la lista)"""
+        if self._texto is None:
+            self._construir()
+        self._ordenar()
+
+    def _construir(self):
+        minusculas = [opcion.lower().replace(self.SEPARADOR, ' ') for opcion in self.opciones]
+        inicios = []
+        posicion = 0
+        for opcion in minusculas:
+            inicios.append(posicion)
+            posicion += len(opcion) + 1
+        self._minusculas = minusculas
+        self._inicios = inicios
+        self._texto = self.SEPARADOR.join(minusculas) + self.SEPARADOR
+
+    def buscar(self, texto):
+        """Índices de las opciones que contienen el texto: primero las que empiezan
+        por él y luego el resto, cada grupo en el orden original."""
+        prefijos, resto = self.buscar_grupos(texto)
+        return prefijos + resto if prefijos else resto
+
+    def buscar_grupos(self, texto):
+        """Como `buscar`, pero retorna por separado (prefijos, resto)"""
+        texto = texto.lower()
+        if not texto:
+            return [], list(range(len(self.opciones)))
+        if self.SEPARADOR in texto:
+            return [], []
+        if self._texto is None:
+            self._construir()
+
+        minusculas = self._minusculas
+        if self._ultima is not None and self._ultima[0] in texto:
+            # Refinamiento: el resultado nuevo está contenido en el anterior
+            coincidencias = [i for i in self._ultima[1] if texto in minusculas[i]]
+        elif self._texto.count(texto) > len(minusculas) * self.DENSIDAD_RECORRIDO:
+            coincidencias = [i for i, opcion in enumerate(minusculas) if texto in opcion]
+        else:
+            coincidencias = self._escanear(texto)
+        self._ultima = (texto, coincidencias)
+
+        if len(coincidencias) <= self.MAX_PREFIJO_DIRECTO:
+            prefijos = [i for i in coincidencias if minusculas[i].startswith(texto)]
+            con_prefijo = set(prefijos)
+        else:
+            con_prefijo = self._con_prefijo(texto)
+            prefijos = [i for i in coincidencias if i in con_prefijo]
+        if not prefijos:
+            return prefijos, coincidencias
+        return prefijos, [i for i in coincidencias if i not in con_prefijo]
+
+    def _escanear(self, texto):
+        """Coincidencias en orden ascendente, visitando solo las opciones que contienen el texto"""
+        encontrados = []
+        inicios = self._inicios
+        buscar = self._texto.find
+        posicion = buscar(texto)
+        while posicion != -1:
+            indice = bisect_right(inicios, posicion) - 1
+            encontrados.append(indice)
+            # Saltar al comienzo de la siguiente opción
+            if indice + 1 >= len(inicios):
+                break
+            posicion = buscar(texto, inicios[indice + 1])
+        return encontrados
+
+    def _con_prefijo(self, texto):
+        """Conjunto de índices de las opciones que empiezan por el texto"""
+        self._ordenar()
+        inicio = bisect_left(self._claves_ordenadas, texto)
+        # Todo lo que empieza por `texto` queda antes de `texto` + el mayor carácter
+        fin = bisect_left(self._claves_ordenadas, texto + '\U0010ffff', inicio)
+        return set(self._ordenadas[inicio:fin])
+
+    def _ordenar(self):
+        if self._ordenadas is None:
+            self._ordenadas = sorted(range(len(self._minusculas)), key=self._minusculas.__getitem__)
+            self._claves_ordenadas = [self._minusculas[i] for i in self._ordenadas]
+
+    def __len__(self):
+        return len(self.opciones)
+
+
+class PrefixTrie:
+    """Trie implícito sobre las claves ordenadas alfabéticamente.
+
+    Cada nodo (un prefijo) corresponde a un rango contiguo de la lista
+    ordenada, que se localiza con bisect en lugar de materializar un nodo por
+    carácter: construirlo cuesta un ordenamiento y bajar un nivel es
+    O(log n). Los mejores `k` de cada nodo se memorizan.
+    """
+
+    MAX_NODOS_EN_CACHE = 4096
+
+    def __init__(self, claves):
+        self._ordenadas = sorted(range(len(claves)), key=claves.__getitem__)
+        self._claves = [claves[i] for i in self._ordenadas]
+        self.asignar_rangos(range(len(claves)))
+
+    def asignar_rangos(self, rangos):
+        """rangos[i]: posición de la clave i en el ranking global (menor = mejor)"""
+        self._rangos_ordenados = [rangos[i] for i in self._ordenadas]
+        self._mejores = {}
+
+    def nodo(self, prefijo):
+        """Rango (inicio, fin) de las claves que empiezan por el prefijo"""
+        inicio = bisect_left(self._claves, prefijo)
+        fin = bisect_left(self._claves, prefijo + '\U0010ffff', inicio)
+        return inicio, fin
+
+    def mejores(self, prefijo, k):
+        """Posiciones de ranking de las `k` mejores claves con ese prefijo, en orden"""
+        clave = (prefijo, k)
+        resultado = self._mejores.get(clave)
+        if resultado is None:
+            inicio, fin = self.nodo(prefijo)
+            resultado = tuple(heapq.nsmallest(k, self._rangos_ordenados[inicio:fin]))
+            if len(self._mejores) >= self.MAX_NODOS_EN_CACHE:
+                self._mejores.clear()
+            self._mejores[clave] = resultado
+        return resultado
+
+
+class CompletionIndex:
+    """Autocompletado con ranking: primero las opciones que empiezan por el
+    texto, luego las que lo contienen; dentro de cada grupo, las más usadas
+    primero y después en el orden original de la lista.
+
+    El trie y el índice de subcadenas se construyen una vez por categoría;
+    `registrar_uso` solo recalcula el ranking global.
+    """
+
+    def __init__(self, opciones, frecuencias=None, subcadenas=None):
+        self.opciones = tuple(opciones)
+        self.frecuencias = dict(frecuencias or {})
+        self._subcadenas = subcadenas if subcadenas is not None else OptionIndex(self.opciones)
+        self._minusculas = [opcion.lower() for opcion in self.opciones]
+        self._trie = None
+        self._por_rango = None
+        self._rango_de = None
+
+    def _actualizar_ranking(self):
+        frecuencias = self.frecuencias
+        self._por_rango = sorted(
+            range(len(self.opciones)),
+            key=lambda i: (-frecuencias.get(self.opciones[i], 0), i)
+        )
+        self._rango_de = [0] * len(self.opciones)
+        for rango, indice in enumerate(self._por_rango):
+            self._rango_de[indice] = rango
+        if self._trie is None:
+            self._trie = PrefixTrie(self._minusculas)
+        self._trie.asignar_rangos(self._rango_de)
+
+    def buscar(self, texto, k=20):
+        """Índices de las `k` mejores opciones para el texto escrito"""
+        if self._por_rango is None:
+            self._actualizar_ranking()
+        texto = texto.lower()
+        resultado = [self._por_rango[rango] for rango in self._trie.mejores(texto, k)]
+        if len(resultado) < k and texto:
+            # Completar con coincidencias internas (las de prefijo ya están)
+            _, infijas = self._subcadenas.buscar_grupos(texto)
+            infijas = (self._rango_de[i] for i in infijas)
+            resultado.extend(self._por_rango[rango] for rango in heapq.nsmallest(k - len(resultado), infijas))
+        return resultado
+
+    def completar(self, texto, k=20):
+        """Textos de las `k` mejores opciones"""
+        return [self.opciones[i] for i in self.buscar(texto, k)]
+
+    def registrar_uso(self, opcion):
+        """Cuenta una selección para que la opción suba en el ranking"""
+        if opcion in self.opciones:
+            self.frecuencias[opcion] = self.frecuencias.get(opcion, 0) + 1
+            self._por_rango = None
+
+    def __len__(self):
+        return len(self.opciones)
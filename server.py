@@ -0,0 +1,410 @@
+"""Servicio local de prompts: JSON-RPC 2.0 sobre HTTP, con asyncio.
+
+Uso típico:
+
+    python server.py --port 8765
+    python loadtest.py --port 8765 --clients 64 --requests 200
+
+Las llamadas se envían con POST a `/rpc`, una por petición o varias en un
+arreglo (lote JSON-RPC, se responden en el mismo orden):
+
+    {"jsonrpc": "2.0", "id": 1, "method": "open_session", "params": {}}
+    {"jsonrpc": "2.0", "id": 2, "method": "set_value",
+     "params": {"session": "...", "category": "ojos", "value": "green eyes"}}
+    {"jsonrpc": "2.0", "id": 3, "method": "generate", "params": {"session": "..."}}
+
+Métodos:
+
+    open_session / close_session          crear o cerrar una sesión
+    set_value(session, category, value)   o `values` con {categoría: valor}
+    clear(session)                        vaciar los valores de la sesión
+    generate(session)                     prompt y valores de la sesión
+    suggest(category, value, limit=8)     sugerencias por categoría relacionada
+    combinations(category, value)         prendas compatibles
+    translate(category, value)            traducciones de una prenda
+    stats()                               sesiones abiertas y estado de las cachés
+
+`GET /health` responde sin tocar ninguna sesión. Cada sesión es un
+`Session` compacto en memoria (misma interfaz que PromptGenerator); se descarta si pasa `--idle-timeout` segundos
+sin uso o si se supera `--max-sessions` (primero la que lleva más tiempo
+sin usarse). Todas las sesiones y el motor de sugerencias comparten el mismo
+almacén de reglas del proceso, de solo lectura, cargado una vez al arrancar.
+
+Las llamadas son cortas y se atienden en el hilo del bucle de eventos; para
+usar varios núcleos, levantar varios procesos en puertos distintos.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from logic.rule_store import compile_cache, get_rule_store
+from logic.session import Session, get_category_catalog
+from logic.suggestion_engine import SuggestionEngine
+
+TAMANO_MAXIMO_CUERPO = 1024 * 1024
+LIMITE_SUGERENCIAS = 8
+LIMITE_SUGERENCIAS_MAXIMO = 100
+
+# Códigos de error de JSON-RPC 2.0 (los del -32000 al -32099 son del servidor)
+ERROR_PARSEO = -32700
+PETICION_INVALIDA = -32600
+METODO_INEXISTENTE = -32601
+PARAMETROS_INVALIDOS = -32602
+ERROR_INTERNO = -32603
+SESION_DESCONOCIDA = -32001
+
+ESTADOS_HTTP = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large'
+}
+
+
+class RpcError(Exception):
+    """Error que se devuelve al cliente como objeto `error` de JSON-RPC"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Sesion:
+    __slots__ = ('generador', 'ultimo_uso')
+
+    def __init__(self, generador, ahora):
+        self.generador = generador
+        self.ultimo_uso = ahora
+
+
+class SessionManager:
+    """Sesiones en memoria ordenadas por último uso.
+
+    Usar una sesión la mueve al final, así que las inactivas quedan al
+    principio y expirarlas solo recorre las que de verdad se descartan.
+    """
+
+    def __init__(self, store, idle_timeout=600.0, max_sessions=10000, reloj=time.monotonic):
+        self.catalogo = get_category_catalog(store)
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.reloj = reloj
+        self.expiradas = 0
+        self._sesiones = OrderedDict()
+
+    def open(self):
+        """Crea una sesión vacía y retorna su identificador"""
+        session_id = secrets.token_hex(8)
+        self._sesiones[session_id] = Sesion(Session(self.catalogo), self.reloj())
+        while len(self._sesiones) > self.max_sessions:
+            self._sesiones.popitem(last=False)
+            self.expiradas += 1
+        return session_id
+
+    def get(self, session_id):
+        """Generador de una sesión, marcándola como usada"""
+        _exigir_texto(session=session_id)
+        sesion = self._sesiones.get(session_id)
+        if sesion is None:
+            raise RpcError(SESION_DESCONOCIDA, f"Sesión desconocida o expirada: {session_id}")
+        sesion.ultimo_uso = self.reloj()
+        self._sesiones.move_to_end(session_id)
+        return sesion.generador
+
+    def close(self, session_id):
+        """Descarta una sesión; retorna False si no existía"""
+        _exigir_texto(session=session_id)
+        return self._sesiones.pop(session_id, None) is not None
+
+    def evict_idle(self):
+        """Descarta las sesiones sin uso durante más de `idle_timeout`; retorna cuántas"""
+        limite = self.reloj() - self.idle_timeout
+        descartadas = 0
+        while self._sesiones:
+            session_id, sesion = next(iter(self._sesiones.items()))
+            if sesion.ultimo_uso > limite:
+                break
+            del self._sesiones[session_id]
+            descartadas += 1
+        self.expiradas += descartadas
+        return descartadas
+
+    def __len__(self):
+        return len(self._sesiones)
+
+
+class PromptService:
+    """Métodos JSON-RPC sobre las sesiones y el motor de sugerencias compartido"""
+
+    def __init__(self, store=None, idle_timeout=600.0, max_sessions=10000):
+        self.store = store or get_rule_store()
+        self.sessions = SessionManager(self.store, idle_timeout, max_sessions)
+        self.engine = SuggestionEngine(self.store)
+        self.metodos = {
+            'open_session': self.open_session,
+            'close_session': self.close_session,
+            'set_value': self.set_value,
+            'clear': self.clear,
+            'generate': self.generate,
+            'suggest': self.suggest,
+            'combinations': self.combinations,
+            'translate': self.translate,
+            'stats': self.stats,
+        }
+
+    # --- Métodos ---
+
+    def open_session(self):
+        return {'session': self.sessions.open()}
+
+    def close_session(self, session):
+        return {'closed': self.sessions.close(session)}
+
+    def set_value(self, session, category=None, value=None, values=None):
+        generador = self.sessions.get(session)
+        if values is None:
+            if category is None or value is None:
+                raise RpcError(PARAMETROS_INVALIDOS, "Se esperaba 'category' y 'value', o 'values'")
+            values = {category: value}
+        elif not isinstance(values, dict):
+            raise RpcError(PARAMETROS_INVALIDOS, "'values' debe ser un objeto {categoría: valor}")
+        # Solo categorías conocidas: el catálogo de ids es compartido por todas las sesiones
+        catalogo = self.sessions.catalogo
+        for categoria, valor in values.items():
+            if not isinstance(categoria, str) or not catalogo.conoce(categoria):
+                raise RpcError(PARAMETROS_INVALIDOS, f"Categoría desconocida: {categoria}")
+            if not isinstance(valor, str):
+                raise RpcError(PARAMETROS_INVALIDOS, f"El valor de '{categoria}' debe ser texto")
+        for categoria, valor in values.items():
+            generador.set_category_value(categoria, valor)
+        return {'values': dict(generador.category_values)}
+
+    def clear(self, session):
+        self.sessions.get(session).clear_all()
+        return {'values': {}}
+
+    def generate(self, session):
+        generador = self.sessions.get(session)
+        prompt = generador.generate_prompt()
+        return {'prompt': prompt, 'values': dict(generador.category_values)}
+
+    def suggest(self, category, value, limit=LIMITE_SUGERENCIAS):
+        _exigir_texto(category=category, value=value)
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise RpcError(PARAMETROS_INVALIDOS, "'limit' debe ser un entero positivo")
+        limit = min(limit, LIMITE_SUGERENCIAS_MAXIMO)
+        sugerencias = self.engine.get_suggestions(category, value)
+        return {categoria: ranking.take(limit) for categoria, ranking in sugerencias.items()}
+
+    def combinations(self, category, value):
+        _exigir_texto(category=category, value=value)
+        return self.engine.get_combinations(category, value)
+
+    def translate(self, category, value):
+        _exigir_texto(category=category, value=value)
+        return self.engine.get_translations(category, value)
+
+    def stats(self):
+        return {
+            'sessions': len(self.sessions),
+            'evicted': self.sessions.expiradas,
+            'suggestion_cache': self.engine.cache.stats()
+        }
+
+    # --- Despacho JSON-RPC ---
+
+    def handle_body(self, body):
+        """Procesa el cuerpo de una petición y retorna la respuesta (o None si no hay)"""
+        try:
+            mensaje = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            return _error(None, ERROR_PARSEO, "JSON inválido")
+
+        if isinstance(mensaje, list):
+            if not mensaje:
+                return _error(None, PETICION_INVALIDA, "Lote vacío")
+            respuestas = [self.handle_call(llamada) for llamada in mensaje]
+            return [respuesta for respuesta in respuestas if respuesta is not None] or None
+        return self.handle_call(mensaje)
+
+    def handle_call(self, llamada):
+        """Ejecuta una llamada JSON-RPC; las notificaciones (sin `id`) no tienen respuesta"""
+        if not isinstance(llamada, dict) or llamada.get('jsonrpc') != '2.0' \
+                or not isinstance(llamada.get('method'), str):
+            return _error(None, PETICION_INVALIDA, "Petición JSON-RPC 2.0 inválida")
+
+        call_id = llamada.get('id')
+        metodo = self.metodos.get(llamada['method'])
+        params = llamada.get('params', {})
+        try:
+            if metodo is None:
+                raise RpcError(METODO_INEXISTENTE, f"Método desconocido: {llamada['method']}")
+            if not isinstance(params, dict):
+                raise RpcError(PARAMETROS_INVALIDOS, "Los parámetros deben ser un objeto")
+            # Validar los nombres contra la firma antes de llamar: un TypeError
+            # dentro del método es un error interno, no de parámetros
+            try:
+                inspect.signature(metodo).bind(**params)
+            except TypeError as e:
+                raise RpcError(PARAMETROS_INVALIDOS, str(e))
+            resultado = metodo(**params)
+        except RpcError as e:
+            return _error(call_id, e.code, e.message) if 'id' in llamada else None
+        except Exception as e:
+            print(f"Error en {llamada['method']}: {e}")
+            return _error(call_id, ERROR_INTERNO, "Error interno") if 'id' in llamada else None
+
+        if 'id' not in llamada:
+            return None
+        return {'jsonrpc': '2.0', 'id': call_id, 'result': resultado}
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader, writer):
+        """Atiende una conexión HTTP/1.1 con keep-alive"""
+        try:
+            while True:
+                peticion = await _leer_peticion(reader)
+                if peticion is None:
+                    break
+                metodo, ruta, version, cabeceras, cuerpo = peticion
+                estado, respuesta = self._responder(metodo, ruta, cuerpo)
+                mantener = (
+                    cabeceras.get('connection', '').lower() != 'close'
+                    if version == 'HTTP/1.1'
+                    else cabeceras.get('connection', '').lower() == 'keep-alive'
+                )
+                writer.write(_respuesta_http(estado, respuesta, mantener))
+                await writer.drain()
+                if not mantener:
+                    break
+        except _PeticionHttpInvalida as e:
+            writer.write(_respuesta_http(e.estado, _error(None, PETICION_INVALIDA, str(e)), False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _responder(self, metodo, ruta, cuerpo):
+        if ruta == '/health':
+            return 200, {'status': 'ok', 'sessions': len(self.sessions)}
+        if ruta != '/rpc':
+            return 404, _error(None, PETICION_INVALIDA, f"Ruta desconocida: {ruta}")
+        if metodo != 'POST':
+            return 405, _error(None, PETICION_INVALIDA, "Usar POST en /rpc")
+        respuesta = self.handle_body(cuerpo)
+        return (200, respuesta) if respuesta is not None else (204, None)
+
+    async def evict_periodically(self, intervalo):
+        while True:
+            await asyncio.sleep(intervalo)
+            self.sessions.evict_idle()
+
+
+class _PeticionHttpInvalida(Exception):
+    def __init__(self, estado, message):
+        super().__init__(message)
+        self.estado = estado
+
+
+async def _leer_peticion(reader):
+    """Lee una petición HTTP; retorna None si el cliente cerró la conexión"""
+    try:
+        cabecera = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise _PeticionHttpInvalida(400, "Petición HTTP incompleta")
+        return None
+    except asyncio.LimitOverrunError:
+        raise _PeticionHttpInvalida(413, "Cabeceras demasiado grandes")
+
+    lineas = cabecera.decode('latin-1').split('\r\n')
+    partes = lineas[0].split()
+    if len(partes) != 3:
+        raise _PeticionHttpInvalida(400, "Línea de petición inválida")
+    metodo, ruta, version = partes
+
+    cabeceras = {}
+    for linea in lineas[1:]:
+        if ':' in linea:
+            nombre, valor = linea.split(':', 1)
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+    try:
+        longitud = int(cabeceras.get('content-length', 0))
+    except ValueError:
+        raise _PeticionHttpInvalida(400, "Content-Length inválido")
+    if longitud > TAMANO_MAXIMO_CUERPO:
+        raise _PeticionHttpInvalida(413, "Cuerpo demasiado grande")
+    cuerpo = await reader.readexactly(longitud) if longitud else b''
+    return metodo, ruta.split('?', 1)[0], version, cabeceras, cuerpo
+
+
+def _exigir_texto(**parametros):
+    for nombre, valor in parametros.items():
+        if not isinstance(valor, str):
+            raise RpcError(PARAMETROS_INVALIDOS, f"'{nombre}' debe ser texto")
+
+
+def _error(call_id, code, message):
+    return {'jsonrpc': '2.0', 'id': call_id, 'error': {'code': code, 'message': message}}
+
+
+def _a_json(valor):
+    # Los resultados en caché son vistas de solo lectura (MappingProxyType)
+    if isinstance(valor, Mapping):
+        return dict(valor)
+    raise TypeError(f"{type(valor).__name__} no es serializable")
+
+
+def _respuesta_http(estado, respuesta, mantener):
+    cuerpo = b'' if respuesta is None else json.dumps(
+        respuesta, ensure_ascii=False, default=_a_json
+    ).encode('utf-8')
+    cabecera = (
+        f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+    )
+    return cabecera.encode('latin-1') + cuerpo
+
+
+async def serve(host, port, service, evict_interval):
+    servidor = await asyncio.start_server(service.handle_connection, host, port)
+    tarea_expiracion = asyncio.create_task(service.evict_periodically(evict_interval))
+    direcciones = ', '.join(str(sock.getsockname()) for sock in servidor.sockets)
+    print(f"Servicio de prompts escuchando en {direcciones}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        tarea_expiracion.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio JSON-RPC de generación de prompts")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección de escucha (por defecto, solo local)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--idle-timeout', type=float, default=600.0,
+                        help="Segundos sin uso tras los que se descarta una sesión")
+    parser.add_argument('--max-sessions', type=int, default=10000,
+                        help="Máximo de sesiones en memoria")
+    args = parser.parse_args(argv)
+
+    # Cargar y compilar todas las reglas antes de aceptar conexiones
+    store = get_rule_store()
+    compile_cache(store)
+    service = PromptService(store, args.idle_timeout, args.max_sessions)
+    try:
+        asyncio.run(serve(args.host, args.port, service, min(args.idle_timeout / 4, 30.0)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
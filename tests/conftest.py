@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Las pruebas importan `logic` desde la raíz del repositorio, como main.py y batch.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,91 @@
+import json
+from types import MappingProxyType
+
+import pytest
+
+from logic.cache import LRUCache, freeze
+from logic.rule_store import RuleStore
+from logic.suggestion_engine import SuggestionEngine
+
+
+def calcular(valor, llamadas):
+    def compute():
+        llamadas.append(valor)
+        return valor
+    return compute
+
+
+def test_lru_descarta_la_menos_usada():
+    cache = LRUCache(maxsize=2)
+    llamadas = []
+    cache.get_or_compute('a', calcular(1, llamadas))
+    cache.get_or_compute('b', calcular(2, llamadas))
+    # Usar 'a' la vuelve la más reciente: la siguiente en salir es 'b'
+    assert cache.get_or_compute('a', calcular(-1, llamadas)) == 1
+    cache.get_or_compute('c', calcular(3, llamadas))
+    assert len(cache) == 2
+
+    assert cache.get_or_compute('a', calcular(-1, llamadas)) == 1
+    assert cache.get_or_compute('b', calcular(20, llamadas)) == 20
+    assert llamadas == [1, 2, 3, 20]
+    assert cache.stats() == {'hits': 2, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+
+def test_lru_clear():
+    cache = LRUCache(maxsize=4)
+    llamadas = []
+    cache.get_or_compute('a', calcular(1, llamadas))
+    cache.clear()
+    assert len(cache) == 0
+    cache.get_or_compute('a', calcular(1, llamadas))
+    assert llamadas == [1, 1]
+
+
+def test_freeze_es_de_solo_lectura():
+    congelado = freeze({'a': [1, {'b': [2]}], 'c': {3}})
+    assert isinstance(congelado, MappingProxyType)
+    assert congelado['a'] == (1, MappingProxyType({'b': (2,)}))
+    assert congelado['c'] == frozenset({3})
+    with pytest.raises(TypeError):
+        congelado['a'] = 1
+    with pytest.raises(TypeError):
+        congelado['a'][1]['b'] = 1
+
+
+def escribir_sugerencias(data_dir, sugeridos):
+    reglas = {'ojos': {'blue eyes': {'cabello_color': sugeridos}}}
+    (data_dir / 'suggestion_rules.json').write_text(json.dumps(reglas), encoding='utf-8')
+
+
+def sugerencias(motor):
+    return {categoria: list(valores) for categoria, valores in motor.get_suggestions('ojos', 'Blue Eyes').items()}
+
+
+@pytest.fixture
+def motor(tmp_path):
+    escribir_sugerencias(tmp_path, ['blue hair'])
+    return SuggestionEngine(RuleStore(str(tmp_path), use_cache=False))
+
+
+def test_busqueda_repetida_usa_la_cache(motor):
+    primero = motor.get_suggestions('ojos', 'blue eyes')
+    # La clave se normaliza a minúsculas
+    assert motor.get_suggestions('ojos', 'BLUE EYES') is primero
+    assert sugerencias(motor) == {'cabello_color': ['blue hair']}
+
+
+def test_recarga_invalida_por_version(tmp_path, motor):
+    assert sugerencias(motor) == {'cabello_color': ['blue hair']}
+    escribir_sugerencias(tmp_path, ['silver hair', 'blue hair'])
+    motor.store.reload('suggestion_rules.json')
+    assert sugerencias(motor) == {'cabello_color': ['silver hair', 'blue hair']}
+
+
+def test_almacenes_distintos_no_comparten_resultados(tmp_path, motor):
+    otro_dir = tmp_path / 'otro'
+    otro_dir.mkdir()
+    escribir_sugerencias(otro_dir, ['red hair'])
+    otro = SuggestionEngine(RuleStore(str(otro_dir), use_cache=False))
+    # Los dos almacenes están en la versión 1 de sus reglas
+    assert sugerencias(motor) == {'cabello_color': ['blue hair']}
+    assert sugerencias(otro) == {'cabello_color': ['red hair']}
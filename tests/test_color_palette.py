@@ -0,0 +1,31 @@
+import json
+
+from logic.color_palette import PALETA_POR_DEFECTO, ColorPalette
+from logic.rule_store import RuleStore
+
+
+def paleta(data_dir, reglas):
+    (data_dir / 'color_rules.json').write_text(json.dumps(reglas), encoding='utf-8')
+    return ColorPalette(RuleStore(str(data_dir), use_cache=False))
+
+
+def test_compatibles_primero_y_sin_duplicados(tmp_path):
+    colores = paleta(tmp_path, {
+        'paleta': ['black', 'white', 'navy', 'white'],
+        'compatibles': {'Shirt': ['navy', 'white', 'pink']},
+    })
+    # 'pink' no está en la paleta
+    assert colores.colores_para('Blue shirt') == ('navy', 'white', 'black')
+
+
+def test_sin_archivo_usa_la_paleta_por_defecto(tmp_path):
+    colores = ColorPalette(RuleStore(str(tmp_path), use_cache=False))
+    assert colores.colores_para('skirt') == tuple(PALETA_POR_DEFECTO['paleta'])
+
+
+def test_almacenes_distintos_no_comparten_resultados(tmp_path):
+    uno, otro = tmp_path / 'uno', tmp_path / 'otro'
+    uno.mkdir()
+    otro.mkdir()
+    assert paleta(uno, {'paleta': ['red']}).colores_para('hat') == ('red',)
+    assert paleta(otro, {'paleta': ['green']}).colores_para('hat') == ('green',)
@@ -0,0 +1,88 @@
+import json
+from itertools import product
+
+import pytest
+
+from logic.combinator import CombinationEnumerator
+from logic.prompt_generator import PromptGenerator
+from logic.rule_store import RuleStore
+
+
+def generador_con_reglas(tmp_path, reglas):
+    (tmp_path / 'category_rules.json').write_text(json.dumps(reglas), encoding='utf-8')
+    return PromptGenerator(RuleStore(str(tmp_path), use_cache=False))
+
+
+def test_excluye_bloqueos_encadenados(tmp_path):
+    # A=a sugiere B=b, que bloquea C: aplicar_inferencias('A', 'a') bloquea C
+    reglas = {'reglas_inferencia': {
+        'A': {'a': {'B': ['b']}},
+        'B': {'b': {'_bloquear': ['C']}},
+    }}
+    generador = generador_con_reglas(tmp_path, reglas)
+    generador.aplicar_inferencias('A', 'a')
+    assert 'C' in generador.categorias_temporalmente_bloqueadas
+
+    combinaciones = list(CombinationEnumerator(
+        {'A': ['a', 'z'], 'C': ['c']}, generator=generador_con_reglas(tmp_path, reglas)
+    ))
+    assert combinaciones == [{'A': 'z', 'C': 'c'}]
+
+
+def test_fijas_en_conflicto_dejan_el_espacio_vacio(tmp_path):
+    reglas = {'conflictos': [['A', 'B']], 'prioridades': {'A': 2, 'B': 1}}
+    enumerador = CombinationEnumerator(
+        {'C': ['c1', 'c2']}, fixed={'A': 'a', 'B': 'b'}, generator=generador_con_reglas(tmp_path, reglas)
+    )
+    assert enumerador.count() == 0
+    assert enumerador.estimate() == 0
+    assert list(enumerador) == []
+    assert list(enumerador.shard(0, 1)) == []
+    with pytest.raises(IndexError):
+        enumerador[0]
+
+
+def test_fijas_que_se_bloquean_dejan_el_espacio_vacio(tmp_path):
+    reglas = {'reglas_inferencia': {'A': {'a': {'_bloquear': ['B']}}}}
+    generador = generador_con_reglas(tmp_path, reglas)
+    assert CombinationEnumerator({'C': ['c']}, fixed={'A': 'a', 'B': 'b'}, generator=generador).count() == 0
+    assert CombinationEnumerator({'C': ['c']}, fixed={'A': 'x', 'B': 'b'}, generator=generador).count() == 1
+
+
+def prompt_conserva_todo(reglas, asignacion, tmp_path):
+    """Una combinación es válida si generate_prompt no descarta ninguno de sus valores"""
+    generador = generador_con_reglas(tmp_path, reglas)
+    for categoria, valor in asignacion.items():
+        generador.set_category_value(categoria, valor)
+    for categoria, valor in asignacion.items():
+        generador.aplicar_inferencias(categoria, valor)
+    generador.generate_prompt()
+    return generador.category_values == asignacion
+
+
+def test_coincide_con_la_fuerza_bruta(tmp_path):
+    reglas = {
+        'conflictos': [['A', 'B'], ['B', 'D']],
+        'prioridades': {'A': 3, 'B': 2, 'C': 1},
+        'reglas_inferencia': {
+            'A': {'a2': {'_bloquear': ['C']}},
+            'C': {'c1': {'D': ['d1']}},
+            'D': {'d1': {'_bloquear': ['A']}},
+        },
+    }
+    dominios = {'A': ['a1', 'a2'], 'B': ['b1'], 'C': ['c1', 'c2'], 'D': ['d1', 'd2'], 'E': ['e1', 'e2']}
+    casos = [
+        ({}, 'ABCDE'), ({'B': 'b1'}, 'ACDE'), ({'C': 'c1', 'D': 'd1'}, 'ABE'),
+        # Fijas incompatibles entre sí, con categorías a recorrer que no chocan con ellas
+        ({'A': 'a2', 'C': 'c2'}, 'E'), ({'A': 'a1', 'B': 'b1'}, 'E'), ({'A': 'a1', 'C': 'c2'}, 'E'),
+    ]
+    for fijas, categorias in casos:
+        sweep = {categoria: dominios[categoria] for categoria in categorias}
+        esperadas = []
+        for valores in product(*sweep.values()):
+            asignacion = {**fijas, **dict(zip(sweep, valores))}
+            if prompt_conserva_todo(reglas, asignacion, tmp_path):
+                esperadas.append(asignacion)
+        enumerador = CombinationEnumerator(sweep, fixed=fijas, generator=generador_con_reglas(tmp_path, reglas))
+        assert enumerador.count() == len(esperadas), fijas
+        assert sorted(map(sorted, (c.items() for c in enumerador))) == sorted(map(sorted, (c.items() for c in esperadas)))
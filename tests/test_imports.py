@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se cargan al usarlos, no al importar los puntos de entrada
+PEREZOSOS = {'logic.inference', 'logic.render', 'logic.text_index', 'json', 'pickle', 'tempfile', 'hashlib'}
+
+
+def modulos_tras_importar(modulo):
+    """Módulos cargados en un intérprete nuevo después de `import modulo`"""
+    codigo = f"import sys; import {modulo}; sys.stdout.write(repr(sorted(sys.modules)))"
+    salida = subprocess.run(
+        [sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout
+    return set(eval(salida))
+
+
+def test_importar_logic_no_carga_submodulos():
+    assert not {nombre for nombre in modulos_tras_importar('logic') if nombre.startswith('logic.')}
+
+
+@pytest.mark.parametrize('modulo', ['logic.prompt_generator', 'logic.session'])
+def test_puntos_de_entrada_no_cargan_modulos_perezosos(modulo):
+    assert not modulos_tras_importar(modulo) & PEREZOSOS
+
+
+def test_los_modulos_perezosos_se_cargan_al_usarlos(tmp_path):
+    (tmp_path / 'category_rules.json').write_text(
+        json.dumps({'reglas_inferencia': {'A': {'a': {'B': ['b']}}}}), encoding='utf-8'
+    )
+    codigo = (
+        "import sys\n"
+        "from logic.prompt_generator import PromptGenerator\n"
+        "from logic.rule_store import RuleStore\n"
+        f"generador = PromptGenerator(RuleStore({str(tmp_path)!r}, use_cache=False))\n"
+        "assert generador.aplicar_inferencias('A', 'a') == {'B': ('b',)}\n"
+        "generador.get_completion_index('ojos').completar('blue')\n"
+        "generador.snapshot()\n"
+        "sys.stdout.write(repr(sorted(sys.modules)))"
+    )
+    salida = subprocess.run(
+        [sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout
+    assert {'logic.inference', 'logic.render', 'logic.text_index'} <= set(eval(salida))
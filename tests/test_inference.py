@@ -0,0 +1,84 @@
+from logic.inference import InferenceEngine
+from logic.rule_compiler import compile_rules
+
+
+def motor(reglas_inferencia):
+    return InferenceEngine(compile_rules({'reglas_inferencia': reglas_inferencia}))
+
+
+def test_sin_reglas():
+    resultado = motor({}).propagar('A', 'a')
+    assert resultado.bloqueadas == ()
+    assert dict(resultado.sugerencias) == {}
+
+
+def test_cadena_propaga_sugerencias_y_bloqueos():
+    resultado = motor({
+        'A': {'a': {'B': ['b']}},
+        'B': {'b': {'C': ['c']}},
+        'C': {'c': {'D': ['d'], '_bloquear': ['E']}},
+    }).propagar('A', 'a')
+    assert dict(resultado.sugerencias) == {'B': ('b',), 'C': ('c',), 'D': ('d',)}
+    assert resultado.bloqueadas == ('E',)
+    assert resultado.ciclos == ()
+
+
+def test_ciclo_termina_y_se_informa():
+    resultado = motor({
+        'A': {'a': {'B': ['b']}},
+        'B': {'b': {'C': ['c']}},
+        'C': {'c': {'A': ['a']}},
+    }).propagar('A', 'a')
+    assert dict(resultado.sugerencias) == {'B': ('b',), 'C': ('c',), 'A': ('a',)}
+    assert resultado.ciclos == ((('A', 'a'), ('B', 'b'), ('C', 'c'), ('A', 'a')),)
+
+
+def test_bloqueo_anula_reglas_de_la_categoria_bloqueada():
+    # B=b bloquea C, así que el bloqueo de D que dispara C=c no cuenta
+    reglas = {
+        'A': {'a': {'B': ['b'], 'C': ['c']}},
+        'B': {'b': {'_bloquear': ['C']}},
+        'C': {'c': {'_bloquear': ['D'], 'E': ['e']}},
+    }
+    resultado = motor(reglas).propagar('A', 'a')
+    assert resultado.bloqueadas == ('C',)
+    assert dict(resultado.sugerencias) == {'B': ('b',)}
+
+
+def test_resultado_no_depende_del_orden_de_las_reglas():
+    antes = {'B': ['b'], 'C': ['c']}
+    despues = {'C': ['c'], 'B': ['b']}
+    resto = {
+        'B': {'b': {'_bloquear': ['C']}},
+        'C': {'c': {'_bloquear': ['D']}},
+    }
+    uno = motor({'A': {'a': antes}, **resto}).propagar('A', 'a')
+    otro = motor({'A': {'a': despues}, **resto}).propagar('A', 'a')
+    assert set(uno.bloqueadas) == set(otro.bloqueadas) == {'C'}
+    assert dict(uno.sugerencias) == dict(otro.sugerencias)
+
+
+def test_bloqueo_mutuo_se_informa_como_conflicto():
+    resultado = motor({
+        'A': {'a': {'X': ['x'], 'Y': ['y']}},
+        'X': {'x': {'_bloquear': ['Y']}},
+        'Y': {'y': {'_bloquear': ['X']}},
+    }).propagar('A', 'a')
+    assert resultado.bloqueadas == ()
+    assert set(resultado.conflictos) == {'X', 'Y'}
+
+
+def test_no_bloquea_la_categoria_elegida():
+    resultado = motor({
+        'A': {'a': {'B': ['b']}},
+        'B': {'b': {'_bloquear': ['A']}},
+    }).propagar('A', 'a')
+    assert resultado.bloqueadas == ()
+    assert resultado.conflictos == ('A',)
+
+
+def test_resultado_memorizado_por_reglas():
+    reglas = compile_rules({'reglas_inferencia': {'A': {'a': {'B': ['b']}}}})
+    assert InferenceEngine.for_rules(reglas) is InferenceEngine.for_rules(reglas)
+    motor_reglas = InferenceEngine.for_rules(reglas)
+    assert motor_reglas.propagar('A', 'a') is motor_reglas.propagar('A', 'a')
@@ -0,0 +1,90 @@
+import json
+import random
+
+import pytest
+
+from logic.prompt_generator import PromptGenerator
+from logic.rule_store import RuleStore
+
+PRIORIDADES = {'A': 5, 'B': 3, 'C': 3, 'D': 1, 'E': 0}
+CATEGORIAS = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+
+
+def escribir_reglas(tmp_path, prioridades, conflictos=()):
+    reglas = {'prioridades': prioridades, 'conflictos': [list(par) for par in conflictos]}
+    (tmp_path / 'category_rules.json').write_text(json.dumps(reglas), encoding='utf-8')
+
+
+@pytest.fixture
+def store(tmp_path):
+    escribir_reglas(tmp_path, PRIORIDADES)
+    return RuleStore(str(tmp_path), use_cache=False)
+
+
+def prompt_reordenando(generador):
+    """Implementación anterior de generate_prompt: ordenar todo en cada llamada
+    (sort estable: a igual prioridad, orden de asignación)"""
+    ordenados = sorted(generador.category_values.items(), key=lambda item: -generador.prioridades.get(item[0], 0))
+    return ", ".join(valor for _, valor in ordenados if valor)
+
+
+@pytest.mark.parametrize('semilla', range(30))
+def test_orden_incremental_coincide_con_reordenar(store, semilla):
+    rng = random.Random(semilla)
+    generador = PromptGenerator(store)
+    for _ in range(80):
+        operacion = rng.random()
+        categoria = rng.choice(CATEGORIAS)
+        if operacion < 0.6:
+            generador.set_category_value(categoria, rng.choice(['x', 'y', 'z', '']))
+        elif operacion < 0.8:
+            generador.set_category_blocked(categoria, True)
+        elif operacion < 0.95:
+            generador.set_category_blocked(categoria, False)
+        else:
+            generador.clear_all()
+        assert generador.generate_prompt() == prompt_reordenando(generador)
+        assert [categoria for _, _, categoria in generador._orden] == sorted(
+            generador.category_values, key=lambda c: -generador.prioridades.get(c, 0)
+        )
+
+
+def test_recarga_reordena_con_las_nuevas_prioridades(tmp_path, store):
+    generador = PromptGenerator(store)
+    for categoria in ('E', 'C', 'A', 'B'):
+        generador.set_category_value(categoria, categoria.lower())
+    assert generador.generate_prompt() == 'a, c, b, e'
+
+    escribir_reglas(tmp_path, {'E': 9, 'B': 4, 'C': 4})
+    store.reload('category_rules.json')
+    assert generador.generate_prompt() == prompt_reordenando(generador) == 'e, c, b, a'
+
+
+def test_prompt_en_cache_hasta_que_cambia_un_valor(store):
+    generador = PromptGenerator(store)
+    generador.set_category_value('B', 'b')
+    generador.set_category_value('A', 'a')
+    prompt = generador.generate_prompt()
+    assert prompt == 'a, b'
+    assert generador.generate_prompt() is prompt
+
+    # Mismo valor: no invalida
+    generador.set_category_value('A', 'a')
+    assert generador.generate_prompt() is prompt
+
+    generador.set_category_value('A', 'otro')
+    assert generador.generate_prompt() == 'otro, b'
+    generador.set_category_blocked('B', True)
+    assert generador.generate_prompt() == 'otro'
+    generador.clear_all()
+    assert generador.generate_prompt() == ''
+
+
+def test_conflictos_solo_con_categorias_nuevas(tmp_path):
+    escribir_reglas(tmp_path, {'A': 2, 'B': 1}, conflictos=[('A', 'B')])
+    generador = PromptGenerator(RuleStore(str(tmp_path), use_cache=False))
+    generador.set_category_value('B', 'b')
+    assert generador.generate_prompt() == 'b'
+    generador.set_category_value('A', 'a')
+    assert generador.generate_prompt() == 'a'
+    assert generador.categorias_temporalmente_bloqueadas == {'B'}
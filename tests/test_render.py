@@ -0,0 +1,96 @@
+import pickle
+import random
+
+import pytest
+
+from logic.prompt_generator import PromptGenerator
+from logic.render import ConflictDecision, PromptState, render_prompt
+from logic.rule_store import DATA_DIR, RuleStore
+
+
+@pytest.fixture(scope='module')
+def store():
+    return RuleStore(DATA_DIR, use_cache=False)
+
+
+CATEGORIAS = [
+    'nsfw', 'vestuario_general', 'vestuario_superior', 'vestuario_inferior', 'ropa_interior_superior',
+    'ojos', 'fondo', 'pose_brazos', 'calidad_tecnica', 'edad_aparente', 'cabello_color',
+]
+
+
+def copia(state):
+    return (state.values, state.blocked, state.reglas, state.version_reglas)
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_coincide_con_generate_prompt(store, semilla):
+    rng = random.Random(semilla)
+    generador = PromptGenerator(store)
+    for _ in range(rng.randint(1, 12)):
+        generador.set_category_value(rng.choice(CATEGORIAS), rng.choice(['a', 'b', 'c', '']))
+        if rng.random() < 0.3:
+            generador.set_category_blocked(rng.choice(CATEGORIAS), rng.random() < 0.5)
+
+    state = generador.snapshot()
+    resultado = render_prompt(state)
+    antes = set(generador.categorias_temporalmente_bloqueadas)
+    assert resultado.prompt == generador.generate_prompt()
+    assert dict(resultado.values) == generador.category_values
+    assert resultado.descartadas == generador.categorias_temporalmente_bloqueadas - antes
+
+
+def test_informa_las_decisiones_de_conflicto(store):
+    generador = PromptGenerator(store)
+    generador.set_category_value('vestuario_superior', 'blouse')
+    generador.set_category_value('nsfw', 'nsfw')
+    resultado = render_prompt(generador.snapshot())
+    assert resultado.decisions == (ConflictDecision('vestuario_superior', 'nsfw'),)
+    assert dict(resultado.values) == {'nsfw': 'nsfw'}
+
+
+def test_no_modifica_el_estado_ni_el_generador(store):
+    generador = PromptGenerator(store)
+    generador.set_category_value('vestuario_superior', 'blouse')
+    generador.set_category_value('nsfw', 'nsfw')
+    generador.set_category_value('ojos', 'blue eyes')
+    state = generador.snapshot()
+    estado_antes = copia(state)
+    valores_antes = dict(generador.category_values)
+
+    primero = render_prompt(state)
+    segundo = render_prompt(state)
+    assert copia(state) == estado_antes
+    assert (primero.prompt, primero.values, primero.decisions) == (segundo.prompt, segundo.values, segundo.decisions)
+    # El generador no resolvió nada todavía
+    assert generador.category_values == valores_antes
+    assert not generador.categorias_temporalmente_bloqueadas
+
+
+def test_with_values_crea_un_estado_nuevo(store):
+    generador = PromptGenerator(store)
+    generador.set_category_value('ojos', 'blue eyes')
+    generador.set_category_value('fondo', 'beach')
+    generador.set_category_blocked('cabello_color', True)
+    state = generador.snapshot()
+    estado_antes = copia(state)
+
+    variante = state.with_values({'ojos': 'green eyes', 'fondo': None, 'cabello_color': 'red hair', 'pose_brazos': 'x'})
+    assert copia(state) == estado_antes
+    assert variante.values == (('ojos', 'green eyes'), ('pose_brazos', 'x'))
+    assert variante.reglas is state.reglas
+
+
+def test_estado_inmutable_y_serializable(store):
+    generador = PromptGenerator(store)
+    generador.set_category_value('ojos', 'blue eyes')
+    state = generador.snapshot()
+    with pytest.raises(AttributeError):
+        state.otro = 1
+    # Cambiar el generador después no afecta al estado ya tomado
+    generador.set_category_value('ojos', 'red eyes')
+    assert state.values == (('ojos', 'blue eyes'),)
+
+    copia_serializada = pickle.loads(pickle.dumps(state))
+    assert render_prompt(copia_serializada).prompt == render_prompt(state).prompt == 'blue eyes'
+    assert isinstance(copia_serializada, PromptState)
@@ -0,0 +1,101 @@
+import json
+import os
+import stat
+
+import pytest
+
+from logic import rule_store
+from logic.rule_store import CACHE_FILE, PERMISOS_CACHE, RuleStore
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / 'category_rules.json').write_text(json.dumps({'prioridades': {'A': 1}}), encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def escrituras(monkeypatch):
+    """Cuenta las veces que se reemplaza el archivo de la caché"""
+    contador = []
+    replace = os.replace
+
+    def contar(origen, destino):
+        if str(destino).endswith(CACHE_FILE):
+            contador.append(destino)
+        return replace(origen, destino)
+
+    monkeypatch.setattr(rule_store.os, 'replace', contar)
+    return contador
+
+
+def sin_parsear(monkeypatch):
+    """Hace fallar la prueba si el almacén vuelve a leer el JSON"""
+    def falla(self, path, content):
+        raise AssertionError(f"Se volvió a parsear {path}")
+    monkeypatch.setattr(RuleStore, '_parse', falla)
+
+
+def claves(data):
+    return tuple(data['prioridades'])
+
+
+def test_arranque_en_frio_escribe_la_cache_una_vez(data_dir, escrituras):
+    store = RuleStore(str(data_dir))
+    assert store.derived('category_rules.json', 'claves', claves) == ('A',)
+    assert len(escrituras) == 1
+
+    with store.escritura_agrupada():
+        store.derived('category_rules.json', 'otra', lambda data: len(data))
+        store.derived('category_rules.json', 'tercera', lambda data: 3)
+        assert len(escrituras) == 1
+    assert len(escrituras) == 2
+
+
+def test_cache_con_permisos_normales(data_dir):
+    RuleStore(str(data_dir)).load('category_rules.json')
+    modo = stat.S_IMODE(os.stat(data_dir / CACHE_FILE).st_mode)
+    assert modo == PERMISOS_CACHE
+    assert not [nombre for nombre in os.listdir(data_dir) if nombre.endswith('.tmp')]
+
+
+def test_cache_vigente_no_vuelve_a_parsear(data_dir, monkeypatch):
+    RuleStore(str(data_dir)).derived('category_rules.json', 'claves', claves)
+    sin_parsear(monkeypatch)
+    store = RuleStore(str(data_dir))
+    assert store.derived('category_rules.json', 'claves', lambda data: pytest.fail("índice reconstruido")) == ('A',)
+
+
+def test_cambio_de_mtime_con_el_mismo_contenido_usa_la_cache(data_dir, monkeypatch):
+    RuleStore(str(data_dir)).load('category_rules.json')
+    path = data_dir / 'category_rules.json'
+    os.utime(path, ns=(5_000_000_000, 5_000_000_000))
+    sin_parsear(monkeypatch)
+    assert dict(RuleStore(str(data_dir)).load('category_rules.json')['prioridades']) == {'A': 1}
+    # El nuevo mtime queda guardado: el siguiente arranque ni siquiera compara el hash
+    assert dict(RuleStore(str(data_dir)).load('category_rules.json')['prioridades']) == {'A': 1}
+
+
+def test_cambio_de_contenido_invalida_la_cache(data_dir):
+    RuleStore(str(data_dir)).derived('category_rules.json', 'claves', claves)
+    path = data_dir / 'category_rules.json'
+    anterior = os.stat(path)
+    path.write_text(json.dumps({'prioridades': {'B': 2}}), encoding='utf-8')
+    # Mismo tamaño y mtime: solo el hash delata el cambio
+    os.utime(path, ns=(anterior.st_atime_ns, anterior.st_mtime_ns + 1))
+    assert RuleStore(str(data_dir)).derived('category_rules.json', 'claves', claves) == ('B',)
+
+
+def test_cambio_de_codigo_invalida_la_cache(data_dir, monkeypatch):
+    RuleStore(str(data_dir)).derived('category_rules.json', 'claves', claves)
+    monkeypatch.setattr(rule_store, '_huella', 'otro código')
+    construidos = []
+    store = RuleStore(str(data_dir))
+    store.derived('category_rules.json', 'claves', lambda data: construidos.append(1) or claves(data))
+    assert construidos == [1]
+
+
+def test_cache_corrupta_se_reconstruye(data_dir, capsys):
+    (data_dir / CACHE_FILE).write_bytes(b'no es un pickle')
+    assert RuleStore(str(data_dir)).derived('category_rules.json', 'claves', claves) == ('A',)
+    assert 'Ignorando caché de reglas inválida' in capsys.readouterr().out
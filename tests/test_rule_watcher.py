@@ -0,0 +1,74 @@
+import json
+import os
+
+from logic.prompt_generator import PromptGenerator
+from logic.rule_store import RuleStore
+from logic.rule_watcher import RuleWatcher
+
+
+def escribir(tmp_path, nombre, datos, mtime_ns=None):
+    path = tmp_path / nombre
+    path.write_text(json.dumps(datos), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_recarga_reemplaza_la_version_entera(tmp_path):
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1}})
+    store = RuleStore(str(tmp_path), use_cache=False)
+    anterior = store.snapshot('category_rules.json')
+    indice = store.derived('category_rules.json', 'claves', lambda data: tuple(data['prioridades']))
+
+    avisos = []
+    store.add_listener(avisos.append)
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1, 'B': 2}})
+    assert store.reload('category_rules.json')
+
+    nueva = store.snapshot('category_rules.json')
+    assert nueva is not anterior and nueva.version == anterior.version + 1
+    # La versión anterior sigue intacta para quien ya la tenía
+    assert dict(anterior.data['prioridades']) == {'A': 1}
+    assert anterior.derived['claves'] is indice == ('A',)
+    # El índice derivado se reconstruyó antes del intercambio
+    assert nueva.derived['claves'] == ('A', 'B')
+    assert avisos == ['category_rules.json']
+
+
+def test_recarga_de_json_invalido_conserva_la_version_anterior(tmp_path):
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1}})
+    store = RuleStore(str(tmp_path), use_cache=False)
+    anterior = store.snapshot('category_rules.json')
+
+    (tmp_path / 'category_rules.json').write_text('{"prioridades": {', encoding='utf-8')
+    assert not store.reload('category_rules.json')
+    assert store.snapshot('category_rules.json') is anterior
+
+
+def test_generador_adopta_las_reglas_recargadas(tmp_path):
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 2, 'B': 1}})
+    store = RuleStore(str(tmp_path), use_cache=False)
+    generador = PromptGenerator(store)
+    generador.set_category_value('B', 'b')
+    generador.set_category_value('A', 'a')
+    assert generador.generate_prompt() == 'a, b'
+
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1, 'B': 2}})
+    store.reload('category_rules.json')
+    assert generador.generate_prompt() == 'b, a'
+
+
+def test_vigilante_espera_a_que_el_archivo_se_estabilice(tmp_path):
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1}}, mtime_ns=1_000_000_000)
+    store = RuleStore(str(tmp_path), use_cache=False)
+    store.snapshot('category_rules.json')
+    vigilante = RuleWatcher(store, names=['category_rules.json'])
+
+    assert vigilante.poll() == []
+    escribir(tmp_path, 'category_rules.json', {'prioridades': {'A': 1, 'B': 2}}, mtime_ns=2_000_000_000)
+    # Primer sondeo tras el cambio: todavía podría estar escribiéndose
+    assert vigilante.poll() == []
+    assert store.version('category_rules.json') == 1
+    assert vigilante.poll() == ['category_rules.json']
+    assert store.version('category_rules.json') == 2
+    assert 'B' in store.load('category_rules.json')['prioridades']
+    assert vigilante.poll() == []
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from logic.rule_store import DATA_DIR, RuleStore
+from server import (
+    ERROR_PARSEO, METODO_INEXISTENTE, PARAMETROS_INVALIDOS, PETICION_INVALIDA, SESION_DESCONOCIDA, PromptService
+)
+
+
+@pytest.fixture(scope='module')
+def servicio():
+    return PromptService(RuleStore(DATA_DIR, use_cache=False))
+
+
+def llamar(servicio, method, params=None, call_id=1):
+    llamada = {'jsonrpc': '2.0', 'id': call_id, 'method': method}
+    if params is not None:
+        llamada['params'] = params
+    return servicio.handle_call(llamada)
+
+
+def codigo(respuesta):
+    return respuesta['error']['code']
+
+
+def test_sesion_completa(servicio):
+    session = llamar(servicio, 'open_session')['result']['session']
+    llamar(servicio, 'set_value', {'session': session, 'category': 'ojos', 'value': 'green eyes'})
+    assert llamar(servicio, 'generate', {'session': session})['result']['prompt'] == 'green eyes'
+    assert llamar(servicio, 'close_session', {'session': session})['result'] == {'closed': True}
+    assert llamar(servicio, 'close_session', {'session': session})['result'] == {'closed': False}
+    assert codigo(llamar(servicio, 'generate', {'session': session})) == SESION_DESCONOCIDA
+
+
+@pytest.mark.parametrize('method, params', [
+    ('close_session', {'session': []}),
+    ('close_session', {'session': {'a': 1}}),
+    ('close_session', {}),
+    ('generate', {'session': 5}),
+    ('open_session', {'extra': 1}),
+    ('suggest', {'category': 'ojos'}),
+    ('suggest', {'category': 'ojos', 'value': 'green eyes', 'limit': 0}),
+    ('suggest', {'category': 'ojos', 'value': 'green eyes', 'limit': True}),
+    ('suggest', {'category': 'ojos', 'value': 'green eyes', 'limit': '8'}),
+    ('combinations', {'category': 'vestuario_superior', 'value': None}),
+    ('translate', {'category': 1, 'value': 'blouse'}),
+])
+def test_parametros_invalidos(servicio, method, params):
+    assert codigo(llamar(servicio, method, params)) == PARAMETROS_INVALIDOS
+
+
+def test_set_value_valida_categorias_y_valores(servicio):
+    session = llamar(servicio, 'open_session')['result']['session']
+    for params in (
+        {'category': 'no_existe', 'value': 'x'},
+        {'category': 'ojos', 'value': 3},
+        {'values': ['ojos']},
+        {'category': 'ojos'},
+    ):
+        assert codigo(llamar(servicio, 'set_value', {'session': session, **params})) == PARAMETROS_INVALIDOS
+    # Nada se asignó
+    assert llamar(servicio, 'generate', {'session': session})['result']['values'] == {}
+
+
+def test_parametros_que_no_son_objeto(servicio):
+    assert codigo(llamar(servicio, 'stats', ['x'])) == PARAMETROS_INVALIDOS
+
+
+def test_metodo_y_peticion_invalidos(servicio):
+    assert codigo(llamar(servicio, 'no_existe')) == METODO_INEXISTENTE
+    assert codigo(servicio.handle_call({'id': 1, 'method': 'stats'})) == PETICION_INVALIDA
+    assert codigo(servicio.handle_body(b'{no es json')) == ERROR_PARSEO
+    assert codigo(servicio.handle_body(b'[]')) == PETICION_INVALIDA
+
+
+def test_suggest_limita_la_cantidad(servicio):
+    resultado = llamar(servicio, 'suggest', {'category': 'vestuario_superior', 'value': 'blouse', 'limit': 2})['result']
+    assert resultado and all(len(valores) <= 2 for valores in resultado.values())
+
+
+def test_combinations_no_escribe_en_la_salida(servicio, capsys):
+    llamar(servicio, 'combinations', {'category': 'vestuario_superior', 'value': 'white shirt'})
+    assert capsys.readouterr().out == ''
+
+
+def test_lote_responde_en_orden_sin_notificaciones(servicio):
+    lote = [
+        {'jsonrpc': '2.0', 'id': 'a', 'method': 'stats'},
+        {'jsonrpc': '2.0', 'method': 'stats'},  # Notificación: sin respuesta
+        {'jsonrpc': '2.0', 'id': 'b', 'method': 'close_session', 'params': {'session': []}},
+        {'jsonrpc': '2.0', 'id': 'c', 'method': 'no_existe'},
+        'no es una llamada',
+    ]
+    respuestas = servicio.handle_body(json.dumps(lote).encode('utf-8'))
+    assert [respuesta['id'] for respuesta in respuestas] == ['a', 'b', 'c', None]
+    assert 'result' in respuestas[0]
+    assert [codigo(respuesta) for respuesta in respuestas[1:]] == [
+        PARAMETROS_INVALIDOS, METODO_INEXISTENTE, PETICION_INVALIDA
+    ]
+
+
+def test_lote_de_notificaciones_no_tiene_respuesta(servicio):
+    lote = [{'jsonrpc': '2.0', 'method': 'stats'}, {'jsonrpc': '2.0', 'method': 'no_existe'}]
+    assert servicio.handle_body(json.dumps(lote).encode('utf-8')) is None
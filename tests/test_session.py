@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from logic.prompt_generator import PromptGenerator
+from logic.rule_store import DATA_DIR, RuleStore
+from logic.session import CategoryCatalog, Session
+
+
+@pytest.fixture(scope='module')
+def store():
+    return RuleStore(DATA_DIR, use_cache=False)
+
+
+def mismo_estado(session, generador):
+    assert session.generate_prompt() == generador.generate_prompt()
+    assert list(session.category_values.items()) == list(generador.category_values.items())
+    assert session.categorias_temporalmente_bloqueadas == generador.categorias_temporalmente_bloqueadas
+    assert session.categorias_bloqueadas == generador.categorias_bloqueadas
+    assert session.blocked_categories == generador.blocked_categories
+
+
+def test_sesion_vacia(store):
+    session = Session(CategoryCatalog.from_generator(PromptGenerator(store)))
+    assert session.generate_prompt() == ''
+    assert session.category_values == {}
+    assert session.get_category_value('ojos') == ''
+
+
+def test_reasignar_y_eliminar_conserva_el_orden(store):
+    session = Session(CategoryCatalog.from_generator(PromptGenerator(store)))
+    generador = PromptGenerator(store)
+    for objetivo in (session, generador):
+        objetivo.set_category_value('fondo', 'beach')
+        objetivo.set_category_value('ojos', 'blue eyes')
+        objetivo.set_category_value('pose_brazos', 'arms up')
+        objetivo.set_category_value('ojos', 'green eyes')
+        objetivo.set_category_blocked('fondo', True)
+    mismo_estado(session, generador)
+    assert session.category_values == {'ojos': 'green eyes', 'pose_brazos': 'arms up'}
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_aleatorio_coincide_con_prompt_generator(store, semilla):
+    rng = random.Random(semilla)
+    referencia = PromptGenerator(store)
+    catalogo = CategoryCatalog.from_generator(referencia)
+    session = Session(catalogo)
+    generador = PromptGenerator(store)
+
+    # Categorías con reglas (conflictos, bloqueos, prioridades) y algunas sin ellas
+    categorias = [
+        'nsfw', 'vestuario_general', 'vestuario_superior', 'vestuario_inferior',
+        'ropa_interior_superior', 'ropa_interior_inferior', 'pose_actitud_global',
+        'pose_brazos', 'pose_piernas', 'ojos', 'fondo', 'calidad_tecnica', 'edad_aparente',
+    ]
+    valores = {
+        'nsfw': ['nsfw', 'explicit', 'suggestive'],
+        'vestuario_general': ['swimwear', 'school uniform'],
+        'pose_actitud_global': ['sitting', 'lying down', 'standing'],
+    }
+
+    for _ in range(60):
+        operacion = rng.random()
+        categoria = rng.choice(categorias)
+        valor = rng.choice(valores.get(categoria, ['a', 'b', '']))
+        bloquear = rng.random() < 0.7
+        for objetivo in (session, generador):
+            if operacion < 0.55:
+                objetivo.set_category_value(categoria, valor)
+                objetivo.aplicar_inferencias(categoria, valor)
+            elif operacion < 0.65:
+                objetivo.set_category_blocked(categoria, bloquear)
+            elif operacion < 0.7:
+                objetivo.bloquear_categoria_permanente(categoria)
+            elif operacion < 0.72:
+                objetivo.clear_all()
+        if rng.random() < 0.5:
+            mismo_estado(session, generador)
+    mismo_estado(session, generador)
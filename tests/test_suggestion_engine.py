@@ -0,0 +1,46 @@
+from collections.abc import Sequence
+
+from logic.rule_store import DATA_DIR, RuleStore
+from logic.suggestion_engine import RankedSuggestions, SuggestionEngine
+
+
+def test_mezcla_por_posicion_y_prioridad_sin_duplicados():
+    ranking = RankedSuggestions([['a', 'b', 'c'], [], ['x', 'a', 'y']])
+    assert list(ranking) == ['a', 'x', 'b', 'c', 'y']
+
+
+def test_se_usa_como_lista():
+    ranking = RankedSuggestions([['a', 'b'], ['c', 'a']])
+    assert isinstance(ranking, Sequence)
+    assert len(ranking) == 3
+    assert ranking[0] == 'a' and ranking[-1] == 'b'
+    assert ranking[:2] == ['a', 'c']
+    assert ranking == ['a', 'c', 'b'] and ranking == ('a', 'c', 'b')
+    assert ranking != ['a', 'b', 'c']
+    assert 'c' in ranking and 'z' not in ranking
+    assert ranking.index('b') == 2
+    assert list(reversed(ranking)) == ['b', 'c', 'a']
+    assert list(ranking) == list(ranking)
+
+
+def test_take_no_calcula_el_resto():
+    ranking = RankedSuggestions([['a', 'b', 'c', 'd']])
+    assert ranking.take(2) == ['a', 'b']
+    assert ranking._lista is None
+    assert len(ranking) == 4
+    assert ranking.take(2) == ['a', 'b']
+
+
+def test_vacia():
+    ranking = RankedSuggestions([[], []])
+    assert not ranking
+    assert len(ranking) == 0 and ranking == []
+
+
+def test_get_suggestions_retorna_secuencias():
+    motor = SuggestionEngine(RuleStore(DATA_DIR, use_cache=False))
+    sugerencias = motor.get_suggestions('vestuario_superior', 'blouse')
+    assert sugerencias
+    for valores in sugerencias.values():
+        assert valores and len(valores) == len(list(valores)) == len(set(valores))
+        assert valores[0] == next(iter(valores))
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from logic.text_index import RuleMatcher
+
+
+def buscar_por_recorrido(claves, texto):
+    """Implementación anterior de get_suggestions: recorrer las claves en ambos sentidos"""
+    texto = texto.lower()
+    return [
+        indice for indice, clave in enumerate(claves)
+        if clave.lower() in texto or texto in clave.lower()
+    ]
+
+
+CLAVES = [
+    'school uniform', 'uniform', 'school', 'sailor uniform', 'form',
+    'Blue Hair', 'hair', 'air', 'ai', 'a',
+    'sukumizu', 'maid', 'maid dress', 'dress', 'ss',
+    'cabello rojo', 'corazón', 'pingüino', 'Ñandú', 'áéíóú',
+    'aaa', 'aa', 'abab', 'bab',
+]
+
+
+@pytest.mark.parametrize('texto', [
+    # Claves que se solapan o se contienen entre sí
+    'school uniform', 'uniform', 'sailor uniform with ribbon', 'ormi', 'maid dress', 'dress',
+    'aaaa', 'ababab', 'bab', 'aba',
+    # Mayúsculas
+    'BLUE HAIR', 'Blue hair', 'School Uniform', 'MAID',
+    # Acentos y caracteres no ASCII
+    'corazón', 'CORAZÓN', 'corazon', 'pingüino', 'ñandú', 'ÑANDÚ', 'áé', 'óú',
+    # Bordes
+    'a', 'x', 'zzz', ' ',
+])
+def test_coincide_con_el_recorrido(texto):
+    assert RuleMatcher(CLAVES).buscar(texto) == buscar_por_recorrido(CLAVES, texto)
+
+
+def test_texto_vacio_coincide_con_todas_las_claves():
+    assert RuleMatcher(CLAVES).buscar('') == buscar_por_recorrido(CLAVES, '') == list(range(len(CLAVES)))
+
+
+def test_sin_claves():
+    assert RuleMatcher([]).buscar('school uniform') == []
+    assert RuleMatcher([]).buscar('') == []
+
+
+def test_clave_vacia_coincide_siempre():
+    claves = ['', 'hair']
+    for texto in ('', 'hair', 'blue hair', 'x'):
+        assert RuleMatcher(claves).buscar(texto) == buscar_por_recorrido(claves, texto)
+
+
+def test_aleatorio_coincide_con_el_recorrido():
+    rng = random.Random(5)
+    alfabeto = 'abAB ñÑ'
+    for _ in range(200):
+        claves = [
+            ''.join(rng.choice(alfabeto) for _ in range(rng.randint(1, 6)))
+            for _ in range(rng.randint(1, 15))
+        ]
+        matcher = RuleMatcher(claves)
+        for _ in range(20):
+            texto = ''.join(rng.choice(alfabeto) for _ in range(rng.randint(0, 8)))
+            assert matcher.buscar(texto) == buscar_por_recorrido(claves, texto), (claves, texto)
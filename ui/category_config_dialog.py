@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from .theme import set_state
 
 class CategoryConfigDialog(QDialog):
     def __init__(self, all_categories, hidden_categories, disabled_categories, parent=None):
@@ -18,45 +19,8 @@ class CategoryConfigDialog(QDialog):
         self.setModal(True)
         self.resize(800, 600)
         
-        # Estilo general del diálogo
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QLineEdit {
-                background-color: #3c3c3c;
-                border: 2px solid #555555;
-                border-radius: 6px;
-                padding: 8px;
-                color: #ffffff;
-                font-size: 9pt;
-            }
-            QLineEdit:focus {
-                border-color: #8B5CF6;
-            }
-            QScrollArea {
-                background-color: #2b2b2b;
-                border: 1px solid #555555;
-                border-radius: 6px;
-            }
-            QScrollBar:vertical {
-                background-color: #3c3c3c;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #666666;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #777777;
-            }
-        """)
+        # Estilo del tema (ui/theme.py)
+        self.setObjectName("categoryConfigDialog")
         
         layout = QVBoxLayout(self)
         layout.setSpacing(8)  # Reducido de 12 a 8
@@ -64,8 +28,8 @@ class CategoryConfigDialog(QDialog):
         
         # Instrucciones (sin título grande)
         instructions = QLabel("🔧 Personaliza la visibilidad y estado de las categorías:")
+        instructions.setObjectName("configInstructions")
         instructions.setFont(QFont("Segoe UI", 10))  # Ligeramente más grande
-        instructions.setStyleSheet("color: #cccccc; margin-bottom: 10px;")
         layout.addWidget(instructions)
         
         # Campo de filtro/búsqueda
@@ -74,7 +38,6 @@ class CategoryConfigDialog(QDialog):
         
         filter_label = QLabel("🔍 Filtrar:")
         filter_label.setFont(QFont("Segoe UI", 9))
-        filter_label.setStyleSheet("color: #ffffff;")
         filter_layout.addWidget(filter_label)
         
         self.filter_input = QLineEdit()
@@ -108,35 +71,7 @@ class CategoryConfigDialog(QDialog):
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
         )
-        buttons.setStyleSheet("""
-            QDialogButtonBox {
-                background-color: transparent;
-            }
-            QPushButton {
-                background-color: #4a4a4a;
-                color: #ffffff;
-                border: 1px solid #666666;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 9pt;
-                font-weight: 500;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #5a5a5a;
-                border-color: #777777;
-            }
-            QPushButton:pressed {
-                background-color: #3a3a3a;
-            }
-            QPushButton:default {
-                background-color: #8B5CF6;
-                border-color: #8B5CF6;
-            }
-            QPushButton:default:hover {
-                background-color: #7C3AED;
-            }
-        """)
+        buttons.setObjectName("configButtons")
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
@@ -173,26 +108,15 @@ class CategoryConfigDialog(QDialog):
         # Contenedor más compacto para cada categoría
         category_container = QFrame()
         category_container.setFixedSize(240, 65)
-        category_container.setStyleSheet("""
-            QFrame {
-                background-color: #3c3c3c;
-                border: 1px solid #555555;
-                border-radius: 6px;
-                padding: 2px;
-            }
-            QFrame:hover {
-                background-color: #404040;
-                border-color: #666666;
-            }
-        """)
+        category_container.setObjectName("configCategory")
         category_layout = QVBoxLayout(category_container)
         category_layout.setSpacing(2)
         category_layout.setContentsMargins(6, 3, 6, 3)
         
         # Nombre de la categoría más compacto
         category_name = QLabel(category.replace('_', ' ').title())
+        category_name.setObjectName("configCategoryName")
         category_name.setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
-        category_name.setStyleSheet("color: #ffffff; margin: 0px; padding: 0px;")
         category_name.setWordWrap(True)
         category_name.setMaximumHeight(16)
         category_layout.addWidget(category_name)
@@ -209,42 +133,16 @@ class CategoryConfigDialog(QDialog):
         
         # Título pequeño para ocultar
         hide_label = QLabel("Ocultar")
+        hide_label.setObjectName("configHideLabel")
         hide_label.setFont(QFont("Segoe UI", 7))
-        hide_label.setStyleSheet("color: #ff6b6b; margin: 0px; padding: 0px;")
         hide_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         hide_container.addWidget(hide_label)
         
         # Checkbox para ocultar
         hide_checkbox = QCheckBox("🙈")
+        hide_checkbox.setObjectName("configHideCheck")
         hide_checkbox.setToolTip("Ocultar categoría")
         hide_checkbox.setChecked(category in self.hidden_categories)
-        hide_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #ff6b6b;
-                font-weight: 500;
-                font-size: 8pt;
-                spacing: 2px;
-                margin: 0px;
-                padding: 0px;
-            }
-            QCheckBox::indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 2px;
-                border: 2px solid #ff6b6b;
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #ff6b6b;
-                border-color: #ff6b6b;
-            }
-            QCheckBox::indicator:checked:hover {
-                background-color: #ff5252;
-            }
-            QCheckBox::indicator:hover {
-                border-color: #ff5252;
-            }
-        """)
         self.hide_checkboxes[category] = hide_checkbox
         hide_container.addWidget(hide_checkbox)
         
@@ -260,42 +158,16 @@ class CategoryConfigDialog(QDialog):
         
         # Título pequeño para deshabilitar
         disable_label = QLabel("Deshabilitar")
+        disable_label.setObjectName("configDisableLabel")
         disable_label.setFont(QFont("Segoe UI", 7))
-        disable_label.setStyleSheet("color: #ffa726; margin: 0px; padding: 0px;")
         disable_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         disable_container.addWidget(disable_label)
         
         # Checkbox para deshabilitar
         disable_checkbox = QCheckBox("🚫")
+        disable_checkbox.setObjectName("configDisableCheck")
         disable_checkbox.setToolTip("Deshabilitar categoría")
         disable_checkbox.setChecked(category in self.disabled_categories)
-        disable_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #ffa726;
-                font-weight: 500;
-                font-size: 8pt;
-                spacing: 2px;
-                margin: 0px;
-                padding: 0px;
-            }
-            QCheckBox::indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 2px;
-                border: 2px solid #ffa726;
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #ffa726;
-                border-color: #ffa726;
-            }
-            QCheckBox::indicator:checked:hover {
-                background-color: #ff9800;
-            }
-            QCheckBox::indicator:hover {
-                border-color: #ff9800;
-            }
-        """)
         self.disable_checkboxes[category] = disable_checkbox
         disable_container.addWidget(disable_checkbox)
         
@@ -308,64 +180,19 @@ class CategoryConfigDialog(QDialog):
         category_layout.addLayout(checkboxes_layout)
         
         # Lógica: si está oculta, no puede estar deshabilitada
+        # (el aspecto atenuado lo dan :disabled y la propiedad "inactive" del tema)
         def on_hide_changed(checked, disable_cb=disable_checkbox, disable_lbl=disable_label):
             if checked:
                 disable_cb.setChecked(False)
-                disable_cb.setEnabled(False)
-                disable_lbl.setStyleSheet("color: #666666; margin: 0px; padding: 0px;")
-                disable_cb.setStyleSheet(disable_cb.styleSheet() + """
-                    QCheckBox {
-                        color: #666666;
-                    }
-                    QCheckBox::indicator {
-                        border-color: #666666;
-                    }
-                """)
-            else:
-                disable_cb.setEnabled(True)
-                disable_lbl.setStyleSheet("color: #ffa726; margin: 0px; padding: 0px;")
-                disable_cb.setStyleSheet("""
-                    QCheckBox {
-                        color: #ffa726;
-                        font-weight: 500;
-                        font-size: 8pt;
-                        spacing: 2px;
-                        margin: 0px;
-                        padding: 0px;
-                    }
-                    QCheckBox::indicator {
-                        width: 12px;
-                        height: 12px;
-                        border-radius: 2px;
-                        border: 2px solid #ffa726;
-                        background-color: transparent;
-                    }
-                    QCheckBox::indicator:checked {
-                        background-color: #ffa726;
-                        border-color: #ffa726;
-                    }
-                    QCheckBox::indicator:checked:hover {
-                        background-color: #ff9800;
-                    }
-                    QCheckBox::indicator:hover {
-                        border-color: #ff9800;
-                    }
-                """)
+            disable_cb.setEnabled(not checked)
+            set_state(disable_lbl, "inactive", checked)
         
         hide_checkbox.toggled.connect(on_hide_changed)
         
         # Aplicar estado inicial
         if hide_checkbox.isChecked():
             disable_checkbox.setEnabled(False)
-            disable_label.setStyleSheet("color: #666666; margin: 0px; padding: 0px;")
-            disable_checkbox.setStyleSheet(disable_checkbox.styleSheet() + """
-                QCheckBox {
-                    color: #666666;
-                }
-                QCheckBox::indicator {
-                    border-color: #666666;
-                }
-            """)
+            disable_label.setProperty("inactive", True)
         
         return category_container
     
@@ -1,5 +1,8 @@
 import json
 import os
+from logic.rule_store import DATA_DIR, get_rule_store
+
+UI_CONFIG_FILE = 'ui_config.json'
 
 class CategoryData:
     """Clase para manejar los datos de categorías (ocultas, deshabilitadas, relaciones)"""
@@ -14,12 +17,11 @@ class CategoryData:
     def load_categories(self):
         """Carga las categorías ocultas y deshabilitadas desde el archivo de configuración"""
         try:
-            config_path = os.path.join('data', 'ui_config.json')
+            config_path = os.path.join(DATA_DIR, UI_CONFIG_FILE)
             if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.hidden_categories = set(config.get('hidden_categories', []))
-                    self.disabled_categories = set(config.get('disabled_categories', []))
+                config = get_rule_store().load(UI_CONFIG_FILE)
+                self.hidden_categories = set(config.get('hidden_categories', []))
+                self.disabled_categories = set(config.get('disabled_categories', []))
         except Exception as e:
             print(f"Error cargando categorías: {e}")
             self.hidden_categories = set()
@@ -28,8 +30,8 @@ class CategoryData:
     def save_categories(self, hidden_categories, disabled_categories):
         """Guarda las categorías ocultas y deshabilitadas en el archivo de configuración"""
         try:
-            config_path = os.path.join('data', 'ui_config.json')
-            os.makedirs('data', exist_ok=True)
+            config_path = os.path.join(DATA_DIR, UI_CONFIG_FILE)
+            os.makedirs(DATA_DIR, exist_ok=True)
             
             config = {}
             if os.path.exists(config_path):
@@ -41,6 +43,8 @@ class CategoryData:
             
             with open(config_path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
+            # Refrescar la copia compartida (y la caché binaria) con lo guardado
+            get_rule_store().reload(UI_CONFIG_FILE)
                 
             # Actualizar los sets locales
             self.hidden_categories = hidden_categories.copy()
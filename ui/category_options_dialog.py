@@ -0,0 +1,218 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QFrame, QLineEdit, QListView,
+    QStyledItemDelegate, QStyle, QApplication
+)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRectF, QTimer
+from PyQt6.QtGui import QFont, QColor, QPen
+from logic.text_index import OptionIndex
+
+
+class OptionListModel(QAbstractListModel):
+    """Modelo de solo lectura sobre la lista de opciones, con filtro por índice.
+
+    No crea ningún objeto por opción: la vista solo pide el texto de las
+    filas visibles.
+    """
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.option_index = index
+        self._filas = None  # None = todas las opciones, en orden
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.option_index) if self._filas is None else len(self._filas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self.option_at(index.row())
+        return None
+
+    def option_at(self, row):
+        """Texto de la opción mostrada en una fila"""
+        if self._filas is not None:
+            row = self._filas[row]
+        return self.option_index.opciones[row]
+
+    def set_filter(self, texto):
+        """Muestra solo las opciones que contienen el texto"""
+        self.beginResetModel()
+        self._filas = self.option_index.buscar(texto) if texto else None
+        self.endResetModel()
+
+
+class OptionDelegate(QStyledItemDelegate):
+    """Dibuja cada opción como una etiqueta redondeada, sin widgets por fila"""
+
+    ALTO = 22
+    FONDO = QColor('#606060')
+    FONDO_HOVER = QColor('#707070')
+    BORDE = QColor('#777777')
+    BORDE_HOVER = QColor('#00cc88')
+    TEXTO = QColor('#ffffff')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Segoe UI", 8)
+
+    def paint(self, painter, option, index):
+        hover = bool(option.state & (QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Selected))
+        rect = QRectF(option.rect).adjusted(1.5, 1.5, -1.5, -1.5)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.BORDE_HOVER if hover else self.BORDE, 1))
+        painter.setBrush(self.FONDO_HOVER if hover else self.FONDO)
+        painter.drawRoundedRect(rect, 3, 3)
+
+        painter.setFont(self.font)
+        painter.setPen(self.TEXTO)
+        texto_rect = rect.adjusted(6, 0, -6, 0)
+        texto = painter.fontMetrics().elidedText(
+            index.data(), Qt.TextElideMode.ElideRight, int(texto_rect.width())
+        )
+        painter.drawText(texto_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, texto)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ALTO)
+
+
+class CategoryOptionsDialog(QDialog):
+    """Ventana simple para mostrar opciones de categoría.
+
+    Usa una vista virtualizada (QListView + modelo + delegado), así que abrir
+    o filtrar cuesta lo mismo con 10 opciones que con 100.000.
+    """
+    def __init__(self, category, options, parent=None, index=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setModal(True)  # Hacer la ventana modal
+        self.option_index = index if index is not None else OptionIndex(options)
+        self.init_ui(category, len(self.option_index))
+
+    def init_ui(self, category, num_options):
+        # Calcular dimensiones dinámicas basadas en cantidad de opciones
+        if num_options <= 10:
+            columns = 1
+            width = 250
+            height = min(300, num_options * 25 + 110)
+        elif num_options <= 30:
+            columns = 2
+            width = 400
+            height = min(400, (num_options // 2 + 1) * 25 + 110)
+        else:
+            columns = 3
+            width = 550
+            height = min(500, (num_options // 3 + 1) * 25 + 110)
+
+        self.setFixedSize(width, height)
+
+        # Layout principal
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Contenedor principal con estilo
+        self.main_container = main_container = QFrame()
+        main_container.setObjectName("optionsContainer")
+        container_layout = QVBoxLayout(main_container)
+        container_layout.setSpacing(4)
+        container_layout.setContentsMargins(8, 8, 8, 8)
+
+        # Título pequeño
+        self.title = QLabel()
+        self.title.setObjectName("optionsTitle")
+        self.title.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        container_layout.addWidget(self.title)
+        self._category_title = category.replace('_', ' ').title()
+
+        # Filtro instantáneo
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar opciones...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setObjectName("optionsFilter")
+        self.filter_edit.textChanged.connect(self.apply_filter)
+        self.filter_edit.returnPressed.connect(self.accept_first)
+        container_layout.addWidget(self.filter_edit)
+
+        # Lista virtualizada de opciones en varias columnas
+        self.model = OptionListModel(self.option_index, self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(OptionDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFlow(QListView.Flow.LeftToRight)
+        self.list_view.setWrapping(True)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.list_view.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.list_view.setObjectName("optionsList")
+        # Ancho de celda fijo para repartir las opciones en columnas iguales
+        cell_width = (width - 16 - 12 - self.list_view.verticalScrollBar().sizeHint().width()) // columns
+        self.list_view.setGridSize(QSize(cell_width, OptionDelegate.ALTO))
+        self.list_view.clicked.connect(lambda index: self.option_clicked(self.model.option_at(index.row())))
+        container_layout.addWidget(self.list_view)
+
+        # Nota informativa
+        info_label = QLabel("💡 Click en una opción para copiarla")
+        info_label.setObjectName("optionsInfo")
+        info_label.setFont(QFont("Segoe UI", 7))
+        info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        container_layout.addWidget(info_label)
+
+        layout.addWidget(main_container)
+        self._update_title()
+        self.filter_edit.setFocus()
+
+        # Preparar el índice de filtrado después de pintar la ventana
+        QTimer.singleShot(0, self.option_index.preparar)
+
+    def _update_title(self):
+        total = len(self.option_index)
+        shown = self.model.rowCount()
+        count = f"{shown}/{total}" if shown != total else f"{total}"
+        self.title.setText(f"Opciones para: {self._category_title} ({count})")
+
+    def apply_filter(self, text):
+        """Filtra las opciones mientras se escribe"""
+        self.model.set_filter(text.strip())
+        self.list_view.scrollToTop()
+        self._update_title()
+
+    def accept_first(self):
+        """Enter copia la primera opción visible"""
+        if self.model.rowCount():
+            self.option_clicked(self.model.option_at(0))
+
+    def option_clicked(self, option):
+        """Copia la opción al portapapeles y cierra el diálogo"""
+        clipboard = QApplication.clipboard()
+        clipboard.setText(option)
+        self.close()
+
+    def mousePressEvent(self, event):
+        """Cerrar solo si el click es fuera del contenido principal"""
+        # Obtener la posición del click relativa a este widget
+        click_pos = event.pos()
+
+        # Verificar si el click está dentro del área del contenido principal
+        if not self.main_container.geometry().contains(click_pos):
+            self.close()
+
+    def keyPressEvent(self, event):
+        """Cerrar con Escape"""
+        if event.key() == Qt.Key.Key_Escape:
+            self.close()
+        super().keyPressEvent(event)
+
+    def focusOutEvent(self, event):
+        """Cerrar cuando la ventana pierde el foco"""
+        self.close()
+        super().focusOutEvent(event)
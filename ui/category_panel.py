@@ -7,6 +7,9 @@ from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont
 from .category_config_dialog import CategoryConfigDialog
 from .category_data import CategoryData
+from .category_options_dialog import CategoryOptionsDialog
+from .completion_model import CompletionModel
+from .flow_layout import FlowLayout
 
 class CategoryPanel(QWidget):
     category_changed = pyqtSignal(str, str)
@@ -19,6 +22,7 @@ class CategoryPanel(QWidget):
         self.category_states = {}
         self.selected_categories = set()
         self.category_inputs = {}  # Diccionario para almacenar los inputs
+        self.completion_models = {}  # Un modelo por categoría, reutilizado entre inputs
         
         # Usar la clase CategoryData para manejar datos
         self.category_data = CategoryData()
@@ -34,13 +38,7 @@ class CategoryPanel(QWidget):
         
         # Sección de categorías
         category_section = QFrame()
-        category_section.setStyleSheet("""
-            QFrame {
-                background-color: #3c3c3c;
-                border: 1px solid #555555;
-                border-radius: 6px;
-            }
-        """)
+        category_section.setObjectName("panelSection")
         category_layout = QVBoxLayout(category_section)
         category_layout.setSpacing(4)
         category_layout.setContentsMargins(10, 6, 10, 8)
@@ -49,43 +47,28 @@ class CategoryPanel(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("Categorías")
+        title.setObjectName("sectionTitle")
         title.setFont(QFont("Segoe UI", 9))
-        title.setStyleSheet("color: #cccccc; margin-bottom: 2px;")
         header_layout.addWidget(title)
         
         config_button = QPushButton("⚙️ Configurar")
+        config_button.setObjectName("configButton")
         config_button.setMaximumSize(80, 24)
-        config_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4a4a4a;
-                color: #cccccc;
-                border: 1px solid #666666;
-                border-radius: 4px;
-                padding: 2px 6px;
-                font-size: 8pt;
-            }
-            QPushButton:hover {
-                background-color: #5a5a5a;
-            }
-            QPushButton:pressed {
-                background-color: #3a3a3a;
-            }
-        """)
         config_button.clicked.connect(self.show_category_config)
         header_layout.addWidget(config_button)
         
         category_layout.addLayout(header_layout)
         
-        # Contenedor para botones
+        # Contenedor para botones: filas que se ajustan al ancho real
         self.categories_container = QWidget()
-        self.categories_layout = QVBoxLayout(self.categories_container)
-        self.categories_layout.setSpacing(8)
+        self.categories_layout = FlowLayout(self.categories_container, h_spacing=6, v_spacing=8)
         self.categories_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.recreate_category_buttons()
+        self.update_category_buttons()
         
         # Scroll para las categorías
         categories_scroll = QScrollArea()
+        categories_scroll.setObjectName("sectionScroll")
         categories_scroll.setWidget(self.categories_container)
         categories_scroll.setWidgetResizable(True)
         categories_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -97,21 +80,15 @@ class CategoryPanel(QWidget):
         
         # Sección de input inteligente
         self.input_section = QFrame()
-        self.input_section.setStyleSheet("""
-            QFrame {
-                background-color: #3c3c3c;
-                border: 1px solid #555555;
-                border-radius: 6px;
-            }
-        """)
+        self.input_section.setObjectName("panelSection")
         self.input_layout = QVBoxLayout(self.input_section)
         self.input_layout.setSpacing(4)
         self.input_layout.setContentsMargins(10, 6, 10, 8)
         
         # Título del input
         self.input_title = QLabel("Selecciona una categoría para comenzar")
+        self.input_title.setObjectName("sectionTitle")
         self.input_title.setFont(QFont("Segoe UI", 9))
-        self.input_title.setStyleSheet("color: #cccccc; margin-bottom: 2px;")
         self.input_layout.addWidget(self.input_title)
         
         # Contenedor para inputs dinámicos con QGridLayout desde el inicio
@@ -122,6 +99,7 @@ class CategoryPanel(QWidget):
         
         # Scroll para los inputs
         inputs_scroll = QScrollArea()
+        inputs_scroll.setObjectName("sectionScroll")
         inputs_scroll.setWidget(self.inputs_container)
         inputs_scroll.setWidgetResizable(True)
         inputs_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -134,113 +112,62 @@ class CategoryPanel(QWidget):
         # Inicialmente ocultar la sección de input
         self.input_section.hide()
 
-    def recreate_category_buttons(self):
-        """Recrea todos los botones de categoría con layout tipo ladrillos"""
-        # Limpiar botones existentes
-        for i in reversed(range(self.categories_layout.count())):
-            child = self.categories_layout.takeAt(i)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        self.category_buttons.clear()
-        
-        # Obtener categorías visibles
-        visible_categories = [
-            cat for cat in self.prompt_generator.categories.keys() 
-            if cat not in self.hidden_categories
-        ]
-        
-        if not visible_categories:
-            return
-        
-        # Crear layout tipo ladrillos
-        main_container = QWidget()
-        main_layout = QVBoxLayout(main_container)
-        main_layout.setSpacing(8)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        
-        current_row_layout = QHBoxLayout()
-        current_row_layout.setSpacing(6)
-        current_row_layout.setContentsMargins(0, 0, 0, 0)
-        
-        current_row_widget = QWidget()
-        current_row_widget.setLayout(current_row_layout)
-        
-        container_width = 1200
-        current_width = 0
-        
-        for category in visible_categories:
-            button = QPushButton(category.replace('_', ' ').title())
-            
-            is_disabled = category in self.disabled_categories
-            
-            if is_disabled:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #6B7280;
-                        color: #9CA3AF;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 10px;
-                        font-weight: 500;
-                        margin: 0px;
-                    }
-                """)
-                button.setEnabled(False)
+    def update_category_buttons(self):
+        """Sincroniza los botones de categoría con la configuración actual.
+        
+        Solo se crean o destruyen los botones de categorías añadidas o
+        eliminadas; ocultar, mostrar o deshabilitar cambia el botón existente.
+        """
+        categories = list(self.prompt_generator.categories.keys())
+        
+        # Con el contenedor oculto, mostrar botones no recoloca las filas cada
+        # vez: se recolocan una sola vez al volver a mostrarlo
+        container = self.categories_container
+        batch = container.isVisible()
+        if batch:
+            container.hide()
+        
+        # Eliminar botones de categorías que ya no existen
+        for category in set(self.category_buttons) - set(categories):
+            button = self.category_buttons.pop(category)
+            self.categories_layout.removeWidget(button)
+            button.deleteLater()
+        
+        for position, category in enumerate(categories):
+            is_hidden = category in self.hidden_categories
+            button = self.category_buttons.get(category)
+            if button is None:
+                button = self._create_category_button(category)
+                if is_hidden:
+                    button.hide()
+                self.categories_layout.insertWidget(position, button)
+                self.category_buttons[category] = button
             else:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #8B5CF6;
-                        color: white;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 10px;
-                        font-weight: 500;
-                        margin: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #7C3AED;
-                    }
-                    QPushButton:pressed {
-                        background-color: #6D28D9;
-                    }
-                    QPushButton:checked {
-                        background-color: #059669;
-                    }
-                """)
-                button.setCheckable(True)
-            
-            button.adjustSize()
-            button_width = button.sizeHint().width() + 6
+                button.setVisible(not is_hidden)
             
-            if current_width + button_width > container_width and current_row_layout.count() > 0:
-                current_row_layout.addStretch()
-                main_layout.addWidget(current_row_widget)
-                
-                current_row_layout = QHBoxLayout()
-                current_row_layout.setSpacing(6)
-                current_row_layout.setContentsMargins(0, 0, 0, 0)
-                
-                current_row_widget = QWidget()
-                current_row_widget.setLayout(current_row_layout)
-                current_width = 0
-            
-            current_row_layout.addWidget(button)
-            current_width += button_width
-            
-            if not is_disabled:
-                button.clicked.connect(lambda checked, cat=category: self.on_category_selected(cat))
-            
-            self.category_buttons[category] = button
-        
-        if current_row_layout.count() > 0:
-            current_row_layout.addStretch()
-            main_layout.addWidget(current_row_widget)
+            self._set_button_disabled(category, button, category in self.disabled_categories)
         
-        main_layout.addStretch()
-        self.categories_layout.addWidget(main_container)
+        if batch:
+            container.show()
+    
+    def _create_category_button(self, category):
+        button = QPushButton(category.replace('_', ' ').title())
+        # Estilo del tema: seleccionada = :checked, deshabilitada = :disabled
+        button.setObjectName("categoryButton")
+        button.setCheckable(True)
+        button.clicked.connect(lambda checked, cat=category: self.on_category_selected(cat))
+        return button
+    
+    def _set_button_disabled(self, category, button, is_disabled):
+        """Una categoría deshabilitada no se puede marcar; si lo estaba, se desmarca
+        igual que a mano (sin input ni valor)"""
+        if is_disabled:
+            button.setChecked(False)
+            if category in self.selected_categories:
+                self._deselect_category(category)
+                self._update_input_section()
+        button.setCheckable(not is_disabled)
+        button.setEnabled(not is_disabled)
 
     def on_category_selected(self, category):
         """Maneja la selección de una categoría"""
@@ -258,11 +185,17 @@ class CategoryPanel(QWidget):
             # Emitir señal para sugerencias
             self.suggestion_requested.emit(category, '')
         else:
-            self.selected_categories.discard(category)
-            self.remove_category_input(category)
-            self.category_changed.emit(category, 'deselected')
+            self._deselect_category(category)
             
-        # Mostrar/ocultar sección de input según si hay categorías seleccionadas
+        self._update_input_section()
+    
+    def _deselect_category(self, category):
+        self.selected_categories.discard(category)
+        self.remove_category_input(category)
+        self.category_changed.emit(category, 'deselected')
+    
+    def _update_input_section(self):
+        """Muestra u oculta la sección de input según si hay categorías seleccionadas"""
         if self.selected_categories:
             self.input_section.show()
             self.input_title.setText(f"Configurar categorías seleccionadas ({len(self.selected_categories)})")
@@ -276,15 +209,8 @@ class CategoryPanel(QWidget):
             
         # Contenedor para esta categoría (más compacto)
         category_container = QFrame()
+        category_container.setObjectName("categoryInput")
         category_container.setFixedSize(280, 70)  # Tamaño fijo más compacto
-        category_container.setStyleSheet("""
-            QFrame {
-                background-color: #505050;
-                border: 1px solid #666666;
-                border-radius: 4px;
-                padding: 2px;
-            }
-        """)
         
         container_layout = QVBoxLayout(category_container)
         container_layout.setSpacing(2)
@@ -292,8 +218,8 @@ class CategoryPanel(QWidget):
         
         # Etiqueta de la categoría (más compacta)
         category_label = QLabel(category.replace('_', ' ').title())
+        category_label.setObjectName("categoryInputLabel")
         category_label.setFont(QFont("Segoe UI", 7, QFont.Weight.Bold))
-        category_label.setStyleSheet("color: #00cc88; margin: 0px; padding: 0px;")
         category_label.setMaximumHeight(12)
         container_layout.addWidget(category_label)
         
@@ -305,41 +231,13 @@ class CategoryPanel(QWidget):
         # Input con autocompletado (más compacto)
         line_edit = QLineEdit()
         line_edit.setPlaceholderText(f"Valor para {category.replace('_', ' ')[:15]}...")
+        line_edit.setObjectName("categoryInputEdit")
         line_edit.setMaximumHeight(25)
-        line_edit.setStyleSheet("""
-            QLineEdit {
-                background-color: #606060;
-                border: 1px solid #777777;
-                border-radius: 3px;
-                padding: 3px 4px;
-                color: #ffffff;
-                font-size: 8pt;
-            }
-            QLineEdit:focus {
-                border-color: #00cc88;
-            }
-        """)
         
         # Botón pequeño para mostrar opciones
         options_btn = QPushButton("📋")
+        options_btn.setObjectName("optionsButton")
         options_btn.setFixedSize(25, 25)
-        options_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4a4a4a;
-                border: 1px solid #666666;
-                border-radius: 3px;
-                color: #ffffff;
-                font-size: 10pt;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                background-color: #5a5a5a;
-                border-color: #00cc88;
-            }
-            QPushButton:pressed {
-                background-color: #3a3a3a;
-            }
-        """)
         options_btn.setToolTip(f"Ver todas las opciones para {category.replace('_', ' ')}")
         options_btn.clicked.connect(lambda: self.show_category_options(category))
         
@@ -350,10 +248,14 @@ class CategoryPanel(QWidget):
         # Configurar autocompletado
         options = self.prompt_generator.get_category_options(category)
         if options:
-            completer = QCompleter(options)
+            # El modelo ya entrega las opciones filtradas y ordenadas
+            model = self.get_completion_model(category)
+            completer = QCompleter(model, line_edit)
             completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-            completer.setFilterMode(Qt.MatchFlag.MatchContains)
+            completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+            completer.activated.connect(model.register_use)
             line_edit.setCompleter(completer)
+            line_edit.textEdited.connect(lambda text, c=completer: self.update_completions(c, text))
         
         # Conectar eventos
         line_edit.textChanged.connect(lambda text, cat=category: self.on_input_changed(cat, text))
@@ -371,6 +273,23 @@ class CategoryPanel(QWidget):
         # Agregar directamente al grid
         self.add_input_to_grid(category_container)
         
+    def get_completion_model(self, category):
+        """Modelo de autocompletado compartido de una categoría"""
+        index = self.prompt_generator.get_completion_index(category)
+        model = self.completion_models.get(category)
+        if model is None or model.completion_index is not index:
+            model = CompletionModel(index, parent=self)
+            self.completion_models[category] = model
+        return model
+        
+    def update_completions(self, completer, text):
+        """Actualiza las sugerencias del autocompletado mientras se escribe"""
+        completer.model().set_query(text)
+        if completer.model().rowCount():
+            completer.complete()
+        else:
+            completer.popup().hide()
+        
     def show_category_options(self, category):
         """Muestra una ventana con todas las opciones de la categoría"""
         options = self.prompt_generator.get_category_options(category)
@@ -378,7 +297,9 @@ class CategoryPanel(QWidget):
             return
             
         # Crear y mostrar el diálogo
-        dialog = CategoryOptionsDialog(category, options, self)
+        dialog = CategoryOptionsDialog(
+            category, options, self, index=self.prompt_generator.get_option_index(category)
+        )
         
         # Posicionar cerca del botón que se presionó
         if category in self.category_inputs:
@@ -478,153 +399,4 @@ class CategoryPanel(QWidget):
             self.hidden_categories = dialog.get_hidden_categories()
             self.disabled_categories = dialog.get_disabled_categories()
             self.category_data.save_categories(self.hidden_categories, self.disabled_categories)
-            self.recreate_category_buttons()
-
-class CategoryOptionsDialog(QDialog):
-    """Ventana simple para mostrar opciones de categoría"""
-    def __init__(self, category, options, parent=None):
-        super().__init__(parent)
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setModal(True)  # Hacer la ventana modal
-        self.init_ui(category, options)
-        
-    def init_ui(self, category, options):
-        # Calcular dimensiones dinámicas basadas en cantidad de opciones
-        num_options = len(options)
-        if num_options <= 10:
-            columns = 1
-            width = 250
-            height = min(300, num_options * 25 + 80)
-        elif num_options <= 30:
-            columns = 2
-            width = 400
-            height = min(400, (num_options // 2 + 1) * 25 + 80)
-        else:
-            columns = 3
-            width = 550
-            height = min(500, (num_options // 3 + 1) * 25 + 80)
-            
-        self.setFixedSize(width, height)
-        
-        # Layout principal
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Contenedor principal con estilo
-        main_container = QFrame()
-        main_container.setStyleSheet("""
-            QFrame {
-                background-color: #3c3c3c;
-                border: 2px solid #555555;
-                border-radius: 8px;
-            }
-        """)
-        container_layout = QVBoxLayout(main_container)
-        container_layout.setSpacing(4)
-        container_layout.setContentsMargins(8, 8, 8, 8)
-        
-        # Título pequeño
-        title = QLabel(f"Opciones para: {category.replace('_', ' ').title()} ({num_options})")
-        title.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-        title.setStyleSheet("color: #00cc88; margin-bottom: 4px;")
-        container_layout.addWidget(title)
-        
-        # Contenedor con scroll para las opciones
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #505050;
-                border: 1px solid #666666;
-                border-radius: 4px;
-            }
-        """)
-        
-        # Widget contenedor para las opciones en grid
-        options_widget = QWidget()
-        options_layout = QGridLayout(options_widget)
-        options_layout.setSpacing(2)
-        options_layout.setContentsMargins(4, 4, 4, 4)
-        
-        # Añadir opciones al grid en múltiples columnas
-        for i, option in enumerate(options):
-            row = i // columns
-            col = i % columns
-            
-            option_label = QLabel(option)
-            option_label.setStyleSheet("""
-                QLabel {
-                    background-color: #606060;
-                    color: #ffffff;
-                    padding: 3px 6px;
-                    border-radius: 3px;
-                    font-size: 8pt;
-                    border: 1px solid #777777;
-                }
-                QLabel:hover {
-                    background-color: #707070;
-                    border-color: #00cc88;
-                }
-            """)
-            option_label.setWordWrap(True)
-            option_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-            option_label.setMinimumHeight(20)
-            option_label.setMaximumHeight(40)
-            
-            # Hacer clickeable
-            option_label.mousePressEvent = lambda event, opt=option: self.option_clicked(opt)
-            option_label.setCursor(Qt.CursorShape.PointingHandCursor)
-            
-            options_layout.addWidget(option_label, row, col)
-        
-        # Ajustar columnas para que tengan el mismo ancho
-        for col in range(columns):
-            options_layout.setColumnStretch(col, 1)
-            
-        scroll_area.setWidget(options_widget)
-        container_layout.addWidget(scroll_area)
-        
-        # Nota informativa
-        info_label = QLabel("💡 Click en una opción para copiarla")
-        info_label.setFont(QFont("Segoe UI", 7))
-        info_label.setStyleSheet("color: #999999; margin-top: 2px;")
-        info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        container_layout.addWidget(info_label)
-        
-        layout.addWidget(main_container)
-        
-    def option_clicked(self, option):
-        """Copia la opción al portapapeles y cierra el diálogo"""
-        from PyQt6.QtWidgets import QApplication
-        clipboard = QApplication.clipboard()
-        clipboard.setText(option)
-        self.close()
-        
-    def mousePressEvent(self, event):
-        """Cerrar solo si el click es fuera del contenido principal"""
-        # Obtener la posición del click relativa a este widget
-        click_pos = event.pos()
-        
-        # Verificar si el click está dentro del área del contenido principal
-        main_container = self.findChild(QFrame)
-        if main_container:
-            container_rect = main_container.geometry()
-            if not container_rect.contains(click_pos):
-                self.close()
-        else:
-            # Si no se encuentra el contenedor, cerrar
-            self.close()
-        
-    def keyPressEvent(self, event):
-        """Cerrar con Escape"""
-        if event.key() == Qt.Key.Key_Escape:
-            self.close()
-        super().keyPressEvent(event)
-        
-    def focusOutEvent(self, event):
-        """Cerrar cuando la ventana pierde el foco"""
-        self.close()
-        super().focusOutEvent(event)
\ No newline at end of file
+            self.update_category_buttons()
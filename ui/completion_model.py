@@ -0,0 +1,45 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class CompletionModel(QAbstractListModel):
+    """Modelo para QCompleter con las mejores `k` opciones del texto escrito.
+
+    El filtrado y el ranking los hace el índice de la categoría, así que el
+    completer se usa en modo UnfilteredPopupCompletion y nunca recorre la
+    lista completa. Un mismo modelo se reutiliza cada vez que se vuelve a
+    crear el input de su categoría.
+    """
+
+    def __init__(self, index, max_results=20, parent=None):
+        super().__init__(parent)
+        self.completion_index = index
+        self.max_results = max_results
+        self._resultados = []
+        self._consulta = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._resultados)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._resultados[index.row()]
+        return None
+
+    def set_query(self, texto):
+        """Recalcula las sugerencias para el texto escrito"""
+        texto = texto.strip()
+        if texto == self._consulta:
+            return
+        self._consulta = texto
+        self.beginResetModel()
+        self._resultados = self.completion_index.completar(texto, self.max_results) if texto else []
+        self.endResetModel()
+
+    def register_use(self, texto):
+        """Una opción elegida sube en el ranking de su categoría"""
+        self.completion_index.registrar_uso(texto)
+        self._consulta = None
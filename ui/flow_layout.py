@@ -0,0 +1,124 @@
+from PyQt6.QtWidgets import QLayout, QWidgetItem, QSizePolicy, QStyle
+from PyQt6.QtCore import Qt, QRect, QSize, QPoint
+
+
+class FlowLayout(QLayout):
+    """Layout que coloca los widgets en filas y pasa a la siguiente al llegar
+    al ancho real disponible (como texto que se ajusta).
+
+    Los widgets ocultos no ocupan espacio, así que mostrar u ocultar uno solo
+    recoloca las filas, sin recrear nada.
+    """
+
+    def __init__(self, parent=None, h_spacing=-1, v_spacing=-1):
+        super().__init__(parent)
+        self._items = []
+        self._h_spacing = h_spacing
+        self._v_spacing = v_spacing
+
+    def addItem(self, item):
+        self._items.append(item)
+
+    def insertWidget(self, index, widget):
+        """Inserta un widget en la posición `index` del orden de colocación"""
+        self.addChildWidget(widget)
+        self._items.insert(index, QWidgetItem(widget))
+        self.invalidate()
+
+    def count(self):
+        return len(self._items)
+
+    def itemAt(self, index):
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+
+    def takeAt(self, index):
+        if 0 <= index < len(self._items):
+            return self._items.pop(index)
+        return None
+
+    def horizontalSpacing(self):
+        if self._h_spacing >= 0:
+            return self._h_spacing
+        return self._smart_spacing(QStyle.PixelMetric.PM_LayoutHorizontalSpacing)
+
+    def verticalSpacing(self):
+        if self._v_spacing >= 0:
+            return self._v_spacing
+        return self._smart_spacing(QStyle.PixelMetric.PM_LayoutVerticalSpacing)
+
+    def _smart_spacing(self, metric):
+        parent = self.parent()
+        if parent is None:
+            return -1
+        if parent.isWidgetType():
+            return parent.style().pixelMetric(metric, None, parent)
+        return parent.spacing()
+
+    def expandingDirections(self):
+        return Qt.Orientation(0)
+
+    def hasHeightForWidth(self):
+        return True
+
+    def heightForWidth(self, width):
+        return self._do_layout(QRect(0, 0, width, 0), apply=False)
+
+    def setGeometry(self, rect):
+        super().setGeometry(rect)
+        self._do_layout(rect, apply=True)
+
+    def sizeHint(self):
+        return self.minimumSize()
+
+    def minimumSize(self):
+        size = QSize()
+        for item in self._items:
+            if not item.isEmpty():
+                size = size.expandedTo(item.minimumSize())
+        margins = self.contentsMargins()
+        return size + QSize(margins.left() + margins.right(), margins.top() + margins.bottom())
+
+    def _spacings(self):
+        """Separación horizontal y vertical (la del estilo si no se indicó)"""
+        space_x = self.horizontalSpacing()
+        space_y = self.verticalSpacing()
+        if space_x < 0 or space_y < 0:
+            style = self.parentWidget().style() if self.parentWidget() else None
+            policy = QSizePolicy.ControlType.PushButton
+            if space_x < 0:
+                space_x = style.layoutSpacing(policy, policy, Qt.Orientation.Horizontal) if style else 0
+            if space_y < 0:
+                space_y = style.layoutSpacing(policy, policy, Qt.Orientation.Vertical) if style else 0
+        return space_x, space_y
+
+    def _do_layout(self, rect, apply):
+        """Coloca los elementos (si `apply`) y retorna la altura necesaria para `rect.width()`"""
+        margins = self.contentsMargins()
+        area = rect.adjusted(margins.left(), margins.top(), -margins.right(), -margins.bottom())
+        x = area.x()
+        y = area.y()
+        line_height = 0
+        space_x, space_y = self._spacings()
+
+        for item in self._items:
+            # Widgets ocultos: no ocupan lugar en la fila
+            if item.isEmpty():
+                continue
+            hint = item.sizeHint()
+            next_x = x + hint.width() + space_x
+            if next_x - space_x > area.right() + 1 and line_height > 0:
+                # No cabe: empezar una fila nueva
+                x = area.x()
+                y = y + line_height + space_y
+                next_x = x + hint.width() + space_x
+                line_height = 0
+
+            if apply:
+                item.setGeometry(QRect(QPoint(x, y), hint))
+
+            x = next_x
+            line_height = max(line_height, hint.height())
+
+        return y + line_height - rect.y() + margins.bottom()
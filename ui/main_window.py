@@ -3,21 +3,41 @@ from PyQt6.QtWidgets import (
     QLabel, QTextEdit, QPushButton, QSplitter,
     QScrollArea, QFrame, QMessageBox, QApplication
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QScreen
 from .category_panel import CategoryPanel
 from .suggestion_panel import SuggestionPanel
+from .update_scheduler import UpdateScheduler
+from .theme import apply_theme
 from logic.prompt_generator import PromptGenerator
 from logic.suggestion_engine import SuggestionEngine
+from logic.rule_store import get_rule_store
+from logic.rule_watcher import RuleWatcher
 
 class MainWindow(QMainWindow):
+    # Emitida desde el hilo del vigilante; Qt la entrega en el hilo de la interfaz
+    rules_reloaded = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
-        self.prompt_generator = PromptGenerator()
-        self.suggestion_engine = SuggestionEngine()
-        self.init_ui()
+        store = get_rule_store()
+        # En un arranque en frío, la caché de reglas se escribe una sola vez
+        with store.escritura_agrupada():
+            self.prompt_generator = PromptGenerator(store)
+            self.suggestion_engine = SuggestionEngine(store)
+            self.init_ui()
+        # Una acción del usuario -> un solo recálculo por ciclo del bucle de eventos
+        self.update_scheduler = UpdateScheduler(
+            self._refresh_prompt, self.suggestion_panel.request_suggestions, parent=self
+        )
         self.center_window()
         
+        # Recarga en caliente de los archivos de data/
+        self.rules_reloaded.connect(self.on_rules_reloaded)
+        self._emitir_recarga = self.rules_reloaded.emit
+        self.prompt_generator.store.add_listener(self._emitir_recarga)
+        self.rule_watcher = RuleWatcher(self.prompt_generator.store).start()
+        
     def center_window(self):
         """Centra la ventana en la pantalla"""
         screen = QApplication.primaryScreen().geometry()
@@ -31,13 +51,8 @@ class MainWindow(QMainWindow):
         self.setFixedSize(1250, 600)
         self.center_window()
         
-        # Estilo general de la ventana (tema oscuro)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-        """)
+        # Tema oscuro: una sola hoja de estilo para toda la aplicación
+        apply_theme()
         
         # Widget central
         central_widget = QWidget()
@@ -61,38 +76,21 @@ class MainWindow(QMainWindow):
         
         # Panel de prompt generado (derecha)
         prompt_section = QFrame()
-        prompt_section.setStyleSheet("""
-            QFrame {
-                background-color: #3c3c3c;
-                border: 1px solid #555555;
-                border-radius: 6px;
-            }
-        """)
+        prompt_section.setObjectName("panelSection")
         prompt_layout = QVBoxLayout(prompt_section)
         prompt_layout.setSpacing(4)
         prompt_layout.setContentsMargins(10, 6, 10, 8)
         
         # Título del prompt
         prompt_title = QLabel("Prompt Generado")
+        prompt_title.setObjectName("sectionTitle")
         prompt_title.setFont(QFont("Segoe UI", 9))
-        prompt_title.setStyleSheet("color: #cccccc; margin-bottom: 2px;")
         prompt_layout.addWidget(prompt_title)
         
         # Área de texto del prompt
         self.prompt_display = QTextEdit()
         self.prompt_display.setPlaceholderText("El prompt generado aparecerá aquí...")
-        self.prompt_display.setStyleSheet("""
-            QTextEdit {
-                background-color: #505050;
-                border: 1px solid #777777;
-                border-radius: 4px;
-                padding: 8px;
-                color: #ffffff;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 9pt;
-                line-height: 1.4;
-            }
-        """)
+        self.prompt_display.setObjectName("promptDisplay")
         prompt_layout.addWidget(self.prompt_display)
         
         # Botones de acción
@@ -101,59 +99,19 @@ class MainWindow(QMainWindow):
         
         # Botón generar
         generate_btn = QPushButton("Generar Prompt")
-        generate_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #00cc88;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 8pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #00b377;
-            }
-            QPushButton:pressed {
-                background-color: #009966;
-            }
-        """)
+        generate_btn.setObjectName("generateButton")
         generate_btn.clicked.connect(self.generate_prompt)
         button_layout.addWidget(generate_btn)
         
         # Botón copiar
         copy_btn = QPushButton("Copiar")
-        copy_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4a4a4a;
-                color: white;
-                border: 1px solid #666666;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 8pt;
-            }
-            QPushButton:hover {
-                background-color: #5a5a5a;
-            }
-        """)
+        copy_btn.setObjectName("copyButton")
         copy_btn.clicked.connect(self.copy_prompt)
         button_layout.addWidget(copy_btn)
         
         # Botón limpiar
         clear_btn = QPushButton("Limpiar Todo")
-        clear_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #666666;
-                color: white;
-                border: 1px solid #777777;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 8pt;
-            }
-            QPushButton:hover {
-                background-color: #777777;
-            }
-        """)
+        clear_btn.setObjectName("clearButton")
         clear_btn.clicked.connect(self.clear_all)
         button_layout.addWidget(clear_btn)
         
@@ -171,7 +129,7 @@ class MainWindow(QMainWindow):
         # CONEXIONES CORREGIDAS
         self.category_panel.category_changed.connect(self.on_category_changed)
         # Conectar la nueva señal de sugerencias
-        self.category_panel.suggestion_requested.connect(self.suggestion_panel.update_suggestions_tree)
+        self.category_panel.suggestion_requested.connect(self.on_suggestion_requested)
         # Conectar aplicación de sugerencias
         self.suggestion_panel.suggestion_applied.connect(self.on_suggestion_applied)
         # NUEVA CONEXIÓN: Actualizar prompt cuando cambie el contexto
@@ -179,12 +137,36 @@ class MainWindow(QMainWindow):
     def on_category_changed(self, category, value):
         """Se ejecuta cuando cambia el valor de una categoría"""
         # Solo generar el prompt, las sugerencias se manejan por separado
-        self.generate_prompt()
+        self.update_scheduler.mark_dirty()
+        
+    def on_suggestion_requested(self, category, value):
+        """Búsqueda de sugerencias tras una pausa al escribir"""
+        self.update_scheduler.schedule_suggestions(category, value)
+        
+    def on_rules_reloaded(self, name):
+        """Se ejecuta cuando un archivo de reglas cambió en disco"""
+        self.statusBar().showMessage(f"Reglas recargadas: {name}", 5000)
+        # El generador adopta la nueva versión al regenerar el prompt
+        self.update_scheduler.mark_dirty()
+        
+    def closeEvent(self, event):
+        self.rule_watcher.stop()
+        self.update_scheduler.cancel_suggestions()
+        self.suggestion_panel.suggestion_worker.cancel()
+        self.suggestion_panel.suggestion_worker.wait()
+        self.prompt_generator.store.remove_listener(self._emitir_recarga)
+        super().closeEvent(event)
         
     def generate_prompt(self):
-        """Genera y muestra el prompt completo"""
+        """Programa la regeneración del prompt para el próximo ciclo"""
+        self.update_scheduler.mark_dirty()
+        
+    def _refresh_prompt(self):
+        """Genera y muestra el prompt completo (una vez por ciclo, desde el planificador)"""
         prompt = self.prompt_generator.generate_prompt()
-        self.prompt_display.setPlainText(prompt)
+        # Evitar rehacer el layout del texto si el prompt no cambió
+        if prompt != self.prompt_display.toPlainText():
+            self.prompt_display.setPlainText(prompt)
         
     def copy_prompt(self):
         """Copia el prompt al portapapeles"""
@@ -198,6 +180,7 @@ class MainWindow(QMainWindow):
             
     def clear_all(self):
         """Limpia todos los valores"""
+        self.update_scheduler.cancel_suggestions()
         self.prompt_generator.clear_all()
         self.category_panel.refresh_all()
         self.suggestion_panel.clear_suggestions()
@@ -215,11 +198,9 @@ class MainWindow(QMainWindow):
             line_edit = self.category_panel.category_inputs[category]['line_edit']
             line_edit.setText(value)
             
-        # Actualizar el generador
+        # Actualizar el generador (setText ya programó el prompt y las sugerencias)
         self.prompt_generator.set_category_value(category, value)
-        
-        # Actualizar el prompt
-        self.generate_prompt()
+        self.update_scheduler.mark_dirty()
         
         # NUEVA LÍNEA: Mantener las sugerencias visibles
         # Buscar la categoría original que generó las sugerencias
@@ -245,4 +226,5 @@ class MainWindow(QMainWindow):
         
         # Si encontramos una categoría original, actualizar las sugerencias
         if original_category and original_value:
-            self.suggestion_panel.update_suggestions_tree(original_category, original_value)
\ No newline at end of file
+            # Reemplaza la búsqueda que programó setText, sin esperar la pausa de escritura
+            self.update_scheduler.schedule_suggestions(original_category, original_value, debounce=False)
\ No newline at end of file
@@ -0,0 +1,358 @@
+from difflib import SequenceMatcher
+
+from PyQt6.QtWidgets import QTreeView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QPalette
+
+# Rol con la clave de estilo de cada fila (la interpreta SuggestionDelegate)
+STYLE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class SuggestionNode:
+    """Fila del árbol de sugerencias: texto, estilo y datos, sin objetos de Qt.
+
+    `key` identifica la fila entre actualizaciones (por ejemplo
+    ('sugerencia', categoría, valor)); las filas con la misma clave se
+    conservan y solo se actualizan sus datos. Con `loader`, los hijos no se
+    crean hasta que la vista expande el nodo (ver SuggestionTreeModel.fetchMore).
+    """
+
+    __slots__ = ('key', 'text', 'style', 'tooltip', 'payload', 'children', 'loader', 'parent', 'row')
+
+    def __init__(self, key, text, style, tooltip=None, payload=None, children=None, loader=None):
+        self.key = key
+        self.text = text
+        self.style = style
+        self.tooltip = tooltip
+        self.payload = payload
+        self.children = children if children is not None else []
+        self.loader = loader
+        self.parent = None
+        self.row = 0
+
+    def parent_node(self):
+        """Nodo padre, o None si es una fila de primer nivel (como QTreeWidgetItem.parent)"""
+        if self.parent is None or self.parent.key is None:
+            return None
+        return self.parent
+
+    def same_data(self, other):
+        return (self.text, self.style, self.tooltip, self.payload) == (
+            other.text, other.style, other.tooltip, other.payload
+        )
+
+    def copy_data(self, other):
+        self.text = other.text
+        self.style = other.style
+        self.tooltip = other.tooltip
+        self.payload = other.payload
+
+
+class ShowMoreNode(SuggestionNode):
+    """Fila "Mostrar más": al activarla se reemplaza por la siguiente página.
+
+    `next_page()` retorna los nodos de esa página (y, si quedan más, otro
+    ShowMoreNode al final). `restantes` es cuántas sugerencias faltan por
+    mostrar, o None si no se sabe sin calcularlas. La fila se compara por
+    texto y `restantes`, no por `next_page`: cada render crea una función
+    nueva, que se adopta sin emitir dataChanged.
+    """
+
+    __slots__ = ('next_page', 'restantes')
+
+    def __init__(self, key, next_page, restantes=None, text="➕ Mostrar más..."):
+        super().__init__(key, text, 'message')
+        self.next_page = next_page
+        self.restantes = restantes
+
+    def same_data(self, other):
+        return super().same_data(other) and self.restantes == other.restantes
+
+    def copy_data(self, other):
+        super().copy_data(other)
+        self.next_page = other.next_page
+        self.restantes = other.restantes
+
+
+class SuggestionTreeModel(QAbstractItemModel):
+    """Modelo de una columna de sugerencias.
+
+    `set_nodes` compara el árbol nuevo con el actual y emite solo las
+    inserciones, eliminaciones y dataChanged necesarias, así que la vista
+    no se vacía ni parpadea al cambiar las sugerencias. Un índice por clave
+    permite llegar a una fila sin recorrer el árbol.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = SuggestionNode(None, '', None)
+        self._por_clave = {}
+
+    # --- API de QAbstractItemModel ---
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_node = self.node(parent)
+        if column != 0 or not 0 <= row < len(parent_node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, parent_node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        return bool(node.children) or node.loader is not None
+
+    def canFetchMore(self, parent):
+        return self.node(parent).loader is not None
+
+    def fetchMore(self, parent):
+        """Crea los hijos pendientes de un nodo (la vista lo llama al expandirlo)"""
+        node = self.node(parent)
+        loader, node.loader = node.loader, None
+        if loader is None:
+            return
+        children = list(loader())
+        if not children:
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.children = children
+        for row, child in enumerate(children):
+            child.row = row
+            self._adopt(node, child)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.text
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return node.tooltip
+        if role == Qt.ItemDataRole.UserRole:
+            return node.payload
+        if role == STYLE_ROLE:
+            return node.style
+        return None
+
+    def index_of(self, node):
+        """Índice de modelo de un nodo del árbol"""
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    # --- Actualización incremental ---
+
+    def top_level_nodes(self):
+        return self.root.children
+
+    def clear(self):
+        self.set_nodes([])
+
+    def set_nodes(self, nodes):
+        """Reemplaza el contenido por `nodes` con el mínimo de cambios"""
+        self._sync_children(self.root, list(nodes))
+
+    def find(self, key):
+        """Nodo con esa clave, o None (O(1), sin recorrer el árbol)"""
+        return self._por_clave.get(key)
+
+    def update_node(self, node, text=None, style=None):
+        """Cambia el texto o el estilo de una fila existente (emite dataChanged)"""
+        self.update_nodes([(node, text, style)])
+
+    def update_nodes(self, updates):
+        """Aplica varios cambios (nodo, texto, estilo) con un dataChanged por
+        grupo de hermanos, en lugar de uno por fila"""
+        rangos = {}
+        for node, text, style in updates:
+            if text is not None:
+                node.text = text
+            if style is not None:
+                node.style = style
+            parent_node = node.parent
+            first, last = rangos.get(id(parent_node), (node, node))
+            if node.row < first.row:
+                first = node
+            if node.row > last.row:
+                last = node
+            rangos[id(parent_node)] = (first, last)
+        for first, last in rangos.values():
+            self.dataChanged.emit(self.index_of(first), self.index_of(last))
+
+    def show_more(self, node):
+        """Reemplaza un ShowMoreNode por la página siguiente"""
+        parent_node = node.parent
+        parent_index = self.index_of(parent_node)
+        row = node.row
+        new_nodes = list(node.next_page())
+        self.beginRemoveRows(parent_index, row, row)
+        self._forget(node)
+        del parent_node.children[row]
+        self._renumber(parent_node, row)
+        self.endRemoveRows()
+        if new_nodes:
+            self.beginInsertRows(parent_index, row, row + len(new_nodes) - 1)
+            parent_node.children[row:row] = new_nodes
+            for child in new_nodes:
+                self._adopt(parent_node, child)
+            self._renumber(parent_node, row)
+            self.endInsertRows()
+
+    def _sync_children(self, parent_node, new_children):
+        old_children = parent_node.children
+        parent_index = self.index_of(parent_node)
+        matcher = SequenceMatcher(
+            None, [child.key for child in old_children], [child.key for child in new_children], autojunk=False
+        )
+        # De atrás hacia adelante para que las posiciones pendientes sigan siendo válidas
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == 'equal':
+                for old, new in zip(old_children[i1:i2], new_children[j1:j2]):
+                    # Se copia siempre (p. ej. la función de un ShowMoreNode),
+                    # pero solo se avisa a la vista si cambió lo que muestra
+                    cambio = not old.same_data(new)
+                    old.copy_data(new)
+                    if cambio:
+                        index = self.createIndex(old.row, 0, old)
+                        self.dataChanged.emit(index, index)
+                    if new.loader is None:
+                        old.loader = None
+                        self._sync_children(old, new.children)
+                    elif old.children:
+                        # Ya estaba cargado (expandido): actualizarlo ahora
+                        old.loader = None
+                        self._sync_children(old, list(new.loader()))
+                    else:
+                        old.loader = new.loader
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(parent_index, i1, i2 - 1)
+                for child in old_children[i1:i2]:
+                    self._forget(child)
+                del old_children[i1:i2]
+                self._renumber(parent_node, i1)
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(parent_index, i1, i1 + (j2 - j1) - 1)
+                old_children[i1:i1] = new_children[j1:j2]
+                for child in new_children[j1:j2]:
+                    self._adopt(parent_node, child)
+                self._renumber(parent_node, i1)
+                self.endInsertRows()
+
+    def _adopt(self, parent_node, node):
+        node.parent = parent_node
+        self._por_clave[node.key] = node
+        for row, child in enumerate(node.children):
+            child.row = row
+            self._adopt(node, child)
+
+    def _forget(self, node):
+        if self._por_clave.get(node.key) is node:
+            del self._por_clave[node.key]
+        for child in node.children:
+            self._forget(child)
+
+    def _renumber(self, parent_node, start):
+        children = parent_node.children
+        for row in range(start, len(children)):
+            children[row].row = row
+
+
+class SuggestionDelegate(QStyledItemDelegate):
+    """Aplica fuente y color según la clave de estilo de cada fila.
+
+    Las fuentes y colores se crean una sola vez; los colores que dependen
+    del tema se toman de la paleta de la vista al pintar.
+    """
+
+    _styles = None
+
+    @classmethod
+    def styles(cls):
+        # Se crean al primer uso (QFont necesita la aplicación ya iniciada)
+        if cls._styles is None:
+            cls._styles = {
+                'root': (QFont("Segoe UI", 10, QFont.Weight.Bold), QColor(70, 130, 180)),
+                'initial': (QFont("Segoe UI", 9, QFont.Weight.Bold), QPalette.ColorRole.Mid),
+                'category': (QFont("Segoe UI", 9, QFont.Weight.Bold), QPalette.ColorRole.Link),
+                'suggestion': (QFont("Segoe UI", 8), QPalette.ColorRole.LinkVisited),
+                'selected': (QFont("Segoe UI", 8, QFont.Weight.Bold), QColor(34, 139, 34)),
+                'message': (QFont("Segoe UI", 8), QPalette.ColorRole.Mid),
+                'group': (QFont("Segoe UI", 9, QFont.Weight.Bold), QColor(100, 149, 237)),
+                'item': (QFont("Segoe UI", 8), QColor(255, 255, 255)),
+                'notice': (QFont("Segoe UI", 9, QFont.Weight.Bold), QColor(255, 165, 0)),
+            }
+        return cls._styles
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        style = self.styles().get(index.data(STYLE_ROLE))
+        if style is None:
+            return
+        font, color = style
+        option.font = font
+        if isinstance(color, QPalette.ColorRole):
+            color = option.widget.palette().color(color) if option.widget else option.palette.color(color)
+        option.palette.setColor(QPalette.ColorRole.Text, color)
+
+
+class SuggestionTreeView(QTreeView):
+    """Vista de una columna de sugerencias; expande las filas nuevas al insertarlas,
+    salvo las de carga diferida, que se cargan cuando el usuario las abre"""
+
+    nodeDoubleClicked = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(SuggestionTreeModel(self))
+        self.setItemDelegate(SuggestionDelegate(self))
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.model().rowsInserted.connect(self._expand_inserted)
+        self.doubleClicked.connect(self._on_double_clicked)
+
+    def _on_double_clicked(self, index):
+        node = self.model().node(index)
+        if isinstance(node, ShowMoreNode):
+            self.model().show_more(node)
+        else:
+            self.nodeDoubleClicked.emit(node)
+
+    def _expand_inserted(self, parent, first, last):
+        model = self.model()
+        for row in range(first, last + 1):
+            self._expand_loaded(model.index(row, 0, parent))
+
+    def _expand_loaded(self, index):
+        model = self.model()
+        if model.canFetchMore(index):
+            return
+        self.expand(index)
+        for row in range(model.rowCount(index)):
+            self._expand_loaded(model.index(row, 0, index))
+
+    def set_nodes(self, nodes):
+        self.model().set_nodes(nodes)
+
+    def clear(self):
+        self.model().clear()
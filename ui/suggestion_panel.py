@@ -1,10 +1,15 @@
+from itertools import chain, islice
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QScrollArea, QFrame, QTreeWidget, QTreeWidgetItem
+    QPushButton, QScrollArea, QFrame
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QIcon, QColor
+from PyQt6.QtGui import QFont, QIcon
 from logic.suggestion_engine import SuggestionEngine
+from logic.color_palette import ColorPalette
+from .suggestion_worker import SuggestionWorker
+from .suggestion_model import SuggestionNode, ShowMoreNode, SuggestionTreeView
 
 class SuggestionPanel(QWidget):
     suggestion_applied = pyqtSignal(str, str)
@@ -16,6 +21,10 @@ class SuggestionPanel(QWidget):
         self.prompt_generator = prompt_generator
         self.main_window = main_window
         self.suggestion_engine = SuggestionEngine()
+        self.color_palette = ColorPalette()
+        # Cálculo de sugerencias en segundo plano mientras se escribe
+        self.suggestion_worker = SuggestionWorker(self._compute_suggestion_data, self)
+        self.suggestion_worker.suggestions_ready.connect(self._render_suggestions_tree)
         
         # Rastrear sugerencias seleccionadas
         self.selected_suggestions = set()
@@ -25,6 +34,8 @@ class SuggestionPanel(QWidget):
         self.dynamic_columns = []  # Lista de columnas creadas dinámicamente
         self.column_data = []      # Datos de cada columna (para navegación)
         self.max_columns = 4       # Reducido de 5 a 4 (sin estilos)
+        # Pool de columnas: el widget de la columna i se crea una vez y se reutiliza
+        self.column_pool = {}
         
         # NUEVO: Control de estado de columnas (FALTABA ESTA LÍNEA)
         self.column_states = {}  # {column_index: {'collapsed': bool, 'created': bool}}
@@ -45,8 +56,8 @@ class SuggestionPanel(QWidget):
         
         # Título
         title = QLabel("💡 Sugerencias Inteligentes")
+        title.setObjectName("columnTitle")
         title.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        title.setStyleSheet("color: #cccccc; margin-bottom: 4px;")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         
@@ -60,8 +71,8 @@ class SuggestionPanel(QWidget):
         
         layout.addLayout(self.columns_layout)
         
-        # Guardar referencia al tree_widget principal para compatibilidad
-        self.tree_widget = self.main_column.findChild(QTreeWidget)
+        # Guardar referencia al árbol principal
+        self.tree_view = self.main_column.tree_view
         
         self.setLayout(layout)
         
@@ -69,7 +80,7 @@ class SuggestionPanel(QWidget):
         self.show_initial_message()
         
     def _create_suggestion_column(self, title, column_index):
-        """Crea una columna de sugerencias con su propio QTreeWidget y botón Siguiente"""
+        """Crea una columna de sugerencias con su propio árbol (modelo + vista) y botón Siguiente"""
         column_widget = QWidget()
         column_layout = QVBoxLayout(column_widget)
         column_layout.setContentsMargins(4, 0, 4, 0)
@@ -79,32 +90,16 @@ class SuggestionPanel(QWidget):
         
         # Título de la columna
         column_title = QLabel(title)
+        column_title.setObjectName("columnTitle")
         column_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        column_title.setStyleSheet("color: #cccccc; margin-bottom: 4px;")
         header_layout.addWidget(column_title)
+        column_widget.title_label = column_title
         
         # Botón "Skip" pequeño y discreto (solo para columnas que no sean la principal ni la de colores)
         if column_index > 0 and column_index < 3:  # Combinaciones y Accesorios
             skip_button = QPushButton("⏭")
+            skip_button.setObjectName("skipButton")
             skip_button.setFixedSize(20, 20)  # Botón muy pequeño
-            skip_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #666666;
-                    color: #cccccc;
-                    border: 1px solid #888888;
-                    border-radius: 10px;
-                    font-size: 10px;
-                    font-weight: bold;
-                    padding: 0px;
-                }
-                QPushButton:hover {
-                    background-color: #4a90e2;
-                    color: white;
-                }
-                QPushButton:pressed {
-                    background-color: #357abd;
-                }
-            """)
             skip_button.setToolTip("Saltar al siguiente paso")
             skip_button.clicked.connect(lambda: self._toggle_skip_column(column_index))
             header_layout.addWidget(skip_button)
@@ -113,39 +108,43 @@ class SuggestionPanel(QWidget):
         column_layout.addLayout(header_layout)
         
         # Árbol de sugerencias
-        tree_widget = QTreeWidget()
-        tree_widget.setHeaderHidden(True)
-        tree_widget.setRootIsDecorated(True)
-        tree_widget.setStyleSheet("""
-            QTreeWidget {
-                background-color: #3c3c3c;
-                border: 1px solid #555555;
-                border-radius: 6px;
-                color: #ffffff;
-                font-size: 9pt;
-                min-width: 200px;
-                max-width: 250px;
-            }
-            QTreeWidget::item {
-                padding: 4px;
-                border-bottom: 1px solid #4a4a4a;
-            }
-            QTreeWidget::item:hover {
-                background-color: #4a4a4a;
-            }
-            QTreeWidget::item:selected {
-                background-color: #00cc88;
-                color: #ffffff;
-            }
-        """)
+        tree_view = SuggestionTreeView()
+        tree_view.setObjectName("suggestionTree")
         
         # Conectar doble click con el índice de columna
-        tree_widget.itemDoubleClicked.connect(
-            lambda item, col: self.on_item_double_clicked(item, col, column_index)
+        tree_view.nodeDoubleClicked.connect(
+            lambda node: self.on_item_double_clicked(node, column_index)
         )
         
-        column_layout.addWidget(tree_widget)
+        column_layout.addWidget(tree_view)
+        column_widget.tree_view = tree_view
+        return column_widget
+    
+    def _acquire_column(self, title, column_index):
+        """Activa la columna `column_index` reutilizando su widget del pool.
+        
+        El widget se crea y se agrega al layout solo la primera vez; después
+        solo se cambia el título y se vuelve a mostrar. El árbol conserva su
+        contenido para que el siguiente `set_nodes` solo aplique diferencias.
+        """
+        column_widget = self.column_pool.get(column_index)
+        if column_widget is None:
+            column_widget = self._create_suggestion_column(title, column_index)
+            # Mantener el orden del layout igual al índice de columna
+            position = 1 + sum(1 for index in self.column_pool if index < column_index)
+            self.columns_layout.insertWidget(position, column_widget)
+            self.column_pool[column_index] = column_widget
+        else:
+            column_widget.title_label.setText(title)
+            column_widget.tree_view.setVisible(True)
+        self.dynamic_columns.append(column_widget)
         return column_widget
+    
+    def _release_columns_from(self, start_index):
+        """Oculta las columnas desde `start_index` y las devuelve al pool"""
+        for column_widget in self.dynamic_columns[max(start_index, 1):]:
+            column_widget.setVisible(False)
+        self.dynamic_columns = self.dynamic_columns[:max(start_index, 1)]
         
     def _is_same_selection(self, category, value, column_index):
         """Verifica si la selección actual es la misma que la última en esta columna"""
@@ -158,14 +157,14 @@ class SuggestionPanel(QWidget):
                 last_selection['category'] == category and 
                 last_selection['value'] == value)
     
-    def on_item_double_clicked(self, item, column, column_index):
-        """Maneja el doble clic en un elemento"""
+    def on_item_double_clicked(self, item, column_index):
+        """Maneja el doble clic en un elemento (un SuggestionNode de la columna)"""
         print(f"DEBUG: on_item_double_clicked llamado con column_index={column_index}")
-        print(f"DEBUG: item.parent() = {item.parent()}")
+        print(f"DEBUG: item.parent_node() = {item.parent_node()}")
         
-        if item.parent():  # Es un elemento hijo
-            category = item.parent().text(0)
-            value = item.text(0)
+        if item.parent_node():  # Es un elemento hijo
+            category = item.parent_node().text
+            value = item.text
             
             # LIMPIAR LOS EMOJIS Y ESPACIOS EXTRA DEL VALOR
             clean_value = value.replace('✨ ', '').replace('🎨 ', '').strip()
@@ -237,12 +236,12 @@ class SuggestionPanel(QWidget):
             elif column_index == 2:  # Columna de accesorios - MOSTRAR COLORES AUTOMÁTICAMENTE
                 print(f"DEBUG: ¡DEBERÍA CREAR COLUMNA DE COLORES! Accesorio seleccionado: {clean_value}")
                 print(f"Creando columna de colores después de seleccionar accesorio: {clean_value}")
-                self._create_color_column_for_all_garments(column_index + 1)
+                self._show_color_column_for_all_garments(column_index + 1)
                 print("DEBUG: Columna de colores creada")
             elif column_index == 3:  # Columna de colores
                 print("DEBUG: Procesando selección de color")
                 # Obtener datos del elemento seleccionado
-                item_data = item.data(0, Qt.ItemDataRole.UserRole)
+                item_data = item.payload
                 if item_data and len(item_data) > 2:
                     selection_type, color_value, garment_id = item_data
                     # EXTRAER SOLO EL COLOR SIN LA PRENDA
@@ -273,49 +272,24 @@ class SuggestionPanel(QWidget):
             else:
                 print(f"DEBUG: column_index {column_index} no manejado")
         else:
-            print(f"DEBUG: item.parent() es None, no es un elemento hijo")
+            print(f"DEBUG: item.parent_node() es None, no es un elemento hijo")
             
         print(f"Prompt actual: {self._build_contextual_prompt()}")
     
     def _show_color_column_for_all_garments(self, column_index):
         """Crea columna de colores con opciones para todas las prendas"""
-        color_column = self._create_suggestion_column("Colores", column_index)
-        tree_widget = color_column.findChild(QTreeWidget)
-        
-        # Limpiar y crear estructura
-        tree_widget.clear()
-        
-        # Crear nodo raíz
-        root_item = QTreeWidgetItem(tree_widget)
-        root_item.setText(0, "🎨 Seleccionar Colores")
-        root_item.setFont(0, QFont("Segoe UI", 10, QFont.Weight.Bold))
-        root_item.setForeground(0, QColor(70, 130, 180))
+        color_column = self._acquire_column("Colores", column_index)
         
-        # Crear sección para cada prenda seleccionada
-        for garment_id, garment_data in self.garment_selections.items():
-            garment_item = QTreeWidgetItem(root_item)
-            garment_item.setText(0, f"👔 {garment_data['base_item']}")
-            garment_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-            garment_item.setForeground(0, QColor(100, 149, 237))
-            
-            # Agregar opciones de color
-            colors = ["black", "white", "blue", "red", "green", "gray", "brown","orange","yellow","pink","gold","silver","purple","jade","violet"]
-
-
-
-            for color in colors:
-                color_item = QTreeWidgetItem(garment_item)
-                color_item.setText(0, f"🎨 {color}")
-                color_item.setFont(0, QFont("Segoe UI", 8))
-                color_item.setForeground(0, QColor(255, 255, 255))
-                color_item.setData(0, Qt.ItemDataRole.UserRole, ("color", color, garment_id))
-        
-        tree_widget.expandAll()
+        # Crear sección para cada prenda seleccionada (sus colores se cargan al expandirla)
+        garment_nodes = [
+            self._garment_color_node(garment_id, garment_data)
+            for garment_id, garment_data in self.garment_selections.items()
+        ]
         
-        # AGREGAR ESTAS LÍNEAS QUE FALTABAN:
-        # Agregar al layout
-        self.columns_layout.addWidget(color_column)
-        self.dynamic_columns.append(color_column)
+        # Nodo raíz
+        color_column.tree_view.set_nodes([
+            SuggestionNode(('root',), "🎨 Seleccionar Colores", 'root', children=garment_nodes)
+        ])
         
         # Marcar como creada
         if column_index not in self.column_states:
@@ -329,6 +303,19 @@ class SuggestionPanel(QWidget):
         
         return color_column
     
+    def _garment_color_node(self, garment_id, garment_data):
+        """Nodo de una prenda cuyos colores (compatibles primero) se crean al expandirlo"""
+        base_item = garment_data['base_item']
+        
+        def load_colors():
+            return [
+                SuggestionNode(('color', garment_id, color), f"🎨 {color}", 'item',
+                               payload=("color", color, garment_id))
+                for color in self.color_palette.colores_para(base_item)
+            ]
+        
+        return SuggestionNode(('garment', garment_id), f"👔 {base_item}", 'group', loader=load_colors)
+    
     def _show_next_column(self, column_index, column_title):
         """Muestra la siguiente columna con combinaciones - LÓGICA ORIGINAL"""
         print(f"Mostrando columna {column_index}: {column_title}")
@@ -343,11 +330,7 @@ class SuggestionPanel(QWidget):
         
         if next_data:
             # Crear nueva columna
-            new_column = self._create_suggestion_column(column_title, column_index)
-            
-            # Agregar al layout
-            self.columns_layout.addWidget(new_column)
-            self.dynamic_columns.append(new_column)
+            new_column = self._acquire_column(column_title, column_index)
             
             # Marcar como creada
             if column_index not in self.column_states:
@@ -355,8 +338,7 @@ class SuggestionPanel(QWidget):
             self.column_states[column_index]['created'] = True
             
             # Llenar con datos
-            tree_widget = new_column.findChild(QTreeWidget)
-            self._populate_column(tree_widget, next_data, column_title)
+            self._populate_column(new_column.tree_view, next_data, column_title)
             
             # Mostrar la columna
             new_column.setVisible(True)
@@ -386,14 +368,9 @@ class SuggestionPanel(QWidget):
     
     def _show_skip_indicator_in_column(self, column_widget, column_title):
         """Muestra indicador de salto en una columna específica"""
-        tree_widget = column_widget.findChild(QTreeWidget)
-        if tree_widget:
-            tree_widget.clear()
-            skip_item = QTreeWidgetItem(tree_widget)
-            skip_item.setText(0, f"⏭️ {column_title} - SALTADO")
-            skip_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-            skip_item.setForeground(0, QColor(255, 165, 0))  # Color naranja
-            tree_widget.expandAll()
+        column_widget.tree_view.set_nodes([
+            SuggestionNode(('notice',), f"⏭️ {column_title} - SALTADO", 'notice')  # Color naranja
+        ])
     
     def _get_next_column_data(self, category, value, column_type):
         """Obtiene los datos para la siguiente columna"""
@@ -421,16 +398,8 @@ class SuggestionPanel(QWidget):
         else:
             return None  # No más columnas
     
-    def _populate_column(self, tree_widget, data, title):
+    def _populate_column(self, tree_view, data, title):
         """Llena una columna con datos - CON TRADUCCIONES"""
-        tree_widget.clear()
-        
-        # Crear nodo raíz
-        root_item = QTreeWidgetItem(tree_widget)
-        root_item.setText(0, f"🎯 {title}")
-        root_item.setFont(0, QFont("Segoe UI", 10, QFont.Weight.Bold))
-        root_item.setForeground(0, QColor(70, 130, 180))
-        
         # Obtener traducciones de la selección principal
         translations = {}
         for selection in reversed(self.selection_history):
@@ -439,48 +408,35 @@ class SuggestionPanel(QWidget):
                 break
         
         # Procesar datos por categoría
+        category_nodes = []
         for category, suggestions in data.items():
             if suggestions:
-                # Crear nodo de categoría
-                category_item = QTreeWidgetItem(root_item)
-                category_display = category.replace('_', ' ').title()
-                category_item.setText(0, f"📁 {category_display}")
-                category_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-                category_item.setForeground(0, QColor(100, 149, 237))
-                
-                # Agregar sugerencias con traducciones
-                for suggestion in suggestions[:6]:  # Limitar a 6
-                    item = QTreeWidgetItem(category_item)
-                    item.setText(0, f"✨ {suggestion}")
-                    
-                    # Agregar tooltip con traducción
+                # Agregar sugerencias con traducciones, de 6 en 6
+                def make_node(suggestion, category=category):
                     item_key = suggestion.lower().replace(' ', '_')
-                    if item_key in translations:
-                        item.setToolTip(0, translations[item_key])
-                    
-                    item.setFont(0, QFont("Segoe UI", 8))
-                    item.setForeground(0, QColor(255, 255, 255))
-                    item.setData(0, Qt.ItemDataRole.UserRole, (category, suggestion))
+                    return SuggestionNode(
+                        ('suggestion', category, suggestion), f"✨ {suggestion}", 'item',
+                        tooltip=translations.get(item_key), payload=(category, suggestion)
+                    )
+                suggestion_nodes = self._paged_nodes(
+                    iter(suggestions), 6, make_node, ('more', category), len(suggestions)
+                )
+                category_display = category.replace('_', ' ').title()
+                category_nodes.append(SuggestionNode(
+                    ('category', category), f"📁 {category_display}", 'group', children=suggestion_nodes
+                ))
         
-        # Expandir todo
-        tree_widget.expandAll()
+        # Nodo raíz
+        tree_view.set_nodes([SuggestionNode(('root',), f"🎯 {title}", 'root', children=category_nodes)])
     
     def _show_end_message(self, column_index):
         """Muestra mensaje cuando no hay más combinaciones"""
-        end_column = self._create_suggestion_column("Fin de combinaciones", column_index)
-        
-        # Agregar al layout
-        self.columns_layout.addWidget(end_column)
-        self.dynamic_columns.append(end_column)
+        end_column = self._acquire_column("Fin de combinaciones", column_index)
         
-        # Mostrar mensaje
-        tree_widget = end_column.findChild(QTreeWidget)
-        tree_widget.clear()
-        
-        root_item = QTreeWidgetItem(tree_widget)
-        root_item.setText(0, "ℹ️ No hay más combinaciones disponibles")
-        root_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-        root_item.setForeground(0, QColor(255, 165, 0))  # Naranja
+        # Mostrar mensaje (naranja)
+        end_column.tree_view.set_nodes([
+            SuggestionNode(('notice',), "ℹ️ No hay más combinaciones disponibles", 'notice')
+        ])
         
         end_column.setVisible(True)
     
@@ -488,18 +444,8 @@ class SuggestionPanel(QWidget):
         """Limpia todas las columnas dinámicas excepto la principal"""
         print("Limpiando columnas dinámicas...")
         
-        # Remover todas las columnas excepto la principal (índice 0)
-        columns_to_remove = []
-        
-        for i in range(1, len(self.dynamic_columns)):
-            column_widget = self.dynamic_columns[i]
-            columns_to_remove.append(column_widget)
-            self.columns_layout.removeWidget(column_widget)
-            column_widget.setParent(None)
-            column_widget.deleteLater()
-        
-        # Mantener solo la columna principal
-        self.dynamic_columns = self.dynamic_columns[:1]
+        # Ocultar todas las columnas excepto la principal (índice 0)
+        self._release_columns_from(1)
         
         # Limpiar estados de columnas dinámicas
         keys_to_remove = [k for k in self.column_states.keys() if k > 0]
@@ -545,17 +491,8 @@ class SuggestionPanel(QWidget):
             for garment_id in self.garment_selections:
                 self.garment_selections[garment_id]['attributes'] = {}
         
-        # Remover columnas del layout desde el final hacia atrás
-        columns_to_remove = []
-        for i in range(start_index, len(self.dynamic_columns)):
-            column = self.dynamic_columns[i]
-            columns_to_remove.append(column)
-            self.columns_layout.removeWidget(column)
-            column.setParent(None)
-            column.deleteLater()
-            
-        # Actualizar la lista de columnas
-        self.dynamic_columns = self.dynamic_columns[:start_index]
+        # Devolver las columnas al pool
+        self._release_columns_from(start_index)
             
         # Limpiar estados específicos según el índice
         if start_index <= 2:  # Si limpiamos desde accesorios o antes
@@ -585,35 +522,24 @@ class SuggestionPanel(QWidget):
             # Mostrar la columna de combinaciones
             self.combinations_column.setVisible(True)
             
-            # Obtener el tree widget de la columna de combinaciones
-            combinations_tree = self.combinations_column.findChild(QTreeWidget)
-            combinations_tree.clear()
-            
-            # Crear nodo raíz
-            root_item = QTreeWidgetItem(combinations_tree)
-            root_item.setText(0, f"🔗 Combinaciones para: {value}")
-            root_item.setFont(0, QFont("Segoe UI", 10, QFont.Weight.Bold))
-            root_item.setForeground(0, QColor(70, 130, 180))
-            
             # Agregar combinaciones por categoría
+            category_nodes = []
             for combo_category, combo_suggestions in combinations.items():
                 if combo_suggestions:
-                    # Crear nodo de categoría
-                    category_item = QTreeWidgetItem(root_item)
-                    category_item.setText(0, f"📁 {combo_category.replace('_', ' ').title()}")
-                    category_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-                    category_item.setForeground(0, QColor(100, 149, 237))
-                    
-                    # Agregar sugerencias individuales
-                    for suggestion in combo_suggestions[:6]:  # Limitar a 6
-                        suggestion_item = QTreeWidgetItem(category_item)
-                        suggestion_item.setText(0, f"✨ {suggestion}")
-                        suggestion_item.setFont(0, QFont("Segoe UI", 8))
-                        suggestion_item.setForeground(0, QColor(255, 255, 255))
-                        suggestion_item.setData(0, Qt.ItemDataRole.UserRole, (combo_category, suggestion))
+                    # Agregar sugerencias individuales (limitar a 6)
+                    suggestion_nodes = [
+                        SuggestionNode(('suggestion', combo_category, suggestion), f"✨ {suggestion}", 'item',
+                                       payload=(combo_category, suggestion))
+                        for suggestion in combo_suggestions[:6]
+                    ]
+                    category_nodes.append(SuggestionNode(
+                        ('category', combo_category), f"📁 {combo_category.replace('_', ' ').title()}", 'group',
+                        children=suggestion_nodes
+                    ))
             
-            # Expandir todo
-            combinations_tree.expandAll()
+            self.combinations_column.tree_view.set_nodes([
+                SuggestionNode(('root',), f"🔗 Combinaciones para: {value}", 'root', children=category_nodes)
+            ])
         else:
             print("No se encontraron combinaciones")
             # Ocultar la columna si no hay combinaciones
@@ -654,75 +580,113 @@ class SuggestionPanel(QWidget):
     
     def show_initial_message(self):
         """Muestra mensaje inicial cuando no hay sugerencias"""
-        if hasattr(self, 'tree_widget'):
-            self.tree_widget.clear()
-            root_item = QTreeWidgetItem(self.tree_widget)
-            root_item.setText(0, "💡 Selecciona un valor del autocompletado para ver sugerencias")
-            root_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-            root_item.setForeground(0, self.tree_widget.palette().color(self.tree_widget.palette().ColorRole.Mid))
-            self.tree_widget.expandAll()
+        if hasattr(self, 'tree_view'):
+            self.tree_view.set_nodes([
+                SuggestionNode(('initial',), "💡 Selecciona un valor del autocompletado para ver sugerencias", 'initial')
+            ])
+        
+    def request_suggestions(self, selected_category, selected_value):
+        """Calcula las sugerencias en segundo plano y muestra solo el resultado más reciente"""
+        self.suggestion_worker.request(selected_category, selected_value)
         
     def update_suggestions_tree(self, selected_category, selected_value):
         """Actualiza el árbol de sugerencias basado en la categoría y valor seleccionados"""
-        # Limpiar el árbol principal
-        self.tree_widget.clear()
-        
-        # Crear nodo raíz
-        root_item = QTreeWidgetItem(self.tree_widget)
-        root_item.setText(0, f"🎯 Sugerencias para: {selected_value}")
-        root_item.setFont(0, QFont("Segoe UI", 10, QFont.Weight.Bold))
-        root_item.setForeground(0, QColor(70, 130, 180))
-        
-        has_suggestions = False
-        
-        # Obtener sugerencias del motor
-        engine_suggestions = self.suggestion_engine.get_suggestions(selected_category, selected_value)
+        # Cálculo síncrono: invalida cualquier resultado en segundo plano pendiente
+        self.suggestion_worker.cancel()
+        data = self._compute_suggestion_data(selected_category, selected_value)
+        self._render_suggestions_tree(selected_category, selected_value, data)
+        
+    def _compute_suggestion_data(self, selected_category, selected_value):
+        """Sugerencias y traducciones para un valor, sin tocar widgets (seguro fuera del hilo de la interfaz).
+        
+        Retorna una lista de (categoría relacionada, [(sugerencia, traducción), ...], resto),
+        donde `resto` es un iterador con las sugerencias siguientes, o None si no hay más.
+        """
+        data = []
+        # La primera búsqueda carga reglas y traducciones: una sola escritura de la caché
+        with self.suggestion_engine.store.escritura_agrupada():
+            engine_suggestions = self.suggestion_engine.get_suggestions(selected_category, selected_value)
+            for related_category, ranked in engine_suggestions.items():
+                if ranked:
+                    # Primera página de 8; el resto solo se calcula si se pide
+                    pending = iter(ranked)
+                    page = list(islice(pending, 9))
+                    items = [
+                        (suggestion, self.suggestion_engine.get_translation(related_category, suggestion.lower().replace(' ', '_')))
+                        for suggestion in page[:8]
+                    ]
+                    rest = chain(page[8:], pending) if len(page) > 8 else None
+                    data.append((related_category, items, rest))
+        return data
+        
+    def _render_suggestions_tree(self, selected_category, selected_value, data):
+        """Actualiza el árbol con sugerencias ya calculadas (solo se aplican las diferencias)"""
+        category_nodes = []
         
         # Procesar sugerencias del SuggestionEngine
-        if engine_suggestions:
-            has_suggestions = True
-            for related_category, suggestions in engine_suggestions.items():
-                if suggestions:
-                    # Crear nodo de categoría
-                    category_item = QTreeWidgetItem(root_item)
-                    category_item.setText(0, f"📁 {related_category.replace('_', ' ').title()}")
-                    category_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-                    category_item.setForeground(0, self.tree_widget.palette().color(self.tree_widget.palette().ColorRole.Link))
-                    
-                    # Crear nodos de sugerencias (limitar a 8)
-                    for suggestion in suggestions[:8]:
-                        suggestion_item = QTreeWidgetItem(category_item)
-                        
-                        # Verificar si esta sugerencia ya fue seleccionada
-                        suggestion_key = (related_category, suggestion)
-                        is_selected = suggestion_key in self.selected_suggestions
-                        
-                        if is_selected:
-                            suggestion_item.setText(0, f"✅ {suggestion}")
-                            suggestion_item.setForeground(0, QColor(34, 139, 34))
-                            suggestion_item.setFont(0, QFont("Segoe UI", 8, QFont.Weight.Bold))
-                        else:
-                            suggestion_item.setText(0, f"✨ {suggestion}")
-                            suggestion_item.setForeground(0, self.tree_widget.palette().color(self.tree_widget.palette().ColorRole.LinkVisited))
-                            suggestion_item.setFont(0, QFont("Segoe UI", 8))
-                        
-                        # AGREGAR TOOLTIP CON TRADUCCIÓN DESDE ARCHIVO
-                        suggestion_key = suggestion.lower().replace(' ', '_')
-                        translation = self.suggestion_engine.get_translation(related_category, suggestion_key)
-                        if translation:
-                            suggestion_item.setToolTip(0, translation)
-                        
-                        suggestion_item.setData(0, Qt.ItemDataRole.UserRole, (related_category, suggestion))
+        for related_category, suggestions, rest in data:
+            suggestion_nodes = [
+                self._main_suggestion_node(related_category, suggestion, translation)
+                for suggestion, translation in suggestions
+            ]
+            if rest is not None:
+                def make_node(suggestion, related_category=related_category):
+                    suggestion_key = suggestion.lower().replace(' ', '_')
+                    translation = self.suggestion_engine.get_translation(related_category, suggestion_key)
+                    return self._main_suggestion_node(related_category, suggestion, translation)
+                more_key = ('more', related_category)
+                suggestion_nodes.append(ShowMoreNode(
+                    more_key, lambda rest=rest, make_node=make_node, more_key=more_key: self._paged_nodes(
+                        rest, 8, make_node, more_key
+                    )
+                ))
+            category_nodes.append(SuggestionNode(
+                ('category', related_category), f"📁 {related_category.replace('_', ' ').title()}", 'category',
+                children=suggestion_nodes
+            ))
         
         # Si no hay sugerencias, mostrar mensaje
-        if not has_suggestions:
-            no_suggestions_item = QTreeWidgetItem(root_item)
-            no_suggestions_item.setText(0, "ℹ️ No hay categorías relacionadas para este valor")
-            no_suggestions_item.setFont(0, QFont("Segoe UI", 8))
-            no_suggestions_item.setForeground(0, self.tree_widget.palette().color(self.tree_widget.palette().ColorRole.Mid))
+        if not category_nodes:
+            category_nodes.append(SuggestionNode(
+                ('message',), "ℹ️ No hay categorías relacionadas para este valor", 'message'
+            ))
+        
+        # Nodo raíz
+        self.tree_view.set_nodes([
+            SuggestionNode(('root',), f"🎯 Sugerencias para: {selected_value}", 'root', children=category_nodes)
+        ])
+        
+    def _main_suggestion_node(self, related_category, suggestion, translation):
+        """Fila de una sugerencia del árbol principal"""
+        # Verificar si esta sugerencia ya fue seleccionada
+        suggestion_key = (related_category, suggestion)
+        text, style = self._suggestion_display(suggestion, suggestion_key in self.selected_suggestions)
+        return SuggestionNode(
+            ('suggestion',) + suggestion_key, text, style,
+            # Tooltip con traducción desde archivo
+            tooltip=translation or None, payload=suggestion_key
+        )
         
-        # Expandir todo el árbol
-        self.tree_widget.expandAll()
+    def _paged_nodes(self, pending, page_size, make_node, more_key, total=None):
+        """Nodos de la siguiente página de `pending` y, si quedan más, un "Mostrar más" al final.
+        
+        `total` es cuántas sugerencias quedan en `pending`, si se conoce.
+        """
+        page = list(islice(pending, page_size + 1))
+        nodes = [make_node(suggestion) for suggestion in page[:page_size]]
+        if len(page) > page_size:
+            rest = chain(page[page_size:], pending)
+            restantes = None if total is None else total - page_size
+            nodes.append(ShowMoreNode(
+                more_key, lambda: self._paged_nodes(rest, page_size, make_node, more_key, restantes), restantes
+            ))
+        return nodes
+        
+    def _suggestion_display(self, suggestion, is_selected):
+        """Texto y estilo de una sugerencia según si ya fue seleccionada"""
+        if is_selected:
+            return f"✅ {suggestion}", 'selected'
+        return f"✨ {suggestion}", 'suggestion'
         
     def clear_suggestions(self):
         """Limpia todas las sugerencias y muestra mensaje inicial"""
@@ -733,44 +697,38 @@ class SuggestionPanel(QWidget):
         
     def clear_selected_suggestions(self):
         """Limpia solo las sugerencias seleccionadas"""
-        self.selected_suggestions.clear()
-        # Refrescar la vista actual si hay sugerencias mostradas
-        if self.tree_widget.topLevelItemCount() > 0:
-            # Obtener la categoría y valor actual del nodo raíz
-            root_item = self.tree_widget.topLevelItem(0)
-            if root_item:
-                text = root_item.text(0)
-                # Extraer información y refrescar
-                # (esto requeriría almacenar la categoría/valor actual)
+        # Repintar solo las filas que estaban marcadas, en un único lote
+        self.set_suggestions_selected(list(self.selected_suggestions), False)
+    
+    def set_suggestions_selected(self, suggestion_keys, selected=True):
+        """Marca o desmarca varias sugerencias (categoría, valor) a la vez"""
+        if selected:
+            self.selected_suggestions.update(suggestion_keys)
+        else:
+            self.selected_suggestions.difference_update(suggestion_keys)
+        model = self.tree_view.model()
+        nodes = (model.find(('suggestion',) + tuple(key)) for key in suggestion_keys)
+        self._refresh_suggestion_nodes(node for node in nodes if node is not None)
     
     def _update_category_visual_state(self, category):
         """Actualiza el estado visual de todos los elementos de una categoría"""
-        # Recorrer todos los elementos del árbol principal
-        for i in range(self.tree_widget.topLevelItemCount()):
-            root_item = self.tree_widget.topLevelItem(i)
-            
-            # Recorrer categorías
-            for j in range(root_item.childCount()):
-                category_item = root_item.child(j)
-                
-                # Recorrer elementos de la categoría
-                for k in range(category_item.childCount()):
-                    suggestion_item = category_item.child(k)
-                    item_data = suggestion_item.data(0, Qt.ItemDataRole.UserRole)
-                    
-                    if item_data and item_data[0] == category:
-                        # Verificar si este elemento está seleccionado
-                        suggestion_key = (item_data[0], item_data[1])
-                        is_selected = suggestion_key in self.selected_suggestions
-                        
-                        if is_selected:
-                            suggestion_item.setText(0, f"✅ {item_data[1]}")
-                            suggestion_item.setForeground(0, QColor(34, 139, 34))
-                            suggestion_item.setFont(0, QFont("Segoe UI", 8, QFont.Weight.Bold))
-                        else:
-                            suggestion_item.setText(0, f"✨ {item_data[1]}")
-                            suggestion_item.setForeground(0, self.tree_widget.palette().color(self.tree_widget.palette().ColorRole.LinkVisited))
-                            suggestion_item.setFont(0, QFont("Segoe UI", 8))
+        # Solo las filas de esa categoría, sin recorrer el árbol principal
+        category_node = self.tree_view.model().find(('category', category))
+        if category_node is not None:
+            self._refresh_suggestion_nodes(category_node.children)
+    
+    def _refresh_suggestion_nodes(self, nodes):
+        """Ajusta texto y estilo de las filas cuyo estado de selección cambió"""
+        updates = []
+        for node in nodes:
+            if node.key[0] != 'suggestion':
+                continue
+            suggestion_key = node.payload
+            text, style = self._suggestion_display(suggestion_key[1], suggestion_key in self.selected_suggestions)
+            if (text, style) != (node.text, node.style):
+                updates.append((node, text, style))
+        if updates:
+            self.tree_view.model().update_nodes(updates)
     
     def _track_selection(self, column_index, category, value, selection_type):
         """Registra una selección y actualiza el estado"""
@@ -882,55 +840,6 @@ class SuggestionPanel(QWidget):
             # Por esta:
             self.prompt_generator.set_category_value('vestuario_contextual', contextual_prompt)
     
-    def _create_color_column_for_all_garments(self, column_index):
-        """Crea columna de colores con opciones para todas las prendas"""
-        color_column = self._create_suggestion_column("Colores", column_index)
-        tree_widget = color_column.findChild(QTreeWidget)
-        
-        # Limpiar y crear estructura
-        tree_widget.clear()
-        
-        # Crear nodo raíz
-        root_item = QTreeWidgetItem(tree_widget)
-        root_item.setText(0, "🎨 Seleccionar Colores")
-        root_item.setFont(0, QFont("Segoe UI", 10, QFont.Weight.Bold))
-        root_item.setForeground(0, QColor(70, 130, 180))
-        
-        # Crear sección para cada prenda seleccionada
-        for garment_id, garment_data in self.garment_selections.items():
-            garment_item = QTreeWidgetItem(root_item)
-            garment_item.setText(0, f"👔 {garment_data['base_item']}")
-            garment_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-            garment_item.setForeground(0, QColor(100, 149, 237))
-            
-            # Agregar opciones de color
-            colors = ["black", "white", "blue", "red", "green", "gray", "brown","orange","yellow","pink","gold","silver","purple","jade","violet"]
-            for color in colors:
-                color_item = QTreeWidgetItem(garment_item)
-                color_item.setText(0, f"🎨 {color}")
-                color_item.setFont(0, QFont("Segoe UI", 8))
-                color_item.setForeground(0, QColor(255, 255, 255))
-                color_item.setData(0, Qt.ItemDataRole.UserRole, ("color", f"{garment_data['base_item']}_{color}", garment_id))
-        
-        tree_widget.expandAll()
-        
-        # AGREGAR ESTAS LÍNEAS QUE FALTABAN:
-        # Agregar al layout
-        self.columns_layout.addWidget(color_column)
-        self.dynamic_columns.append(color_column)
-        
-        # Marcar como creada
-        if column_index not in self.column_states:
-            self.column_states[column_index] = {}
-        self.column_states[column_index]['created'] = True
-        
-        # Hacer visible la columna
-        color_column.setVisible(True)
-        
-        print("DEBUG: Columna de colores agregada al layout y hecha visible")
-        
-        return color_column
-    
     def _skip_to_next_column(self, current_column_index):
         """Salta al siguiente paso sin seleccionar nada en la columna actual"""
         print(f"Saltando desde columna {current_column_index} al siguiente paso")
@@ -949,15 +858,9 @@ class SuggestionPanel(QWidget):
             # Encontrar la columna correspondiente
             if column_index < len(self.dynamic_columns):
                 column_widget = self.dynamic_columns[column_index]
-                tree_widget = column_widget.findChild(QTreeWidget)
-                
-                if tree_widget:
-                    tree_widget.clear()
-                    skip_item = QTreeWidgetItem(tree_widget)
-                    skip_item.setText(0, f"⏭️ {column_title} - SALTADO")
-                    skip_item.setFont(0, QFont("Segoe UI", 9, QFont.Weight.Bold))
-                    skip_item.setForeground(0, QColor(255, 165, 0))  # Color naranja
-                    tree_widget.expandAll()
+                column_widget.tree_view.set_nodes([
+                    SuggestionNode(('notice',), f"⏭️ {column_title} - SALTADO", 'notice')  # Color naranja
+                ])
         
         # Control de estado de columnas
         self.column_states = {}  # {column_index: {'collapsed': bool, 'created': bool}}
@@ -991,9 +894,7 @@ class SuggestionPanel(QWidget):
         # Ocultar el contenido de la columna actual (pero mantener el header)
         if column_index < len(self.dynamic_columns):
             column_widget = self.dynamic_columns[column_index]
-            tree_widget = column_widget.findChild(QTreeWidget)
-            if tree_widget:
-                tree_widget.setVisible(False)
+            column_widget.tree_view.setVisible(False)
         
         # Mostrar la siguiente columna (solo si no existe ya)
         next_column_index = column_index + 1
@@ -1014,9 +915,7 @@ class SuggestionPanel(QWidget):
         # Mostrar el contenido de la columna actual
         if column_index < len(self.dynamic_columns):
             column_widget = self.dynamic_columns[column_index]
-            tree_widget = column_widget.findChild(QTreeWidget)
-            if tree_widget:
-                tree_widget.setVisible(True)
+            column_widget.tree_view.setVisible(True)
         
         # Ocultar/eliminar columnas siguientes
         self._remove_columns_after(column_index)
@@ -1030,17 +929,7 @@ class SuggestionPanel(QWidget):
     
     def _remove_columns_after(self, column_index):
         """Elimina todas las columnas después del índice especificado"""
-        columns_to_remove = []
-        
-        for i in range(column_index + 1, len(self.dynamic_columns)):
-            column_widget = self.dynamic_columns[i]
-            columns_to_remove.append(column_widget)
-            self.columns_layout.removeWidget(column_widget)
-            column_widget.setParent(None)
-            column_widget.deleteLater()
-        
-        # Actualizar la lista de columnas dinámicas
-        self.dynamic_columns = self.dynamic_columns[:column_index + 1]
+        self._release_columns_from(column_index + 1)
         
         # Limpiar estados de columnas eliminadas
         keys_to_remove = [k for k in self.column_states.keys() if k > column_index]
@@ -1092,30 +981,16 @@ class SuggestionPanel(QWidget):
             'purple': 'morado'
         }
     
-    def _create_item_with_translation(self, tree_widget, english_text, category, parent_item=None):
-        """Crea un item con texto en inglés y tooltip de traducción"""
+    def _create_item_with_translation(self, english_text, category):
+        """Crea un nodo con texto en inglés y tooltip de traducción"""
         translation_map = self._get_translation_map()
         spanish_translation = translation_map.get(english_text, english_text)
         
-        if parent_item:
-            item = QTreeWidgetItem(parent_item)
-        else:
-            item = QTreeWidgetItem(tree_widget)
-        
-        # Texto principal en inglés
-        item.setText(0, f"✨ {english_text}")
-        
-        # Tooltip discreto con traducción
-        item.setToolTip(0, f"🇪🇸 {spanish_translation}")
-        
-        # Datos para el sistema
-        item.setData(0, Qt.ItemDataRole.UserRole, (category, english_text))
-        
-        # Estilo
-        item.setFont(0, QFont("Segoe UI", 8))
-        item.setForeground(0, QColor(255, 255, 255))
-        
-        return item
+        # Texto principal en inglés, tooltip discreto con traducción y datos para el sistema
+        return SuggestionNode(
+            ('suggestion', category, english_text), f"✨ {english_text}", 'item',
+            tooltip=f"🇪🇸 {spanish_translation}", payload=(category, english_text)
+        )
     
     def _clear_contextual_prompt(self):
         """Limpia completamente el prompt contextual y reinicia el sistema"""
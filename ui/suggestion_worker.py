@@ -0,0 +1,66 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _SuggestionTask(QRunnable):
+    """Cálculo de sugerencias en un hilo del pool"""
+
+    def __init__(self, worker, seq, category, value):
+        super().__init__()
+        self.worker = worker
+        self.seq = seq
+        self.category = category
+        self.value = value
+
+    def run(self):
+        # Si ya llegó una petición más nueva, ni siquiera calcular
+        if self.worker.is_stale(self.seq):
+            return
+        try:
+            result = self.worker.compute(self.category, self.value)
+        except Exception as e:
+            print(f"Error al calcular sugerencias: {e}")
+            return
+        # Emitida desde el hilo del pool: Qt la encola hacia el hilo de la interfaz
+        self.worker.result_ready.emit(self.seq, self.category, self.value, result)
+
+
+class SuggestionWorker(QObject):
+    """Calcula sugerencias fuera del hilo de la interfaz.
+
+    Cada petición recibe un número de secuencia; `suggestions_ready` solo se
+    emite para la más reciente, así que los resultados de teclas anteriores
+    se descartan en lugar de pintarse uno tras otro.
+    """
+
+    suggestions_ready = pyqtSignal(str, str, object)
+    result_ready = pyqtSignal(int, str, str, object)
+
+    def __init__(self, compute, parent=None):
+        super().__init__(parent)
+        self.compute = compute
+        self.pool = QThreadPool(self)
+        # Un solo hilo: las peticiones viejas en cola se saltan al empezar
+        self.pool.setMaxThreadCount(1)
+        self._seq = 0
+        self.result_ready.connect(self._on_result_ready)
+
+    def request(self, category, value):
+        """Encola el cálculo para (categoría, valor) y retorna su número de secuencia"""
+        self._seq += 1
+        self.pool.start(_SuggestionTask(self, self._seq, category, value))
+        return self._seq
+
+    def cancel(self):
+        """Descarta cualquier resultado pendiente"""
+        self._seq += 1
+
+    def is_stale(self, seq):
+        return seq != self._seq
+
+    def wait(self, msecs=-1):
+        """Espera a que terminen los cálculos en curso"""
+        return self.pool.waitForDone(msecs)
+
+    def _on_result_ready(self, seq, category, value, result):
+        if not self.is_stale(seq):
+            self.suggestions_ready.emit(category, value, result)
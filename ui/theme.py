@@ -0,0 +1,407 @@
+from PyQt6.QtWidgets import QApplication
+
+# Hoja de estilo única de la aplicación (tema oscuro).
+#
+# Se aplica una vez a la QApplication; los widgets solo reciben un objectName
+# (y, si su aspecto depende de un estado, un pseudo-estado de Qt o una
+# propiedad dinámica). Así Qt parsea el QSS una sola vez en lugar de hacerlo
+# por cada widget creado.
+#
+# Algunas etiquetas repiten el estilo de su marco: antes lo heredaban de la
+# hoja `QFrame { ... }` del contenedor (QLabel es un QFrame).
+THEME_QSS = """
+/* --- Ventana principal --- */
+QMainWindow {
+    background-color: #2b2b2b;
+    color: #ffffff;
+}
+
+/* Secciones con borde (categorías, input y prompt) y lo que hereda su estilo */
+QFrame#panelSection, QScrollArea#sectionScroll, QLabel#sectionTitle {
+    background-color: #3c3c3c;
+    border: 1px solid #555555;
+    border-radius: 6px;
+}
+QLabel#sectionTitle {
+    color: #cccccc;
+    margin-bottom: 2px;
+}
+
+QTextEdit#promptDisplay {
+    background-color: #505050;
+    border: 1px solid #777777;
+    border-radius: 4px;
+    padding: 8px;
+    color: #ffffff;
+    font-family: 'Consolas', 'Monaco', monospace;
+    font-size: 9pt;
+    line-height: 1.4;
+}
+
+QPushButton#generateButton {
+    background-color: #00cc88;
+    color: white;
+    border: none;
+    border-radius: 4px;
+    padding: 6px 12px;
+    font-size: 8pt;
+    font-weight: bold;
+}
+QPushButton#generateButton:hover {
+    background-color: #00b377;
+}
+QPushButton#generateButton:pressed {
+    background-color: #009966;
+}
+
+QPushButton#copyButton {
+    background-color: #4a4a4a;
+    color: white;
+    border: 1px solid #666666;
+    border-radius: 4px;
+    padding: 6px 12px;
+    font-size: 8pt;
+}
+QPushButton#copyButton:hover {
+    background-color: #5a5a5a;
+}
+
+QPushButton#clearButton {
+    background-color: #666666;
+    color: white;
+    border: 1px solid #777777;
+    border-radius: 4px;
+    padding: 6px 12px;
+    font-size: 8pt;
+}
+QPushButton#clearButton:hover {
+    background-color: #777777;
+}
+
+/* --- Panel de categorías --- */
+QPushButton#configButton {
+    background-color: #4a4a4a;
+    color: #cccccc;
+    border: 1px solid #666666;
+    border-radius: 4px;
+    padding: 2px 6px;
+    font-size: 8pt;
+}
+QPushButton#configButton:hover {
+    background-color: #5a5a5a;
+}
+QPushButton#configButton:pressed {
+    background-color: #3a3a3a;
+}
+
+QPushButton#categoryButton {
+    background-color: #8B5CF6;
+    color: white;
+    border: none;
+    border-radius: 12px;
+    padding: 6px 14px;
+    font-size: 10px;
+    font-weight: 500;
+    margin: 0px;
+}
+QPushButton#categoryButton:hover {
+    background-color: #7C3AED;
+}
+QPushButton#categoryButton:pressed {
+    background-color: #6D28D9;
+}
+QPushButton#categoryButton:checked {
+    background-color: #059669;
+}
+QPushButton#categoryButton:disabled {
+    background-color: #6B7280;
+    color: #9CA3AF;
+}
+
+QFrame#categoryInput, QLabel#categoryInputLabel {
+    background-color: #505050;
+    border: 1px solid #666666;
+    border-radius: 4px;
+    padding: 2px;
+}
+QLabel#categoryInputLabel {
+    color: #00cc88;
+    margin: 0px;
+    padding: 0px;
+}
+
+QLineEdit#categoryInputEdit {
+    background-color: #606060;
+    border: 1px solid #777777;
+    border-radius: 3px;
+    padding: 3px 4px;
+    color: #ffffff;
+    font-size: 8pt;
+}
+QLineEdit#categoryInputEdit:focus {
+    border-color: #00cc88;
+}
+
+QPushButton#optionsButton {
+    background-color: #4a4a4a;
+    border: 1px solid #666666;
+    border-radius: 3px;
+    color: #ffffff;
+    font-size: 10pt;
+    padding: 0px;
+}
+QPushButton#optionsButton:hover {
+    background-color: #5a5a5a;
+    border-color: #00cc88;
+}
+QPushButton#optionsButton:pressed {
+    background-color: #3a3a3a;
+}
+
+/* --- Panel de sugerencias --- */
+QLabel#columnTitle {
+    color: #cccccc;
+    margin-bottom: 4px;
+}
+
+QPushButton#skipButton {
+    background-color: #666666;
+    color: #cccccc;
+    border: 1px solid #888888;
+    border-radius: 10px;
+    font-size: 10px;
+    font-weight: bold;
+    padding: 0px;
+}
+QPushButton#skipButton:hover {
+    background-color: #4a90e2;
+    color: white;
+}
+QPushButton#skipButton:pressed {
+    background-color: #357abd;
+}
+
+QTreeView#suggestionTree {
+    background-color: #3c3c3c;
+    border: 1px solid #555555;
+    border-radius: 6px;
+    color: #ffffff;
+    font-size: 9pt;
+    min-width: 200px;
+    max-width: 250px;
+}
+QTreeView#suggestionTree::item {
+    padding: 4px;
+    border-bottom: 1px solid #4a4a4a;
+}
+QTreeView#suggestionTree::item:hover {
+    background-color: #4a4a4a;
+}
+QTreeView#suggestionTree::item:selected {
+    background-color: #00cc88;
+    color: #ffffff;
+}
+
+/* --- Diálogo de opciones de una categoría --- */
+QFrame#optionsContainer, QLabel#optionsTitle, QLabel#optionsInfo {
+    background-color: #3c3c3c;
+    border: 2px solid #555555;
+    border-radius: 8px;
+}
+QLabel#optionsTitle {
+    color: #00cc88;
+    margin-bottom: 4px;
+}
+QLabel#optionsInfo {
+    color: #999999;
+    margin-top: 2px;
+}
+
+QLineEdit#optionsFilter {
+    background-color: #505050;
+    border: 1px solid #666666;
+    border-radius: 4px;
+    padding: 3px 6px;
+    color: #ffffff;
+    font-size: 8pt;
+}
+QLineEdit#optionsFilter:focus {
+    border-color: #00cc88;
+}
+
+QListView#optionsList {
+    background-color: #505050;
+    border: 1px solid #666666;
+    border-radius: 4px;
+    padding: 4px;
+}
+
+/* --- Diálogo de configuración de categorías --- */
+QDialog#categoryConfigDialog {
+    background-color: #2b2b2b;
+    color: #ffffff;
+}
+#categoryConfigDialog QLabel {
+    color: #ffffff;
+}
+#categoryConfigDialog QLineEdit {
+    background-color: #3c3c3c;
+    border: 2px solid #555555;
+    border-radius: 6px;
+    padding: 8px;
+    color: #ffffff;
+    font-size: 9pt;
+}
+#categoryConfigDialog QLineEdit:focus {
+    border-color: #8B5CF6;
+}
+#categoryConfigDialog QScrollArea {
+    background-color: #2b2b2b;
+    border: 1px solid #555555;
+    border-radius: 6px;
+}
+#categoryConfigDialog QScrollBar:vertical {
+    background-color: #3c3c3c;
+    width: 12px;
+    border-radius: 6px;
+}
+#categoryConfigDialog QScrollBar::handle:vertical {
+    background-color: #666666;
+    border-radius: 6px;
+    min-height: 20px;
+}
+#categoryConfigDialog QScrollBar::handle:vertical:hover {
+    background-color: #777777;
+}
+
+QLabel#configInstructions {
+    color: #cccccc;
+    margin-bottom: 10px;
+}
+
+QFrame#configCategory, QLabel#configCategoryName, QLabel#configHideLabel, QLabel#configDisableLabel {
+    background-color: #3c3c3c;
+    border: 1px solid #555555;
+    border-radius: 6px;
+    padding: 2px;
+}
+QFrame#configCategory:hover, QLabel#configCategoryName:hover,
+QLabel#configHideLabel:hover, QLabel#configDisableLabel:hover {
+    background-color: #404040;
+    border-color: #666666;
+}
+QLabel#configCategoryName, QLabel#configHideLabel, QLabel#configDisableLabel {
+    margin: 0px;
+    padding: 0px;
+}
+QLabel#configCategoryName {
+    color: #ffffff;
+}
+QLabel#configHideLabel {
+    color: #ff6b6b;
+}
+QLabel#configDisableLabel {
+    color: #ffa726;
+}
+/* Categoría oculta: no se puede deshabilitar */
+QLabel#configDisableLabel[inactive="true"] {
+    color: #666666;
+}
+
+QCheckBox#configHideCheck, QCheckBox#configDisableCheck {
+    font-weight: 500;
+    font-size: 8pt;
+    spacing: 2px;
+    margin: 0px;
+    padding: 0px;
+}
+QCheckBox#configHideCheck::indicator, QCheckBox#configDisableCheck::indicator {
+    width: 12px;
+    height: 12px;
+    border-radius: 2px;
+    background-color: transparent;
+}
+QCheckBox#configHideCheck {
+    color: #ff6b6b;
+}
+QCheckBox#configHideCheck::indicator {
+    border: 2px solid #ff6b6b;
+}
+QCheckBox#configHideCheck::indicator:checked {
+    background-color: #ff6b6b;
+    border-color: #ff6b6b;
+}
+QCheckBox#configHideCheck::indicator:checked:hover {
+    background-color: #ff5252;
+}
+QCheckBox#configHideCheck::indicator:hover {
+    border-color: #ff5252;
+}
+QCheckBox#configDisableCheck {
+    color: #ffa726;
+}
+QCheckBox#configDisableCheck::indicator {
+    border: 2px solid #ffa726;
+}
+QCheckBox#configDisableCheck::indicator:checked {
+    background-color: #ffa726;
+    border-color: #ffa726;
+}
+QCheckBox#configDisableCheck::indicator:checked:hover {
+    background-color: #ff9800;
+}
+QCheckBox#configDisableCheck::indicator:hover {
+    border-color: #ff9800;
+}
+QCheckBox#configDisableCheck:disabled {
+    color: #666666;
+}
+QCheckBox#configDisableCheck::indicator:disabled {
+    border-color: #666666;
+}
+
+QDialogButtonBox#configButtons {
+    background-color: transparent;
+}
+QDialogButtonBox#configButtons QPushButton {
+    background-color: #4a4a4a;
+    color: #ffffff;
+    border: 1px solid #666666;
+    border-radius: 6px;
+    padding: 8px 16px;
+    font-size: 9pt;
+    font-weight: 500;
+    min-width: 80px;
+}
+QDialogButtonBox#configButtons QPushButton:hover {
+    background-color: #5a5a5a;
+    border-color: #777777;
+}
+QDialogButtonBox#configButtons QPushButton:pressed {
+    background-color: #3a3a3a;
+}
+QDialogButtonBox#configButtons QPushButton:default {
+    background-color: #8B5CF6;
+    border-color: #8B5CF6;
+}
+QDialogButtonBox#configButtons QPushButton:default:hover {
+    background-color: #7C3AED;
+}
+"""
+
+
+def apply_theme(app=None):
+    """Aplica la hoja de estilo del tema a la aplicación (solo la primera vez)"""
+    app = app or QApplication.instance()
+    if app.styleSheet() != THEME_QSS:
+        app.setStyleSheet(THEME_QSS)
+
+
+def set_state(widget, name, value):
+    """Cambia una propiedad dinámica del tema y vuelve a aplicar el estilo solo a ese widget"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
@@ -0,0 +1,65 @@
+from PyQt6.QtCore import QObject, QTimer
+
+
+class UpdateScheduler(QObject):
+    """Agrupa las actualizaciones de la interfaz para que una acción del usuario
+    produzca un solo recálculo.
+
+    El prompt se regenera una vez, en el siguiente ciclo del bucle de eventos,
+    sin importar cuántas señales se hayan encadenado (el generador ya sabe qué
+    categorías cambiaron y solo revisa los conflictos de esas). Las búsquedas
+    de sugerencias esperan además a que el usuario deje de escribir
+    (`debounce_ms`) y solo se lanza la última.
+    """
+
+    def __init__(self, refresh_prompt, request_suggestions, debounce_ms=150, parent=None):
+        super().__init__(parent)
+        self.refresh_prompt = refresh_prompt
+        self.request_suggestions = request_suggestions
+        self._prompt_pendiente = False
+        self._sugerencia_pendiente = None
+
+        # Un solo disparo al volver al bucle de eventos
+        self._tick = QTimer(self)
+        self._tick.setSingleShot(True)
+        self._tick.setInterval(0)
+        self._tick.timeout.connect(self.flush)
+
+        # Se reinicia con cada tecla; vence cuando el usuario hace una pausa
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._flush_suggestions)
+
+    def mark_dirty(self):
+        """Marca que el prompt debe regenerarse"""
+        self._prompt_pendiente = True
+        self._tick.start()
+
+    def schedule_suggestions(self, category, value, debounce=True):
+        """Programa la búsqueda de sugerencias; una petición nueva reemplaza a la pendiente"""
+        self._sugerencia_pendiente = (category, value)
+        if debounce:
+            self._debounce.start()
+        else:
+            self._debounce.stop()
+            self._tick.start()
+
+    def cancel_suggestions(self):
+        self._sugerencia_pendiente = None
+        self._debounce.stop()
+
+    def flush(self):
+        """Ejecuta ahora lo pendiente del ciclo actual (cada cosa como máximo una vez)"""
+        self._tick.stop()
+        if self._prompt_pendiente:
+            self._prompt_pendiente = False
+            self.refresh_prompt()
+        if not self._debounce.isActive():
+            self._flush_suggestions()
+
+    def _flush_suggestions(self):
+        if self._sugerencia_pendiente is not None:
+            category, value = self._sugerencia_pendiente
+            self._sugerencia_pendiente = None
+            self.request_suggestions(category, value)